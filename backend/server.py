@@ -1,9 +1,11 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, WebSocket, WebSocketDisconnect, Query, Header, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError, OperationFailure
 import os
 import logging
 from pathlib import Path
@@ -16,19 +18,129 @@ import bcrypt
 from enum import Enum
 import shutil
 import json
+import orjson
+import msgpack
+import redis.asyncio as aioredis
+import base64
+import binascii
 import httpx
 import asyncio
-from collections import defaultdict
+import contextvars
+import hashlib
+import threading
+from collections import OrderedDict, deque
 from bs4 import BeautifulSoup
 import re
 import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
+# With DB_QUERY_COUNT_HEADER_ENABLED (for mutation_query_count_test.py), commands
+# sent while serving a request are counted and reported in the X-DB-Query-Count
+# response header. Motor runs commands on its executor with a copy of the
+# caller's context, so the listener sees the request's counter.
+DB_QUERY_COUNT_HEADER_ENABLED = os.environ.get('DB_QUERY_COUNT_HEADER_ENABLED', 'false').lower() == 'true'
+DB_QUERY_COUNT_HEADER = "X-DB-Query-Count"
+request_query_count: contextvars.ContextVar = contextvars.ContextVar("request_query_count", default=None)
+
+class QueryCounter(monitoring.CommandListener):
+    def started(self, event):
+        counter = request_query_count.get()
+        if counter is not None:
+            counter[0] += 1
+    
+    def succeeded(self, event):
+        pass
+    
+    def failed(self, event):
+        pass
+
+# Collection Versions
+# Every completed write bumps an in-process version for its collection, so read
+# endpoints can derive ETags and answer If-None-Match without querying.
+WRITE_COMMANDS = {"insert", "update", "delete", "findAndModify"}
+
+def write_changed(command_name: str, reply) -> bool:
+    """Whether a write reply shows documents were changed, so no-op updates keep their tags.
+
+    findAndModify only reports matches, so a matched document counts as changed.
+    """
+    if not isinstance(reply, dict):
+        return True
+    if command_name == "findAndModify":
+        return (reply.get("lastErrorObject") or {}).get("n", 1) > 0
+    if command_name == "update":
+        return reply.get("nModified", 1) > 0 or bool(reply.get("upserted"))
+    return reply.get("n", 1) > 0
+
+class CollectionVersions(monitoring.CommandListener):
+    """Per-collection write counters, fed by the driver's command events.
+
+    Versions are bumped when a write finishes, so a tag taken before a query
+    can only be older than the data it describes, never newer. Counters start
+    from a random epoch per process and other workers' writes arrive as peer
+    notifications (see Peer Notifications). Only collections some TrackedRead
+    lists are sent to peers, batched once per loop tick.
+    """
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.versions: Dict[str, int] = {}
+        self.pending: Dict[tuple, str] = {}
+        self.tracked: set = set()
+        self.unsent: set = set()
+        self.lock = threading.Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None  # Set at startup
+    
+    def track(self, *collections: str):
+        self.tracked.update(collections)
+    
+    def started(self, event):
+        if event.command_name in WRITE_COMMANDS:
+            self.pending[(event.connection_id, event.request_id)] = event.command.get(event.command_name)
+    
+    def succeeded(self, event):
+        collection = self.pending.pop((event.connection_id, event.request_id), None)
+        if collection and write_changed(event.command_name, event.reply):
+            self.bump(collection)
+    
+    def failed(self, event):
+        # A failed write may still have applied in part
+        collection = self.pending.pop((event.connection_id, event.request_id), None)
+        if collection:
+            self.bump(collection)
+    
+    def bump(self, *collections: str, notify: bool = True):
+        with self.lock:
+            for collection in collections:
+                self.versions[collection] = self.versions.get(collection, 0) + 1
+        if not (notify and self.loop and not self.loop.is_closed() and manager.broker.cross_process):
+            return
+        with self.lock:
+            names = self.tracked.intersection(collections)
+            schedule = bool(names) and not self.unsent
+            self.unsent.update(names)
+        # Driver events arrive on executor threads; peers are told from the loop
+        if schedule:
+            self.loop.call_soon_threadsafe(self.flush)
+    
+    def flush(self):
+        with self.lock:
+            names, self.unsent = sorted(self.unsent), set()
+        if names:
+            notify_peers("collections", names=names)
+    
+    def snapshot(self, collections) -> tuple:
+        with self.lock:
+            return tuple(self.versions.get(collection, 0) for collection in collections)
+
+collection_versions = CollectionVersions()
+
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[QueryCounter(), collection_versions] if DB_QUERY_COUNT_HEADER_ENABLED else [collection_versions])
 db = client[os.environ['DB_NAME']]
 
 # Backend URL for file URLs
@@ -41,6 +153,19 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 # Create the main app without a prefix
 app = FastAPI()
 
+async def count_db_queries(request: Request, call_next):
+    counter = [0]
+    token = request_query_count.set(counter)
+    try:
+        response = await call_next(request)
+    finally:
+        request_query_count.reset(token)
+    response.headers[DB_QUERY_COUNT_HEADER] = str(counter[0])
+    return response
+
+if DB_QUERY_COUNT_HEADER_ENABLED:
+    app.middleware("http")(count_db_queries)
+
 # Mount static files
 app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
@@ -52,6 +177,10 @@ security = HTTPBearer()
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
+# When enabled, tokens carry role/supervisor/approval claims so most requests authorize without Mongo
+JWT_EMBED_CLAIMS = os.environ.get('JWT_EMBED_CLAIMS', 'false').lower() == 'true'
+# How often each worker reloads revocations, for those no broker message reached
+TOKEN_REVOCATION_REFRESH_SECONDS = float(os.environ.get('TOKEN_REVOCATION_REFRESH_SECONDS', '30'))
 
 # Enums
 class UserRole(str, Enum):
@@ -161,6 +290,7 @@ class User(BaseModel):
     is_approved: bool = False  # Requires supervisor approval for new registrations
     approved_by: Optional[str] = None  # Supervisor who approved the user
     approved_at: Optional[datetime] = None
+    token_version: int = 0  # Bumped to invalidate previously issued tokens
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -373,6 +503,20 @@ class ResearchLog(BaseModel):
     student_name: Optional[str] = None
     student_email: Optional[str] = None
     supervisor_name: Optional[str] = None
+    version: int = 0  # Bumped on every write; see Document Versions
+
+class ResearchLogSummary(BaseModel):
+    """Slim list representation; the full log is at GET /research-logs/{log_id}"""
+    id: str
+    title: str
+    status: ResearchLogStatus = ResearchLogStatus.DRAFT
+    date: Optional[datetime] = None
+    submitted_at: Optional[datetime] = None
+    reviewed_at: Optional[datetime] = None
+    student_id: Optional[str] = None
+    student_name: Optional[str] = None
+    attachment_count: int = 0
+    version: int = 0
 
 class ResearchLogCreate(BaseModel):
     activity_type: ActivityType
@@ -580,6 +724,7 @@ class LabSettings(BaseModel):
     })
     supervisor_id: str
     updated_by: Optional[str] = None
+    version: int = 0  # Bumped on every write; see Document Versions
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -766,12 +911,261 @@ async def save_uploaded_file(file: UploadFile, directory: str) -> str:
     
     return f"/uploads/{directory}/{unique_filename}"
 
+# Database Indexes
+# Declarative registry: collection -> list of (keys, options). Applied idempotently at startup.
+INDEX_REGISTRY = {
+    "users": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("email", ASCENDING)], {"unique": True}),
+        ([("supervisor_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {}),
+        ([("is_approved", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {}),
+        ([("role", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {}),
+    ],
+    "research_logs": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("student_id", ASCENDING), ("submitted_at", DESCENDING), ("date", DESCENDING), ("id", DESCENDING)], {}),
+        ([("supervisor_id", ASCENDING), ("submitted_at", DESCENDING), ("date", DESCENDING), ("id", DESCENDING)], {}),
+        ([("user_id", ASCENDING), ("date", DESCENDING)], {}),
+        ([("pending_events.created_at", ASCENDING)], {"sparse": True}),
+    ],
+    "tasks": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("assigned_to", ASCENDING), ("status", ASCENDING)], {}),
+        ([("assigned_by", ASCENDING), ("status", ASCENDING)], {}),
+        ([("assigned_to", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {}),
+        ([("assigned_by", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {}),
+    ],
+    "grants": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("principal_investigator", ASCENDING), ("status", ASCENDING)], {}),
+        ([("principal_investigator", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {}),
+        ([("status", ASCENDING)], {}),
+    ],
+    "publications": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("supervisor_id", ASCENDING), ("publication_year", DESCENDING), ("id", DESCENDING)], {}),
+        ([("student_contributors", ASCENDING)], {}),
+        ([("author_ids", ASCENDING)], {}),
+        ([("scopus_id", ASCENDING)], {}),
+        ([("doi", ASCENDING), ("supervisor_id", ASCENDING)], {}),
+        ([("supervisor_id", ASCENDING), ("source_key", ASCENDING)], {}),
+    ],
+    "notifications": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+    ],
+    "messages": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("sender_id", ASCENDING), ("receiver_id", ASCENDING), ("timestamp", ASCENDING), ("id", ASCENDING)], {}),
+    ],
+    "meetings": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("student_id", ASCENDING), ("meeting_date", DESCENDING), ("id", DESCENDING)], {}),
+        ([("supervisor_id", ASCENDING)], {}),
+    ],
+    "reminders": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("user_id", ASCENDING), ("reminder_date", ASCENDING), ("id", ASCENDING)], {}),
+    ],
+    "notes": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("student_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+    ],
+    "todos": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("user_id", ASCENDING), ("order_index", ASCENDING), ("id", ASCENDING)], {}),
+    ],
+    "milestones": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("student_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {}),
+        ([("created_at", ASCENDING), ("id", ASCENDING)], {}),
+    ],
+    "bulletins": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("supervisor_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+        ([("supervisor_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], {}),
+        ([("status", ASCENDING), ("is_highlight", ASCENDING), ("created_at", DESCENDING)], {}),
+    ],
+    "grant_registrations": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("grant_id", ASCENDING), ("applicant_id", ASCENDING)], {}),
+        ([("grant_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {}),
+        ([("applicant_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {}),
+    ],
+    "citations": [
+        ([("supervisor_id", ASCENDING)], {"unique": True}),
+    ],
+    "lab_settings": [
+        ([("supervisor_id", ASCENDING)], {"unique": True}),
+    ],
+    "dashboard_counters": [
+        ([("key", ASCENDING)], {"unique": True}),
+    ],
+    "event_sequences": [
+        ([("user_id", ASCENDING)], {"unique": True}),
+    ],
+    "event_log": [
+        ([("user_id", ASCENDING), ("seq", ASCENDING)], {}),
+    ],
+    "token_revocations": [
+        ([("user_id", ASCENDING)], {"unique": True}),
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ],
+    "outbox": [
+        ([("id", ASCENDING)], {"unique": True}),
+        ([("status", ASCENDING), ("next_attempt_at", ASCENDING)], {}),
+        ([("status", ASCENDING), ("lease_until", ASCENDING)], {}),
+        ([("claim_id", ASCENDING)], {}),
+        ([("batch_id", ASCENDING)], {"sparse": True}),
+    ],
+}
+
+# Hot queries issued by the route handlers: (name, collection, filter, sort).
+# Filter values are placeholders - the planner only cares about the shape.
+HOT_QUERIES = [
+    ("auth.current_user", "users", {"id": "probe"}, None),
+    ("auth.login", "users", {"email": "probe@example.com"}, None),
+    ("users.lab_roster", "users", {"supervisor_id": "probe"}, None),
+    ("users.students_page", "users", {"supervisor_id": "probe"}, [("created_at", 1), ("id", 1)]),
+    ("users.pending_registrations", "users", {"is_approved": False}, [("created_at", 1), ("id", 1)]),
+    ("research_logs.by_id", "research_logs", {"id": "probe"}, None),
+    ("research_logs.student_list", "research_logs", {"student_id": "probe"}, [("submitted_at", -1), ("date", -1), ("id", -1)]),
+    ("research_logs.supervisor_list", "research_logs", {"supervisor_id": "probe"}, [("submitted_at", -1), ("date", -1), ("id", -1)]),
+    ("research_logs.student_status", "research_logs", {"user_id": "probe"}, [("date", -1)]),
+    ("tasks.by_id", "tasks", {"id": "probe"}, None),
+    ("tasks.assigned_to", "tasks", {"assigned_to": "probe", "status": "completed"}, None),
+    ("tasks.assigned_by", "tasks", {"assigned_by": "probe", "status": "completed"}, None),
+    ("tasks.student_page", "tasks", {"assigned_to": "probe"}, [("created_at", 1), ("id", 1)]),
+    ("tasks.supervisor_page", "tasks", {"assigned_by": "probe"}, [("created_at", 1), ("id", 1)]),
+    ("grants.by_id", "grants", {"id": "probe"}, None),
+    ("grants.lab_active", "grants", {"principal_investigator": {"$in": ["probe"]}, "status": "active"}, None),
+    ("grants.lab_page", "grants", {"principal_investigator": {"$in": ["probe"]}}, [("created_at", 1), ("id", 1)]),
+    ("grants.active", "grants", {"status": "active"}, None),
+    ("publications.lab", "publications", {"supervisor_id": "probe"}, [("publication_year", -1), ("id", -1)]),
+    ("publications.student", "publications", {"$or": [{"student_contributors": "probe"}, {"supervisor_id": "probe"}]}, [("publication_year", -1), ("id", -1)]),
+    ("publications.upsert", "publications", {"supervisor_id": "probe", "source_key": "probe"}, None),
+    ("notifications.list", "notifications", {"user_id": "probe"}, [("created_at", -1), ("id", -1)]),
+    ("messages.thread", "messages", {"$or": [{"sender_id": "a", "receiver_id": "b"}, {"sender_id": "b", "receiver_id": "a"}]}, [("timestamp", 1), ("id", 1)]),
+    ("meetings.lab", "meetings", {"student_id": {"$in": ["probe"]}}, [("meeting_date", -1), ("id", -1)]),
+    ("reminders.list", "reminders", {"user_id": "probe"}, [("reminder_date", 1), ("id", 1)]),
+    ("notes.lab", "notes", {"student_id": {"$in": ["probe"]}}, [("created_at", -1), ("id", -1)]),
+    ("todos.list", "todos", {"user_id": "probe"}, [("order_index", 1), ("id", 1)]),
+    ("todos.owned", "todos", {"id": "probe", "user_id": "probe"}, None),
+    ("milestones.student", "milestones", {"student_id": "probe"}, [("created_at", 1), ("id", 1)]),
+    ("milestones.all", "milestones", {}, [("created_at", 1), ("id", 1)]),
+    ("bulletins.lab", "bulletins", {"supervisor_id": "probe"}, [("created_at", -1), ("id", -1)]),
+    ("bulletins.lab_approved", "bulletins", {"supervisor_id": "probe", "status": "approved"}, [("created_at", -1), ("id", -1)]),
+    ("bulletins.highlights", "bulletins", {"status": "approved", "is_highlight": True}, [("created_at", -1)]),
+    ("grant_registrations.existing", "grant_registrations", {"grant_id": "probe", "applicant_id": "probe"}, None),
+    ("grant_registrations.applicant", "grant_registrations", {"applicant_id": "probe"}, [("created_at", 1), ("id", 1)]),
+    ("citations.lab", "citations", {"supervisor_id": "probe"}, None),
+    ("lab_settings.lab", "lab_settings", {"supervisor_id": "probe"}, None),
+]
+
+async def ensure_indexes():
+    """Create every registered index; safe to run on every startup"""
+    for collection_name, specs in INDEX_REGISTRY.items():
+        collection = db[collection_name]
+        for keys, options in specs:
+            try:
+                await collection.create_index(keys, **options)
+            except OperationFailure as e:
+                # e.g. duplicate data blocking a unique index - keep serving, but make it visible
+                print(f"Warning: Failed to create index {keys} on {collection_name}: {str(e)}")
+
+def _plan_stages(plan: dict) -> List[str]:
+    """Flatten the stage names of an explain() plan tree"""
+    stages = [plan.get("stage")]
+    for child_key in ("inputStage", "inputStages", "queryPlan"):
+        child = plan.get(child_key)
+        if isinstance(child, dict):
+            stages.extend(_plan_stages(child))
+        elif isinstance(child, list):
+            for sub_plan in child:
+                stages.extend(_plan_stages(sub_plan))
+    return [stage for stage in stages if stage]
+
+async def verify_query_plans() -> List[Dict[str, Any]]:
+    """Explain every hot query and report the ones that are not index-backed"""
+    failures = []
+    for name, collection_name, query_filter, sort in HOT_QUERIES:
+        find_command = {"find": collection_name, "filter": query_filter}
+        if sort:
+            find_command["sort"] = dict(sort)
+        explanation = await db.command({"explain": find_command, "verbosity": "queryPlanner"})
+        stages = _plan_stages(explanation["queryPlanner"]["winningPlan"])
+        if "COLLSCAN" in stages or "IXSCAN" not in stages:
+            failures.append({"query": name, "collection": collection_name, "stages": stages})
+    return failures
+
+# Password Hashing Pool
+BCRYPT_POOL_SIZE = int(os.environ.get('BCRYPT_POOL_SIZE', str(min(4, os.cpu_count() or 1))))
+BCRYPT_MAX_PENDING = int(os.environ.get('BCRYPT_MAX_PENDING', str(BCRYPT_POOL_SIZE * 8)))
+
+class PasswordHasherPool:
+    """Runs bcrypt in a dedicated, size-bounded process pool.
+
+    bcrypt deliberately burns 100-300 ms of CPU per call, which would otherwise
+    block the event loop. Work beyond max_pending is rejected with a 503 instead
+    of queuing without limit.
+    """
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            # spawn keeps the workers free of the parent's event loop and driver threads;
+            # the submitted callables live in the bcrypt module so workers never import this app
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self.executor
+    
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Authentication service is busy, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+    
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+
+password_pool = PasswordHasherPool(BCRYPT_POOL_SIZE, BCRYPT_MAX_PENDING)
+
 # Helper Functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def hash_password(password: str) -> str:
+    hashed = await password_pool.run(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt())
+    return hashed.decode('utf-8')
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    return await password_pool.run(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -780,6 +1174,175 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def build_token_claims(user: dict) -> dict:
+    """Token payload for a user document - just the subject unless JWT_EMBED_CLAIMS is on"""
+    if not JWT_EMBED_CLAIMS:
+        return {"sub": user["id"]}
+    
+    role = user["role"]
+    return {
+        "sub": user["id"],
+        "role": role.value if isinstance(role, Enum) else role,
+        "supervisor_id": user.get("supervisor_id"),
+        "is_approved": user.get("is_approved", False),
+        "ver": user.get("token_version", 0),
+        # Display-only claims; they refresh on the next login
+        "name": user.get("full_name"),
+        "email": user.get("email")
+    }
+
+class TokenRevocationList:
+    """Minimum accepted token version per user.
+
+    Only users whose tokens were ever revoked have an entry, so the set stays
+    small. It is seeded from Mongo at startup and updated whenever a token
+    version is bumped, by this worker or by a peer over the realtime broker.
+    Removed accounts have no user document left, so their revocation is kept
+    in the token_revocations TTL collection until their last token expires.
+    """
+    REVOKE_ALL = 2 ** 31
+    
+    def __init__(self):
+        self.min_versions: Dict[str, int] = {}
+    
+    def revoke(self, user_id: str, min_version: int):
+        self.min_versions[user_id] = max(min_version, self.min_versions.get(user_id, 0))
+    
+    def is_revoked(self, user_id: str, version: int) -> bool:
+        return version < self.min_versions.get(user_id, 0)
+    
+    async def load(self):
+        async for user in db.users.find({"token_version": {"$gt": 0}}, {"id": 1, "token_version": 1}):
+            self.revoke(user["id"], user["token_version"])
+        # The TTL monitor only runs once a minute, so skip expired entries it has not removed yet
+        async for revocation in db.token_revocations.find({"expires_at": {"$gt": datetime.utcnow()}}, {"_id": 0}):
+            self.revoke(revocation["user_id"], revocation["min_version"])
+
+token_revocations = TokenRevocationList()
+
+async def bump_token_version(user_id: str):
+    """Invalidate every token issued to a user so far (role change, freeze, password change)"""
+    user = await db.users.find_one_and_update(
+        {"id": user_id},
+        {"$inc": {"token_version": 1}},
+        projection={"token_version": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if user:
+        token_revocations.revoke(user_id, user["token_version"])
+        notify_peers("revoke", user_id=user_id, min_version=user["token_version"])
+    principal_cache.invalidate(user_id)
+
+async def revoke_all_tokens(user_id: str):
+    """Reject every token of a user whose account is being removed"""
+    token_revocations.revoke(user_id, TokenRevocationList.REVOKE_ALL)
+    await db.token_revocations.update_one(
+        {"user_id": user_id},
+        {"$set": {"min_version": TokenRevocationList.REVOKE_ALL,
+                  "expires_at": datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)}},
+        upsert=True
+    )
+    notify_peers("revoke", user_id=user_id, min_version=TokenRevocationList.REVOKE_ALL)
+    principal_cache.invalidate(user_id)
+
+async def token_revocation_refresher():
+    while True:
+        await asyncio.sleep(TOKEN_REVOCATION_REFRESH_SECONDS)
+        try:
+            await token_revocations.load()
+        except Exception as e:
+            print(f"Token revocation refresh failed: {str(e)}")
+
+def principal_from_claims(payload: dict) -> "User":
+    """Build the request principal straight from verified token claims (no Mongo access).
+
+    Only identity, role and lab fields are populated; handlers that need the
+    rest of the profile depend on get_current_user_record instead.
+    """
+    return User.model_construct(
+        id=payload["sub"],
+        email=payload.get("email") or "",
+        password_hash="",
+        full_name=payload.get("name") or "",
+        role=UserRole(payload["role"]),
+        supervisor_id=payload.get("supervisor_id"),
+        is_approved=payload.get("is_approved", False),
+        token_version=payload["ver"]
+    )
+
+def principal_from_fields(values: tuple) -> "User":
+    """Request principal from cached PRINCIPAL_FIELDS values (no validation, like principal_from_claims)"""
+    fields = dict(zip(PRINCIPAL_FIELDS, values))
+    fields["role"] = UserRole(fields["role"])
+    fields["is_approved"] = bool(fields["is_approved"])
+    fields["token_version"] = fields["token_version"] or 0
+    return User.model_construct(password_hash="", **fields)
+
+# Authenticated Principal Cache
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get('PRINCIPAL_CACHE_TTL_SECONDS', '60'))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.environ.get('PRINCIPAL_CACHE_MAX_ENTRIES', '2048'))
+
+# What authorization and handlers read from the request principal; handlers that
+# need the rest of the profile depend on get_current_user_record
+PRINCIPAL_FIELDS = ("id", "email", "full_name", "role", "supervisor_id", "is_approved", "token_version")
+PRINCIPAL_PROJECTION = {"_id": 0, **{field: 1 for field in PRINCIPAL_FIELDS}}
+
+class PrincipalCache:
+    """Bounded TTL/LRU cache of approved, authenticated principals keyed by user id.
+
+    Entries are (expires_at, values of PRINCIPAL_FIELDS) tuples; each hit builds
+    its own principal from them, so requests never share a model. Handlers that
+    change identity or authorization state must call invalidate() for the
+    affected user.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, user_id: str) -> Optional["User"]:
+        entry = self.entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[user_id]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(user_id)
+        self.hits += 1
+        return principal_from_fields(entry[1])
+    
+    def put(self, user_data: dict) -> "User":
+        """Cache the principal fields of a stored user and return its principal"""
+        values = tuple(user_data.get(field) for field in PRINCIPAL_FIELDS)
+        self.entries[user_data["id"]] = (time.monotonic() + self.ttl_seconds, values)
+        self.entries.move_to_end(user_data["id"])
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return principal_from_fields(values)
+    
+    def invalidate(self, user_id: str):
+        self.discard(user_id)
+        notify_peers("principal", user_id=user_id)
+    
+    def discard(self, user_id: str):
+        """Drop this worker's entry only"""
+        self.entries.pop(user_id, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0
+        }
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
@@ -789,67 +1352,870 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     
-    user_data = await db.users.find_one({"id": user_id})
+    token_version = payload.get("ver")
+    if token_version is not None:
+        if token_revocations.is_revoked(user_id, token_version):
+            raise HTTPException(status_code=401, detail="Session expired. Please log in again.")
+        
+        # Approved principals are authorized from the claims alone; unapproved ones fall
+        # through to the database so a fresh approval takes effect without a new login
+        if JWT_EMBED_CLAIMS and (payload.get("is_approved") or payload.get("role") in ["supervisor", "admin", "lab_manager"]):
+            return principal_from_claims(payload)
+    
+    cached_user = principal_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
+    user_data = await db.users.find_one({"id": user_id}, PRINCIPAL_PROJECTION)
     if user_data is None:
         raise HTTPException(status_code=401, detail="User not found")
     
+    if token_version is not None and token_version < user_data.get("token_version", 0):
+        raise HTTPException(status_code=401, detail="Session expired. Please log in again.")
+    
     # Check if user is approved (except for supervisors/admins who are auto-approved)
     if not user_data.get("is_approved", False) and user_data.get("role") not in ["supervisor", "admin", "lab_manager"]:
         raise HTTPException(status_code=403, detail="Account pending approval. Please wait for supervisor authorization.")
     
-    # Convert to User object
-    user = User(**user_data)
-    return user
-    
+    return principal_cache.put(user_data)
+
+async def get_current_user_record(current_user: User = Depends(get_current_user)) -> User:
+    """Full user record, for handlers that need more than the principal fields"""
+    user_data = await db.users.find_one({"id": current_user.id})
+    if user_data is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return User(**user_data)
+    
+# Keyset Pagination
+DEFAULT_PAGE_SIZE = int(os.environ.get('DEFAULT_PAGE_SIZE', '100'))
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', '500'))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _encode_cursor_value(value):
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+def _decode_cursor_value(value):
+    if isinstance(value, dict) and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+def encode_cursor(document: dict, sort: List[tuple]) -> str:
+    """Opaque cursor holding the sort-key values of the last document on a page"""
+    values = [_encode_cursor_value(document.get(field)) for field, _ in sort]
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort: List[tuple]) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return [_decode_cursor_value(value) for value in values]
+
+def _after_condition(field: str, direction: int, value) -> Optional[dict]:
+    """Condition matching values strictly after `value` in sort order (null/missing sorts lowest)"""
+    if direction == DESCENDING:
+        if value is None:
+            return None
+        return {"$or": [{field: {"$lt": value}}, {field: None}]}
+    if value is None:
+        return {field: {"$ne": None}}
+    return {field: {"$gt": value}}
+
+def keyset_filter(query: dict, sort: List[tuple], cursor: Optional[str]) -> dict:
+    """Extend a query so it only matches documents after the cursor position"""
+    if not cursor:
+        return query
+    
+    values = decode_cursor(cursor, sort)
+    branches = []
+    for position, (field, direction) in enumerate(sort):
+        after = _after_condition(field, direction, values[position])
+        if after is None:
+            continue
+        equal_prefix = {sort[i][0]: values[i] for i in range(position)}
+        branches.append({**equal_prefix, **after})
+    
+    if not branches:
+        # Cursor already points at the very end of the ordering
+        return {"$and": [query, {"id": {"$in": []}}]}
+    return {"$and": [query, {"$or": branches}]}
+
+# Long text fields list views leave out unless they are asked for with ?fields=
+LIST_VIEW_EXCLUDED_FIELDS = {
+    "research_logs": ("description", "findings", "challenges", "next_steps"),
+    "publications": ("abstract",),
+}
+
+class PageParams:
+    """Cursor/limit/fields query parameters shared by the list endpoints.
+
+    Pages are fetched with an index-backed range query on the endpoint's sort
+    keys (plus `id` as a tie-breaker); the cursor for the following page is
+    returned in the X-Next-Cursor response header so list bodies stay arrays.
+    `fields` is a comma-separated sparse fieldset (`*` for every field) that
+    becomes the Mongo projection; see select().
+    """
+    def __init__(
+        self,
+        response: Response,
+        cursor: Optional[str] = None,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        fields: Optional[str] = None
+    ):
+        self.response = response
+        self.cursor = cursor
+        self.limit = limit
+        self.fields = fields
+        self.selected: Optional[set] = None
+    
+    def select(self, available, exclude: tuple = (), requires: tuple = ()) -> dict:
+        """Inclusion projection for the requested fieldset, or `available` minus `exclude` by default.
+
+        `requires` are stored fields the handler reads to compute its output;
+        they are fetched but only returned if selected. The returned names are
+        kept in self.selected for respond().
+        """
+        available = set(available)
+        names = {name.strip() for name in (self.fields or "").split(",") if name.strip()}
+        if "*" in names:
+            self.selected = available
+        elif not names:
+            self.selected = available - set(exclude)
+        else:
+            unknown = names - available
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+            self.selected = names | {"id"}
+        return {"_id": 0, **{name: 1 for name in sorted(self.selected | set(requires))}}
+    
+    async def fetch(self, collection, query: dict, sort: List[tuple], projection: Optional[dict] = None) -> List[dict]:
+        sort = list(sort) + [("id", sort[-1][1])]
+        if projection and 1 in projection.values():
+            # The next cursor is built from the sort keys, selected or not
+            projection = {**projection, **{field: 1 for field, _ in sort}}
+        page_query = keyset_filter(query, sort, self.cursor)
+        documents = await collection.find(page_query, projection).sort(sort).limit(self.limit + 1).to_list(self.limit + 1)
+        
+        if len(documents) > self.limit:
+            documents = documents[:self.limit]
+            self.response.headers[NEXT_CURSOR_HEADER] = encode_cursor(documents[-1], sort)
+        return documents
+    
+    def respond(self, model, documents: List[dict]) -> "TrustedJSONResponse":
+        """Encode a fetched page straight to JSON, carrying over the cursor and any ETag headers"""
+        return trusted_list_response(model, documents, dict(self.response.headers) or None, self.selected)
+
+# Trusted Document Responses
+class TrustedJSONResponse(Response):
+    """JSON encoded with orjson, bypassing response_model validation.
+
+    Only for documents read back from our own collections, which were written
+    from these models; request bodies are still validated as usual.
+    """
+    media_type = "application/json"
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_encode_fallback, option=orjson.OPT_NON_STR_KEYS)
+
+_trusted_fields: Dict[type, list] = {}
+
+def trusted_dump(model, document: dict, selected: Optional[set] = None) -> dict:
+    """The document shaped like model_construct(**document).dict(): declared fields plus defaults.
+
+    With `selected`, only those fields are returned (a sparse fieldset).
+    """
+    fields = _trusted_fields.get(model)
+    if fields is None:
+        fields = _trusted_fields[model] = list(model.model_fields.items())
+    dumped = {}
+    for name, field in fields:
+        if selected is not None and name not in selected:
+            continue
+        if name in document:
+            dumped[name] = document[name]
+        elif not field.is_required():
+            dumped[name] = field.get_default(call_default_factory=True)
+    return dumped
+
+def trusted_list_response(model, documents: List[dict], headers: Optional[dict] = None, selected: Optional[set] = None) -> TrustedJSONResponse:
+    return TrustedJSONResponse([trusted_dump(model, document, selected) for document in documents], headers=headers)
+
+# Batched User Resolution
+user_loader_stats = {"batches": 0, "lookups": 0, "queries_saved": 0}
+
+class UserBatchLoader:
+    """Request-scoped loader that resolves user ids with a single $in query.
+
+    Handlers prime() every id they will need, await load() once, then read the
+    projected documents with get(). Replaces one find_one per row (N+1).
+    """
+    def __init__(self, projection: Optional[dict] = None):
+        self.projection = projection or {"_id": 0, "id": 1, "full_name": 1, "email": 1}
+        self.users: Dict[str, dict] = {}
+        self.pending: set = set()
+        self.lookups = 0
+        self.queries = 0
+    
+    def prime(self, *user_ids: Optional[str]):
+        for user_id in user_ids:
+            if not user_id:
+                continue
+            self.lookups += 1
+            if user_id not in self.users:
+                self.pending.add(user_id)
+    
+    async def load(self):
+        if self.pending:
+            pending_ids = list(self.pending)
+            self.pending.clear()
+            documents = await db.users.find({"id": {"$in": pending_ids}}, self.projection).to_list(None)
+            self.users.update({document["id"]: document for document in documents})
+            self.queries += 1
+        
+        user_loader_stats["batches"] += 1
+        user_loader_stats["lookups"] += self.lookups
+        user_loader_stats["queries_saved"] += self.queries_saved
+    
+    def get(self, user_id: Optional[str]) -> Optional[dict]:
+        return self.users.get(user_id) if user_id else None
+    
+    @property
+    def queries_saved(self) -> int:
+        return max(self.lookups - self.queries, 0)
+
+# Lab Roster Cache
+LAB_ROSTER_TTL_SECONDS = int(os.environ.get('LAB_ROSTER_TTL_SECONDS', '300'))
+
+class LabRosterCache:
+    """supervisor_id -> {member id: role} for the users supervised in each lab.
+
+    Lab membership checks and lab-wide queries read rosters from memory. Every
+    write that can change a roster calls invalidate(), which also reaches the
+    other workers; the TTL only bounds staleness from writes made elsewhere.
+    """
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.entries: Dict[str, tuple] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+    
+    async def members(self, supervisor_id: str) -> Dict[str, str]:
+        entry = self.entries.get(supervisor_id)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        generation = self.generation
+        students = await db.users.find({"supervisor_id": supervisor_id}, {"_id": 0, "id": 1, "role": 1}).to_list(None)
+        members = {student["id"]: student.get("role") for student in students}
+        # Don't cache a roster that was invalidated while it was being read
+        if generation == self.generation:
+            self.entries[supervisor_id] = (time.monotonic() + self.ttl_seconds, members)
+        return members
+    
+    async def member_ids(self, supervisor_id: str) -> List[str]:
+        return list(await self.members(supervisor_id))
+    
+    async def is_member(self, supervisor_id: str, user_id: str) -> bool:
+        return user_id in await self.members(supervisor_id)
+    
+    def invalidate(self, *supervisor_ids: Optional[str]):
+        supervisor_ids = [supervisor_id for supervisor_id in supervisor_ids if supervisor_id]
+        self.discard(*supervisor_ids)
+        if supervisor_ids:
+            notify_peers("roster", supervisor_ids=supervisor_ids)
+    
+    def discard(self, *supervisor_ids: str):
+        """Drop this worker's entries only"""
+        self.generation += 1
+        for supervisor_id in supervisor_ids:
+            self.entries.pop(supervisor_id, None)
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "labs": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+lab_rosters = LabRosterCache(LAB_ROSTER_TTL_SECONDS)
+
 # WebSocket Connection Manager for Real-time Updates
-class ConnectionManager:
+WS_SEND_QUEUE_SIZE = int(os.environ.get('WS_SEND_QUEUE_SIZE', '256'))
+WS_SEND_TIMEOUT_SECONDS = float(os.environ.get('WS_SEND_TIMEOUT_SECONDS', '10'))
+
+WS_ENCODINGS = ("json", "msgpack")
+
+def _encode_fallback(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+class EncodedMessage:
+    """An event serialized at most once per wire format and shared by every recipient"""
+    __slots__ = ("_message", "_text", "_packed")
+    
+    def __init__(self, message: Optional[dict] = None, text: Optional[str] = None):
+        self._message = message
+        self._text = text
+        self._packed = None
+    
+    @classmethod
+    def from_text(cls, text: str) -> "EncodedMessage":
+        """Wrap JSON received from the broker without re-encoding it"""
+        return cls(text=text)
+    
+    @property
+    def message(self) -> dict:
+        if self._message is None:
+            self._message = orjson.loads(self._text)
+        return self._message
+    
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = orjson.dumps(self.message, default=_encode_fallback, option=orjson.OPT_NON_STR_KEYS).decode()
+        return self._text
+    
+    @property
+    def packed(self) -> bytes:
+        if self._packed is None:
+            self._packed = msgpack.packb(self.message, default=_encode_fallback)
+        return self._packed
+    
+    def text_for(self, seq: Optional[int]) -> str:
+        """The shared JSON frame with a recipient's sequence number spliced in front"""
+        if seq is None:
+            return self.text
+        return f'{{"seq":{seq},' + self.text[1:]
+    
+    def packed_for(self, seq: Optional[int]) -> bytes:
+        if seq is None:
+            return self.packed
+        packed = self.packed
+        # Small maps use a one-byte fixmap header; bump its size and prepend the key
+        if 0x80 < packed[0] < 0x8f:
+            return bytes([packed[0] + 1]) + msgpack.packb("seq") + msgpack.packb(seq) + packed[1:]
+        return msgpack.packb({**self.message, "seq": seq}, default=_encode_fallback)
+
+# Event Subscriptions
+# A socket receives every event addressed to it until it subscribes; from then
+# on only events matching one of its patterns are queued. A pattern is
+# <event_type>[:<action>][@<scope>]: "*" matches any event type, an action
+# ending in "*" matches by prefix, and a scope ("self" or a user id) drops
+# events whose data.user_id names a different user.
+WS_MAX_SUBSCRIPTIONS = int(os.environ.get('WS_MAX_SUBSCRIPTIONS', '64'))
+
+def parse_subscription(pattern: str) -> tuple:
+    rest, _, scope = pattern.partition("@")
+    event, _, action = rest.partition(":")
+    return event or "*", action or None, scope or None
+
+def subscription_matches(subscription: tuple, message: dict, user_id: str) -> bool:
+    event, action, scope = subscription
+    if event != "*" and message.get("type") != event:
+        return False
+    data = message.get("data")
+    if not isinstance(data, dict):
+        return action is None and scope is None
+    if data.get("action") == "batched":
+        # A coalesced burst is delivered whole if any event in it matches
+        return any(subscription_matches(subscription, {"type": message.get("type"), "data": event}, user_id)
+                   for event in data.get("events", []))
+    if action:
+        value = data.get("action") or ""
+        if action.endswith("*"):
+            if not value.startswith(action[:-1]):
+                return False
+        elif value != action:
+            return False
+    if scope:
+        actor = data.get("user_id")
+        if actor and actor != (user_id if scope == "self" else scope):
+            return False
+    return True
+
+class ClientConnection:
+    """A websocket with its own bounded outbound queue, drained by a writer task"""
+    def __init__(self, websocket: WebSocket, user_id: str, channel: str, encoding: str = "json"):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.channel = channel
+        self.encoding = encoding
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        self.writer: Optional[asyncio.Task] = None
+        self.sending_since: Optional[float] = None
+        self.topics: List[str] = []
+        # Live events are held here until the session replay has been queued
+        self.held: Optional[list] = []
+        # None until the client subscribes: everything addressed to it is delivered
+        self.subscriptions: Optional[Dict[str, tuple]] = None
+        self.closed = False
+    
+    def enqueue(self, encoded: EncodedMessage, seq: Optional[int] = None) -> bool:
+        try:
+            self.queue.put_nowait((encoded, seq))
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    def subscribe(self, patterns: List[str]):
+        if self.subscriptions is None:
+            self.subscriptions = {}
+        for pattern in patterns:
+            if len(self.subscriptions) >= WS_MAX_SUBSCRIPTIONS:
+                break
+            if isinstance(pattern, str) and pattern:
+                self.subscriptions[pattern] = parse_subscription(pattern)
+    
+    def unsubscribe(self, patterns: List[str]):
+        if self.subscriptions is None:
+            return
+        for pattern in patterns:
+            self.subscriptions.pop(pattern, None)
+    
+    def subscribed_topics(self) -> List[str]:
+        return ["*"] if self.subscriptions is None else sorted(self.subscriptions)
+    
+    def accepts(self, encoded: EncodedMessage) -> bool:
+        if self.subscriptions is None:
+            return True
+        message = encoded.message
+        return any(subscription_matches(subscription, message, self.user_id)
+                   for subscription in self.subscriptions.values())
+
+# Event Replay
+# Every event delivered to a user gets that user's next sequence number and is
+# kept for replay, so a reconnecting client can ask for what it missed.
+REPLAY_BUFFER_SIZE = int(os.environ.get('REPLAY_BUFFER_SIZE', '200'))
+REPLAY_BUFFER_MAX_USERS = int(os.environ.get('REPLAY_BUFFER_MAX_USERS', '5000'))
+EVENT_LOG_DURABLE = os.environ.get('EVENT_LOG_DURABLE', 'true' if os.environ.get('REALTIME_BROKER_URL') else 'false').lower() == 'true'
+EVENT_LOG_CAPPED_BYTES = int(os.environ.get('EVENT_LOG_CAPPED_BYTES', str(64 * 1024 * 1024)))
+
+class MemoryEventLog:
+    """Per-user sequence numbers and a ring of recent events, in this process only.
+
+    The epoch changes on every restart so clients holding sequence numbers
+    from a previous process are told to resync.
+    """
+    def __init__(self, buffer_size: int, max_users: int):
+        self.epoch = str(uuid.uuid4())
+        self.buffer_size = buffer_size
+        self.max_users = max_users
+        self.sequences: Dict[str, int] = {}
+        self.buffers: OrderedDict = OrderedDict()
+    
+    async def start(self):
+        pass
+    
+    async def append(self, user_ids: List[str], encoded: EncodedMessage) -> Dict[str, int]:
+        seqs = {}
+        for user_id in user_ids:
+            seq = self.sequences.get(user_id, 0) + 1
+            self.sequences[user_id] = seq
+            seqs[user_id] = seq
+            
+            buffer = self.buffers.get(user_id)
+            if buffer is None:
+                buffer = self.buffers[user_id] = deque(maxlen=self.buffer_size)
+                if len(self.buffers) > self.max_users:
+                    self.buffers.popitem(last=False)
+            else:
+                self.buffers.move_to_end(user_id)
+            buffer.append((seq, encoded))
+        return seqs
+    
+    async def current(self, user_id: str) -> int:
+        return self.sequences.get(user_id, 0)
+    
+    async def since(self, user_id: str, last_seq: int) -> Optional[list]:
+        """Events after last_seq, or None when the gap can no longer be replayed"""
+        current = self.sequences.get(user_id, 0)
+        if last_seq > current:
+            return None
+        missed = [(seq, encoded) for seq, encoded in self.buffers.get(user_id, ()) if seq > last_seq]
+        if len(missed) != current - last_seq:
+            return None
+        return missed
+
+class MongoEventLog:
+    """Sequence numbers in event_sequences and events in a capped event_log, shared by every worker"""
+    epoch = "event_log"
+    
+    def __init__(self, buffer_size: int, capped_bytes: int):
+        self.buffer_size = buffer_size
+        self.capped_bytes = capped_bytes
+    
+    async def start(self):
+        try:
+            await db.create_collection("event_log", capped=True, size=self.capped_bytes)
+        except CollectionInvalid:
+            options = await db.event_log.options()
+            if not options.get("capped"):
+                await db.command("convertToCapped", "event_log", size=self.capped_bytes)
+    
+    async def append(self, user_ids: List[str], encoded: EncodedMessage) -> Dict[str, int]:
+        counters = await asyncio.gather(*[
+            db.event_sequences.find_one_and_update(
+                {"user_id": user_id},
+                {"$inc": {"seq": 1}},
+                projection={"_id": 0},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            for user_id in user_ids
+        ])
+        seqs = {counter["user_id"]: counter["seq"] for counter in counters}
+        if not seqs:
+            return seqs
+        
+        now = datetime.utcnow()
+        await db.event_log.insert_many([
+            {"user_id": user_id, "seq": seq, "frame": encoded.text, "created_at": now}
+            for user_id, seq in seqs.items()
+        ], ordered=False)
+        return seqs
+    
+    async def current(self, user_id: str) -> int:
+        counter = await db.event_sequences.find_one({"user_id": user_id}, {"_id": 0, "seq": 1})
+        return counter["seq"] if counter else 0
+    
+    async def since(self, user_id: str, last_seq: int) -> Optional[list]:
+        """Events after last_seq, or None when the gap can no longer be replayed"""
+        current = await self.current(user_id)
+        if last_seq > current:
+            return None
+        if current - last_seq > self.buffer_size:
+            return None
+        if last_seq == current:
+            return []
+        
+        events = await db.event_log.find(
+            {"user_id": user_id, "seq": {"$gt": last_seq}}, {"_id": 0, "seq": 1, "frame": 1}
+        ).sort("seq", ASCENDING).to_list(self.buffer_size)
+        # The capped collection may already have dropped the oldest missed events
+        if not events or events[0]["seq"] != last_seq + 1:
+            return None
+        return [(event["seq"], EncodedMessage.from_text(event["frame"])) for event in events]
+
+if EVENT_LOG_DURABLE:
+    event_log = MongoEventLog(REPLAY_BUFFER_SIZE, EVENT_LOG_CAPPED_BYTES)
+else:
+    event_log = MemoryEventLog(REPLAY_BUFFER_SIZE, REPLAY_BUFFER_MAX_USERS)
+
+# Realtime Broker
+# Events are published to topics and every worker delivers them to the sockets
+# it holds locally. Topics are user:<id>, lab:<supervisor_id>, channel:<name>,
+# plus the system topic used to keep per-process caches coherent.
+REALTIME_BROKER_URL = os.environ.get('REALTIME_BROKER_URL', '')
+SYSTEM_TOPIC = "system"
+
+def connection_topics(user_id: str, channel: str, supervisor_id: Optional[str]) -> List[str]:
+    """A user receives their own events, their channel, and lab events for their own and their supervisor's lab"""
+    topics = [f"user:{user_id}", f"channel:{channel}", f"lab:{user_id}"]
+    if supervisor_id and supervisor_id != user_id:
+        topics.append(f"lab:{supervisor_id}")
+    return topics
+
+class InProcessBroker:
+    """Single-process pub/sub: published events go straight to this worker's sockets"""
+    cross_process = False
+    
     def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = defaultdict(list)
-        self.user_connections: Dict[str, List[WebSocket]] = defaultdict(list)
+        self.origin = str(uuid.uuid4())
+        self.handler = None
+    
+    async def start(self, handler):
+        self.handler = handler
+    
+    async def subscribe(self, topic: str):
+        pass
+    
+    async def unsubscribe(self, topic: str):
+        pass
+    
+    async def publish(self, topic: str, encoded: EncodedMessage, seqs: Optional[Dict[str, int]] = None):
+        self.handler(topic, encoded, seqs or {})
     
-    async def connect(self, websocket: WebSocket, user_id: str, channel: str = "global"):
+    async def close(self):
+        pass
+
+class RedisBroker:
+    """Pub/sub across worker processes over Redis channels.
+
+    Each worker subscribes to the topics of the sockets it holds, so a publish
+    reaches exactly the workers that have a recipient connected.
+    """
+    cross_process = True
+    
+    def __init__(self, redis_client, prefix: str = "realtime:"):
+        self.origin = str(uuid.uuid4())
+        self.client = redis_client
+        self.prefix = prefix
+        self.pubsub = redis_client.pubsub()
+        self.handler = None
+        self.listener: Optional[asyncio.Task] = None
+    
+    async def start(self, handler):
+        self.handler = handler
+        await self.pubsub.subscribe(self.prefix + SYSTEM_TOPIC)
+        self.listener = asyncio.create_task(self._listen())
+    
+    async def subscribe(self, topic: str):
+        await self.pubsub.subscribe(self.prefix + topic)
+    
+    async def unsubscribe(self, topic: str):
+        await self.pubsub.unsubscribe(self.prefix + topic)
+    
+    async def publish(self, topic: str, encoded: EncodedMessage, seqs: Optional[Dict[str, int]] = None):
+        # First line: recipient sequence numbers; the rest: the shared event frame
+        await self.client.publish(self.prefix + topic, orjson.dumps(seqs or {}).decode() + "\n" + encoded.text)
+    
+    async def _listen(self):
+        while True:
+            try:
+                async for message in self.pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    channel, data = message["channel"], message["data"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    header, _, text = data.partition("\n")
+                    self.handler(channel[len(self.prefix):], EncodedMessage.from_text(text), orjson.loads(header))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Realtime broker listener error: {str(e)}")
+                await asyncio.sleep(1)
+    
+    async def close(self):
+        if self.listener:
+            self.listener.cancel()
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+def create_broker():
+    if REALTIME_BROKER_URL:
+        return RedisBroker(aioredis.from_url(REALTIME_BROKER_URL))
+    return InProcessBroker()
+
+class ConnectionManager:
+    def __init__(self, broker):
+        self.broker = broker
+        self.topic_connections: Dict[str, set] = {}
+        self.evicted = 0
+        self.filtered = 0
+    
+    async def start(self):
+        await self.broker.start(self.dispatch)
+    
+    async def connect(self, websocket: WebSocket, user_id: str, channel: str = "global", encoding: str = "json",
+                      supervisor_id: Optional[str] = None, last_seq: Optional[int] = None,
+                      epoch: Optional[str] = None, subscriptions: Optional[List[str]] = None) -> ClientConnection:
         await websocket.accept()
-        self.active_connections[channel].append(websocket)
-        self.user_connections[user_id].append(websocket)
+        connection = ClientConnection(websocket, user_id, channel, encoding)
+        if subscriptions:
+            # Set before the replay so missed events are filtered too
+            connection.subscribe(subscriptions)
+        connection.topics = connection_topics(user_id, channel, supervisor_id)
+        for topic in connection.topics:
+            connections = self.topic_connections.get(topic)
+            if connections is None:
+                connections = self.topic_connections[topic] = set()
+                await self.broker.subscribe(topic)
+            connections.add(connection)
+        connection.writer = asyncio.create_task(self._write_loop(connection))
         print(f"User {user_id} connected to channel {channel}")
+        try:
+            await self._resume(connection, last_seq, epoch)
+        except BaseException:
+            self.disconnect(connection)
+            raise
+        return connection
+    
+    async def _resume(self, connection: ClientConnection, last_seq: Optional[int], epoch: Optional[str]):
+        """Open the session, replay missed events, then release live events held meanwhile"""
+        try:
+            current = await event_log.current(connection.user_id)
+            missed = []
+            session_type = "session"
+            if last_seq is not None:
+                replay = await event_log.since(connection.user_id, last_seq) if epoch == event_log.epoch else None
+                if replay is None:
+                    session_type = "resync_required"
+                else:
+                    missed = replay
+            
+            self._enqueue(connection, EncodedMessage({"type": session_type, "epoch": event_log.epoch, "seq": current}))
+            replayed_through = current
+            for seq, encoded in missed:
+                replayed_through = max(replayed_through, seq)
+                if connection.accepts(encoded):
+                    self._enqueue(connection, encoded, seq)
+        finally:
+            held, connection.held = connection.held, None
+        
+        for encoded, seq in held:
+            if seq is None or seq > replayed_through:
+                self._enqueue(connection, encoded, seq)
+    
+    def disconnect(self, connection: ClientConnection):
+        if connection.closed:
+            return
+        connection.closed = True
+        connection.writer.cancel()
+        for topic in connection.topics:
+            connections = self.topic_connections.get(topic)
+            if connections is not None:
+                connections.discard(connection)
+                if not connections:
+                    del self.topic_connections[topic]
+                    asyncio.create_task(self._unsubscribe(topic))
+        print(f"User {connection.user_id} disconnected from channel {connection.channel}")
+    
+    async def _unsubscribe(self, topic: str):
+        # A new local subscriber may have arrived in the meantime
+        if topic not in self.topic_connections:
+            await self.broker.unsubscribe(topic)
+    
+    def evict(self, connection: ClientConnection, reason: str):
+        """Drop a slow or broken client without blocking the sender"""
+        if connection.closed:
+            return
+        self.evicted += 1
+        print(f"Evicting websocket for user {connection.user_id}: {reason}")
+        self.disconnect(connection)
+        asyncio.create_task(self._close(connection))
+    
+    async def _close(self, connection: ClientConnection):
+        try:
+            # 1013: try again later
+            await asyncio.wait_for(connection.websocket.close(code=1013), WS_SEND_TIMEOUT_SECONDS)
+        except Exception:
+            pass
+    
+    async def _write_loop(self, connection: ClientConnection):
+        try:
+            while True:
+                encoded, seq = await connection.queue.get()
+                connection.sending_since = time.monotonic()
+                if connection.encoding == "msgpack":
+                    await connection.websocket.send_bytes(encoded.packed_for(seq))
+                else:
+                    await connection.websocket.send_text(encoded.text_for(seq))
+                connection.sending_since = None
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.evict(connection, f"send failed ({type(e).__name__})")
+    
+    def _deliver(self, connections, encoded: EncodedMessage, seqs: Optional[Dict[str, int]] = None):
+        now = time.monotonic()
+        for connection in list(connections):
+            # Unsubscribed events still use up a sequence number; clients only see a gap
+            if not connection.accepts(encoded):
+                self.filtered += 1
+                continue
+            seq = seqs.get(connection.user_id) if seqs else None
+            if connection.held is not None:
+                connection.held.append((encoded, seq))
+            # A send stuck past the timeout means the client stopped reading
+            elif connection.sending_since and now - connection.sending_since > WS_SEND_TIMEOUT_SECONDS:
+                self.evict(connection, "send stalled")
+            else:
+                self._enqueue(connection, encoded, seq)
+    
+    def _enqueue(self, connection: ClientConnection, encoded: EncodedMessage, seq: Optional[int] = None):
+        if not connection.enqueue(encoded, seq):
+            self.evict(connection, "send queue full")
     
-    def disconnect(self, websocket: WebSocket, user_id: str, channel: str = "global"):
-        if websocket in self.active_connections[channel]:
-            self.active_connections[channel].remove(websocket)
-        if websocket in self.user_connections[user_id]:
-            self.user_connections[user_id].remove(websocket)
-        print(f"User {user_id} disconnected from channel {channel}")
+    def dispatch(self, topic: str, encoded: EncodedMessage, seqs: Dict[str, int]):
+        """Broker callback: hand a published event to the local subscribers of its topic"""
+        if topic == SYSTEM_TOPIC:
+            apply_peer_notification(encoded.message, self.broker.origin)
+            return
+        connections = self.topic_connections.get(topic)
+        if connections:
+            self._deliver(connections, encoded, seqs)
+    
+    def send_to_connection(self, connection: ClientConnection, message: dict):
+        self._enqueue(connection, EncodedMessage(message))
+    
+    async def _publish_sequenced(self, topic: str, message: dict, user_ids: List[str]):
+        encoded = EncodedMessage(message)
+        seqs = await event_log.append(user_ids, encoded)
+        await self.broker.publish(topic, encoded, seqs)
     
     async def send_personal_message(self, message: dict, user_id: str):
         """Send message to specific user"""
-        connections = self.user_connections[user_id]
-        for connection in connections:
-            try:
-                await connection.send_text(json.dumps(message))
-            except:
-                # Remove broken connections
-                self.user_connections[user_id].remove(connection)
+        await self._publish_sequenced(f"user:{user_id}", message, [user_id])
     
     async def send_to_lab(self, message: dict, supervisor_id: str):
         """Send message to all users in a lab (supervisor + students)"""
-        # Get all students under this supervisor
-        students = await db.users.find({"supervisor_id": supervisor_id}).to_list(1000)
-        user_ids = [supervisor_id] + [student["id"] for student in students]
-        
-        for user_id in user_ids:
-            await self.send_personal_message(message, user_id)
+        # Every lab member gets the event in their own sequence
+        user_ids = [supervisor_id] + await lab_rosters.member_ids(supervisor_id)
+        await self._publish_sequenced(f"lab:{supervisor_id}", message, user_ids)
     
     async def broadcast_to_channel(self, message: dict, channel: str = "global"):
         """Broadcast to all connections in a channel"""
-        connections = self.active_connections[channel]
-        for connection in connections:
-            try:
-                await connection.send_text(json.dumps(message))
-            except:
-                # Remove broken connections
-                self.active_connections[channel].remove(connection)
+        await self.broker.publish(f"channel:{channel}", EncodedMessage(message))
+    
+    def stats(self) -> dict:
+        user_topics = [connections for topic, connections in self.topic_connections.items() if topic.startswith("user:")]
+        return {
+            "broker": type(self.broker).__name__,
+            "connections": sum(len(connections) for connections in user_topics),
+            "users": len(user_topics),
+            "topics": len(self.topic_connections),
+            "evicted": self.evicted,
+            "filtered": self.filtered
+        }
 
-manager = ConnectionManager()
+# Peer Notifications
+# Workers keep principals, rosters and revocations in memory; when one worker
+# changes them the others are told over the system topic.
+_peer_notifications: set = set()
+
+def notify_peers(kind: str, **fields):
+    if not manager.broker.cross_process:
+        return
+    message = EncodedMessage({"kind": kind, "origin": manager.broker.origin, **fields})
+    task = asyncio.create_task(manager.broker.publish(SYSTEM_TOPIC, message))
+    _peer_notifications.add(task)
+    task.add_done_callback(_peer_notifications.discard)
+
+def apply_peer_notification(message: dict, origin: str):
+    if message.get("origin") == origin:
+        return  # Already applied by this worker
+    kind = message.get("kind")
+    if kind == "revoke":
+        token_revocations.revoke(message["user_id"], message["min_version"])
+        principal_cache.discard(message["user_id"])
+    elif kind == "principal":
+        principal_cache.discard(message["user_id"])
+    elif kind == "roster":
+        lab_rosters.discard(*message["supervisor_ids"])
+    elif kind == "lab_settings":
+        lab_settings_cache.discard(*message["supervisor_ids"])
+    elif kind == "collections":
+        collection_versions.bump(*message["names"], notify=False)
+
+manager = ConnectionManager(create_broker())
 
 # Event System for Real-time Updates
 class EventType(str, Enum):
@@ -862,8 +2228,94 @@ class EventType(str, Enum):
     NOTIFICATION_CREATED = "notification_created"
     BULLETIN_UPDATED = "bulletin_updated"
 
-async def emit_event(event_type: EventType, data: dict, user_id: str = None, supervisor_id: str = None):
-    """Emit real-time event to relevant users"""
+# Event Coalescing
+# With EVENT_COALESCE_MS set, the first event for a (recipient, event type) goes
+# out immediately and the rest of a burst within the window is merged into one
+# {"action": "batched", "ids", "events", "count"} message, keeping only the
+# latest event per entity.
+EVENT_COALESCE_MS = float(os.environ.get('EVENT_COALESCE_MS', '0'))
+EVENT_ENTITY_KEYS = ("todo_id", "research_log_id", "task_id", "id")
+
+def event_entity_id(data: dict) -> Optional[str]:
+    """The id of the entity an event is about, used to merge repeated updates"""
+    for key in EVENT_ENTITY_KEYS:
+        if data.get(key):
+            return data[key]
+    # Most events embed the changed document (research_log, bulletin, ...)
+    for value in data.values():
+        if isinstance(value, dict) and value.get("id"):
+            return value["id"]
+    return data.get("user_id")
+
+class EventCoalescer:
+    def __init__(self, window_seconds: float):
+        self.window = window_seconds
+        self.pending: Dict[tuple, Optional[OrderedDict]] = {}
+        self.flushes: set = set()
+        self.merged = 0
+    
+    async def emit(self, event_type: EventType, data: dict, user_id: str = None, supervisor_id: str = None):
+        key = (event_type, user_id, supervisor_id)
+        if key not in self.pending:
+            # Leading edge: a lone event is not delayed
+            self.pending[key] = None
+            task = asyncio.create_task(self._flush_later(key))
+            self.flushes.add(task)
+            task.add_done_callback(self.flushes.discard)
+            await send_event(event_type, data, user_id, supervisor_id)
+            return
+        
+        batch = self.pending[key]
+        if batch is None:
+            batch = self.pending[key] = OrderedDict()
+        entity_id = event_entity_id(data)
+        # Events without an id (e.g. a publication sync) merge with others of the same action
+        entity = (entity_id, data.get("action") if entity_id is None else None)
+        # Last write wins, and the entity moves to the end of the batch
+        previous = batch.pop(entity, None)
+        batch[entity] = merge_deltas(previous, data) if previous else data
+        self.merged += 1
+    
+    async def _flush_later(self, key: tuple):
+        await asyncio.sleep(self.window)
+        await self.flush(key)
+    
+    async def flush(self, key: tuple):
+        batch = self.pending.pop(key, None)
+        if not batch:
+            return
+        event_type, user_id, supervisor_id = key
+        events = list(batch.values())
+        if len(events) == 1:
+            data = events[0]
+        else:
+            data = {
+                "action": "batched",
+                "ids": [entity_id for entity_id, _ in batch if entity_id is not None],
+                "events": events,
+                "count": len(events)
+            }
+        try:
+            await send_event(event_type, data, user_id, supervisor_id)
+        except Exception as e:
+            print(f"Error flushing coalesced {event_type.value} events: {str(e)}")
+    
+    async def flush_all(self):
+        for task in list(self.flushes):
+            task.cancel()
+        for key in list(self.pending):
+            await self.flush(key)
+    
+    def stats(self) -> dict:
+        return {"window_ms": self.window * 1000, "pending": len(self.pending), "merged": self.merged}
+
+event_coalescer = EventCoalescer(EVENT_COALESCE_MS / 1000) if EVENT_COALESCE_MS > 0 else None
+
+# Events handed to the connection manager, by type; see /api/health/cache
+emitted_events: Dict[str, int] = {}
+
+async def send_event(event_type: EventType, data: dict, user_id: str = None, supervisor_id: str = None):
+    emitted_events[event_type.value] = emitted_events.get(event_type.value, 0) + 1
     event_message = {
         "type": event_type.value,
         "data": data,
@@ -877,6 +2329,133 @@ async def emit_event(event_type: EventType, data: dict, user_id: str = None, sup
     else:
         await manager.broadcast_to_channel(event_message)
 
+async def emit_event(event_type: EventType, data: dict, user_id: str = None, supervisor_id: str = None):
+    """Emit real-time event to relevant users"""
+    if event_coalescer:
+        await event_coalescer.emit(event_type, data, user_id, supervisor_id)
+    else:
+        await send_event(event_type, data, user_id, supervisor_id)
+
+# Document Versions
+# Research logs and lab settings carry a version that every write increments,
+# so update events ship only the changed fields. A client holding base_version
+# applies the changes; a client that is behind refetches the document.
+VERSION_INC = {"version": 1}
+
+def document_delta(before: dict, after: dict) -> dict:
+    """Field-level changes between two stored versions of a document"""
+    return {
+        "id": after.get("id"),
+        "base_version": before.get("version", 0),
+        "version": after.get("version", 0),
+        "changes": {
+            key: value for key, value in after.items()
+            if key not in ("_id", "version", "pending_events") and before.get(key) != value
+        }
+    }
+
+def document_etag(document: dict, *joined: str) -> str:
+    """Strong ETag for a versioned document; any write changes it, as does one to a joined collection"""
+    tag = f'{document.get("id")}.{document.get("version", 0)}'
+    if joined:
+        versions = ".".join(str(version) for version in collection_versions.snapshot(joined))
+        tag = f"{tag}.{collection_versions.epoch}.{versions}"
+    return f'"{tag}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+# Conditional GETs
+# List and dashboard reads are tagged with the versions of the collections they
+# read (see Collection Versions), so realtime-driven refetches of unchanged
+# data are answered with 304 before any query runs.
+CACHE_CONTROL_REVALIDATE = "private, no-cache"
+
+class ConditionalRequest:
+    """Conditional handling for one read; the ETag is taken in check(), before its queries run"""
+    def __init__(self, collections: tuple, scope: str, if_none_match: Optional[str], response: Response):
+        self.collections = collections
+        self.scope = scope
+        self.if_none_match = if_none_match
+        self.response = response
+    
+    def check(self):
+        """Tag the response, and answer 304 if the client already holds this version"""
+        key = f"{collection_versions.epoch}|{collection_versions.snapshot(self.collections)}|{self.scope}"
+        headers = {"ETag": f'"{hashlib.sha1(key.encode()).hexdigest()}"', "Cache-Control": CACHE_CONTROL_REVALIDATE}
+        if etag_matches(self.if_none_match, headers["ETag"]):
+            raise HTTPException(status_code=304, headers=headers)
+        self.response.headers.update(headers)
+
+class TrackedRead:
+    """Dependency that tags a read endpoint with the collections it reads.
+
+    The ETag covers their versions, the caller and the full URL. A matching
+    If-None-Match is answered before the endpoint runs, unless check=False,
+    in which case the endpoint calls check() itself (e.g. after a sync).
+    """
+    def __init__(self, *collections: str, check: bool = True):
+        self.collections = collections
+        self.check = check
+        collection_versions.track(*collections)
+    
+    async def __call__(self, request: Request, response: Response, current_user: User = Depends(get_current_user)) -> ConditionalRequest:
+        scope = f"{current_user.id}|{current_user.role}|{current_user.supervisor_id}|{request.url.path}?{request.url.query}"
+        conditional = ConditionalRequest(self.collections, scope, request.headers.get("if-none-match"), response)
+        if self.check:
+            conditional.check()
+        return conditional
+
+def merge_deltas(earlier: dict, later: dict) -> dict:
+    """Fold two consecutive update events for one document into a single delta"""
+    merged = dict(later)
+    for key, delta in later.items():
+        previous = earlier.get(key)
+        if key.endswith("_delta") and isinstance(previous, dict) and previous.get("version") == delta.get("base_version"):
+            merged[key] = {**delta, "base_version": previous["base_version"],
+                           "changes": {**previous["changes"], **delta["changes"]}}
+    return merged
+
+# Mutation Helpers
+# Writes return the fresh document from the same round trip instead of
+# re-reading it. Pipeline updates use literal_fields so user-supplied strings
+# starting with "$" are stored as text, not read as field paths.
+def literal_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: {"$literal": value} for field, value in fields.items()}
+
+async def update_and_fetch(collection, query: dict, update, upsert: bool = False) -> Optional[dict]:
+    """Apply an update and return the updated document, or None when nothing matched"""
+    return await collection.find_one_and_update(
+        query, update, projection={"_id": 0}, upsert=upsert, return_document=ReturnDocument.AFTER
+    )
+
+def apply_update(document: dict, update: dict) -> dict:
+    """A document after a $set/$inc/$push update, replayed locally on its pre-image"""
+    after = {**document, **update.get("$set", {})}
+    for field, amount in update.get("$inc", {}).items():
+        after[field] = (after.get(field) or 0) + amount
+    for field, value in update.get("$push", {}).items():
+        pushed = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+        after[field] = list(after.get(field) or []) + pushed
+    return after
+
+async def update_with_previous(collection, query: dict, update: dict) -> Optional[tuple]:
+    """Apply an update in one round trip, returning (before, after) or None when nothing matched.
+
+    For handlers that also need the prior state, e.g. to move counters. The
+    update is atomic, so replaying it on the returned pre-image gives exactly
+    the stored result.
+    """
+    before = await collection.find_one_and_update(
+        query, update, projection={"_id": 0}, return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        return None
+    return before, apply_update(before, update)
+
 # Notification System
 class Notification(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -888,30 +2467,215 @@ class Notification(BaseModel):
     is_read: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-async def create_notification(user_id: str, notification_type: str, title: str, message: str, payload: dict = None):
-    """Create notification and emit real-time event"""
+# Transactional Outbox
+# A state change carries a marker for the side effects it owes (outbox_batch) in
+# the same document write. The handler then records the events and notifications
+# in the outbox and responds. A dispatcher drains it in the background in batches,
+# retrying failures with backoff, and clears the markers of the batches it claims.
+# Entries left behind by a process that died mid-dispatch are reclaimed once their
+# lease expires, and markers whose outbox write never happened are rebuilt from
+# the stored document (see OutboxDispatcher.recover).
+OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', '100'))
+OUTBOX_POLL_SECONDS = float(os.environ.get('OUTBOX_POLL_SECONDS', '5'))
+OUTBOX_LEASE_SECONDS = float(os.environ.get('OUTBOX_LEASE_SECONDS', '60'))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', '8'))
+
+def outbox_event(event_type: EventType, data: dict, user_id: str = None, supervisor_id: str = None) -> dict:
+    return {"kind": "event", "event_type": event_type.value, "data": data,
+            "user_id": user_id, "supervisor_id": supervisor_id}
+
+def outbox_notification(user_id: str, notification_type: str, title: str, message: str, payload: dict = None,
+                        notification_id: Optional[str] = None) -> dict:
+    """A notification to store and push; its id is fixed now so retries never duplicate it"""
     notification = Notification(
         user_id=user_id,
         type=notification_type,
         title=title,
         message=message,
-        payload=payload or {}
+        payload=payload or {},
+        **({"id": notification_id} if notification_id else {})
     )
+    return {"kind": "notification", "notification": notification.dict()}
+
+def outbox_batch(action: str, actor_name: str, **details) -> dict:
+    """Marker for the side effects a state change owes, stored in its pending_events"""
+    return {"id": str(uuid.uuid4()), "action": action, "actor_name": actor_name,
+            "details": details, "created_at": datetime.utcnow()}
+
+# collection -> builder(batch, document) of the side effects owed by a marker there
+OUTBOX_SOURCES: Dict[str, Any] = {}
+
+class OutboxDispatcher:
+    def __init__(self):
+        self.wakeup = asyncio.Event()
+        self.dispatched = 0
+        self.retried = 0
+        self.failed = 0
+        self.recovered = 0
+    
+    async def enqueue(self, *entries: dict, batch: Optional[dict] = None, source: Optional[str] = None):
+        """Record side effects; those of a marked batch get ids derived from it, so rebuilding never duplicates them"""
+        if not entries:
+            return
+        now = datetime.utcnow()
+        rows = []
+        for index, entry in enumerate(entries):
+            row = {**entry, "id": str(uuid.uuid4()), "status": "pending", "attempts": 0,
+                   "created_at": now, "next_attempt_at": now}
+            if batch:
+                row.update(id=f"{batch['id']}.{index}", batch_id=batch["id"], source=source)
+            rows.append(row)
+        try:
+            await db.outbox.insert_many(rows, ordered=False)
+        except BulkWriteError as e:
+            # Entries of a batch that was already recorded
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+        self.wakeup.set()
+    
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        recover_at = loop.time()  # Sweep once at startup, then once per poll interval
+        while True:
+            try:
+                if loop.time() >= recover_at:
+                    recover_at = loop.time() + OUTBOX_POLL_SECONDS
+                    await self.recover()
+                # Keep draining while batches come back full
+                while await self.dispatch_batch() == OUTBOX_BATCH_SIZE:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Outbox dispatch error: {str(e)}")
+            # Woken by local enqueues; the poll picks up other workers' and leftover entries
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+    
+    async def claim(self) -> list:
+        """Lease the oldest due entries to this dispatcher"""
+        now = datetime.utcnow()
+        claimable = {"$or": [
+            {"status": "pending", "next_attempt_at": {"$lte": now}},
+            {"status": "processing", "lease_until": {"$lt": now}}
+        ]}
+        candidates = await db.outbox.find(claimable, {"_id": 0, "id": 1}).sort(
+            "created_at", ASCENDING
+        ).to_list(OUTBOX_BATCH_SIZE)
+        if not candidates:
+            return []
+        
+        claim_id = str(uuid.uuid4())
+        await db.outbox.update_many(
+            {"id": {"$in": [candidate["id"] for candidate in candidates]}, **claimable},
+            {"$set": {"status": "processing", "claim_id": claim_id,
+                      "lease_until": now + timedelta(seconds=OUTBOX_LEASE_SECONDS)}}
+        )
+        return await db.outbox.find({"claim_id": claim_id}, {"_id": 0}).sort("created_at", ASCENDING).to_list(None)
+    
+    async def release(self, entries: list):
+        """Clear the markers of claimed batches from the documents that owe them"""
+        batches: Dict[str, set] = {}
+        for entry in entries:
+            if entry.get("batch_id"):
+                batches.setdefault(entry["source"], set()).add(entry["batch_id"])
+        for source, batch_ids in batches.items():
+            await db[source].update_many(
+                {"pending_events.id": {"$in": list(batch_ids)}},
+                {"$pull": {"pending_events": {"id": {"$in": list(batch_ids)}}}}
+            )
     
-    await db.notifications.insert_one(notification.dict())
+    async def recover(self) -> int:
+        """Rebuild the side effects of stored changes whose outbox write never happened"""
+        stale = datetime.utcnow() - timedelta(seconds=OUTBOX_LEASE_SECONDS)
+        recovered = 0
+        for source, side_effects in OUTBOX_SOURCES.items():
+            documents = await db[source].find(
+                {"pending_events.created_at": {"$lt": stale}}, {"_id": 0}
+            ).to_list(OUTBOX_BATCH_SIZE)
+            for document in documents:
+                for batch in document["pending_events"]:
+                    if batch["created_at"] >= stale or await db.outbox.find_one({"batch_id": batch["id"]}, {"_id": 1}):
+                        continue
+                    entries = side_effects(batch, document)
+                    if entries:
+                        await self.enqueue(*entries, batch=batch, source=source)
+                    else:
+                        await db[source].update_one({"id": document["id"]}, {"$pull": {"pending_events": {"id": batch["id"]}}})
+                    recovered += 1
+        self.recovered += recovered
+        return recovered
+    
+    async def dispatch_batch(self) -> int:
+        entries = await self.claim()
+        if not entries:
+            return 0
+        await self.release(entries)
+        
+        failed = {}
+        notifications = [entry for entry in entries if entry["kind"] == "notification"]
+        if notifications:
+            try:
+                # Upsert by id so a retried batch never stores a notification twice
+                await db.notifications.bulk_write([
+                    UpdateOne({"id": entry["notification"]["id"]}, {"$setOnInsert": entry["notification"]}, upsert=True)
+                    for entry in notifications
+                ], ordered=False)
+            except Exception as e:
+                failed.update((entry["id"], str(e)) for entry in notifications)
+        
+        delivered = []
+        for entry in entries:
+            if entry["id"] in failed:
+                continue
+            try:
+                if entry["kind"] == "notification":
+                    notification = entry["notification"]
+                    await emit_event(EventType.NOTIFICATION_CREATED, notification, user_id=notification["user_id"])
+                else:
+                    await emit_event(EventType(entry["event_type"]), entry["data"],
+                                     user_id=entry.get("user_id"), supervisor_id=entry.get("supervisor_id"))
+                delivered.append(entry["id"])
+            except Exception as e:
+                failed[entry["id"]] = str(e)
+        
+        if delivered:
+            await db.outbox.delete_many({"id": {"$in": delivered}})
+            self.dispatched += len(delivered)
+        for entry in entries:
+            if entry["id"] in failed:
+                await self.retry(entry, failed[entry["id"]])
+        return len(entries)
+    
+    async def retry(self, entry: dict, error: str):
+        attempts = entry.get("attempts", 0) + 1
+        if attempts >= OUTBOX_MAX_ATTEMPTS:
+            status = "failed"
+            self.failed += 1
+            print(f"Outbox entry {entry['id']} failed after {attempts} attempts: {error}")
+        else:
+            status = "pending"
+            self.retried += 1
+        await db.outbox.update_one(
+            {"id": entry["id"], "claim_id": entry["claim_id"]},
+            {"$set": {"status": status, "attempts": attempts, "last_error": error,
+                      "next_attempt_at": datetime.utcnow() + timedelta(seconds=min(2 ** attempts, 300))},
+             "$unset": {"claim_id": "", "lease_until": ""}}
+        )
     
-    # Emit real-time notification
-    await emit_event(
-        EventType.NOTIFICATION_CREATED,
-        notification.dict(),
-        user_id=user_id
-    )
+    def stats(self) -> dict:
+        return {"dispatched": self.dispatched, "retried": self.retried, "failed": self.failed, "recovered": self.recovered}
+
+outbox = OutboxDispatcher()
 
 # Notifications Routes
 @api_router.get("/notifications")
-async def get_notifications(current_user: User = Depends(get_current_user)):
+async def get_notifications(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     """Get notifications for current user"""
-    notifications = await db.notifications.find({"user_id": current_user.id}).sort("created_at", -1).to_list(100)
+    notifications = await page.fetch(db.notifications, {"user_id": current_user.id}, [("created_at", DESCENDING)])
     return [Notification(**notification) for notification in notifications]
 
 @api_router.put("/notifications/{notification_id}/read")
@@ -942,6 +2706,130 @@ def validate_status_transition(current_status: ResearchLogStatus, new_status: Re
         return False
     return new_status in VALID_TRANSITIONS[current_status]
 
+def research_log_reviewer_filter(user: User) -> dict:
+    """Logs a user may review: those they supervise, or any for admins and lab managers"""
+    if user.role in [UserRole.ADMIN, UserRole.LAB_MANAGER]:
+        return {}
+    return {"supervisor_id": user.id}
+
+async def transition_research_log(
+    log_id: str,
+    target: ResearchLogStatus,
+    verb: str,
+    authority: dict,
+    fields: dict,
+    fill_missing: Optional[dict] = None,
+    preconditions: Optional[dict] = None,
+    precondition_error: str = "",
+    idempotent: bool = False,
+    pending: Optional[dict] = None
+) -> Optional[tuple]:
+    """Move a research log to target with one conditional find_one_and_update.
+
+    The filter carries the VALID_TRANSITIONS source states and the caller's
+    authority, so concurrent reviewers cannot both win. Returns (before, after),
+    or None for an idempotent call on a log already in target. A miss is
+    diagnosed with a follow-up read and mapped to 404, 403 or 400. `pending`
+    is an outbox_batch stored with the transition.
+    """
+    sources = [status.value for status, targets in VALID_TRANSITIONS.items() if target in targets]
+    if ResearchLogStatus.DRAFT.value in sources:
+        sources.append(None)  # Logs without a status are drafts
+    fill_missing = fill_missing or {}
+    
+    stage = literal_fields(fields)
+    stage.update({field: {"$ifNull": [f"${field}", {"$literal": value}]} for field, value in fill_missing.items()})
+    stage["version"] = {"$add": [{"$ifNull": ["$version", 0]}, 1]}
+    if pending:
+        stage["pending_events"] = {"$concatArrays": [{"$ifNull": ["$pending_events", []]}, {"$literal": [pending]}]}
+    
+    before = await db.research_logs.find_one_and_update(
+        {"id": log_id, "status": {"$in": sources}, **authority, **(preconditions or {})},
+        [{"$set": stage}],
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is not None:
+        # The pre-image plus the fields set above is exactly the stored new document
+        after = {**before, **fields, "version": before.get("version", 0) + 1}
+        for field, value in fill_missing.items():
+            if before.get(field) is None:
+                after[field] = value
+        return before, after
+    
+    log = await db.research_logs.find_one({"id": log_id}, {"_id": 0, "status": 1})
+    if not log:
+        raise HTTPException(status_code=404, detail="Research log not found")
+    if authority and not await db.research_logs.find_one({"id": log_id, **authority}, {"_id": 1}):
+        raise HTTPException(status_code=403, detail=f"Not authorized to {verb} this research log")
+    current_status = ResearchLogStatus(log.get("status") or ResearchLogStatus.DRAFT)
+    if idempotent and current_status == target:
+        return None
+    if not validate_status_transition(current_status, target):
+        raise HTTPException(status_code=400, detail=f"Cannot {verb} research log with status {current_status}")
+    raise HTTPException(status_code=400, detail=precondition_error or f"Cannot {verb} this research log")
+
+# action -> (recipient, notification type, title, message) for research log notifications
+RESEARCH_LOG_NOTIFICATIONS = {
+    "created": ("supervisor", "research_log_submitted", "New Research Log Submitted", "{actor} submitted a new research log: {title}"),
+    "submitted": ("supervisor", "research_log_submitted", "Research Log Submitted", "{actor} submitted research log: {title}"),
+    "returned": ("student", "research_log_returned", "Research Log Returned", "Your research log '{title}' was returned by {actor}"),
+    "accepted": ("student", "research_log_accepted", "Research Log Accepted", "Your research log '{title}' was accepted by {actor}"),
+    "declined": ("student", "research_log_declined", "Research Log Declined", "Your research log '{title}' was declined by {actor}"),
+}
+RESEARCH_LOG_REVIEW_ACTIONS = {"returned", "accepted", "declined"}
+
+def research_log_side_effects(batch: dict, log: dict, before: Optional[dict] = None) -> List[dict]:
+    """Events and notifications owed by a research log action, built from the stored log.
+
+    Without the pre-image (a batch rebuilt by the outbox sweep) the delta has
+    no base version, so clients refetch the log instead of patching it.
+    """
+    action = batch["action"]
+    student_id = log.get("student_id")
+    supervisor_id = log.get("supervisor_id")
+    
+    event_data = {"action": action, "student_id": student_id, "supervisor_id": supervisor_id}
+    if action == "created":
+        event_data["research_log"] = ResearchLog(**log).dict()
+    elif before is not None:
+        event_data["research_log_delta"] = document_delta(before, log)
+    else:
+        event_data["research_log_delta"] = {"id": log["id"], "base_version": None, "version": log.get("version", 0), "changes": {}}
+    if action in RESEARCH_LOG_REVIEW_ACTIONS:
+        event_data.update(supervisor_name=batch["actor_name"], comment=batch["details"].get("comment", ""))
+    else:
+        event_data["user_name"] = batch["actor_name"]
+    
+    # Both the student's and the supervisor's channels, once each
+    side_effects = [
+        outbox_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=recipient)
+        for recipient in dict.fromkeys((student_id, supervisor_id)) if recipient
+    ]
+    
+    notification = RESEARCH_LOG_NOTIFICATIONS.get(action)
+    if action == "created" and log.get("status") != ResearchLogStatus.SUBMITTED.value:
+        notification = None  # Only a log submitted straight away needs review
+    if notification:
+        recipient, notification_type, title, message = notification
+        if recipient == "student":
+            recipient, payload = student_id, {"research_log_id": log["id"], "comment": event_data["comment"]}
+        else:
+            # Supervisors writing their own logs are not notified
+            recipient = supervisor_id if supervisor_id != student_id else None
+            payload = {"research_log_id": log["id"], "student_id": student_id}
+        if recipient:
+            side_effects.append(outbox_notification(
+                user_id=recipient,
+                notification_type=notification_type,
+                title=title,
+                message=message.format(actor=batch["actor_name"], title=log.get("title", "")),
+                payload=payload,
+                notification_id=str(uuid.uuid5(uuid.UUID(batch["id"]), recipient))
+            ))
+    return side_effects
+
+OUTBOX_SOURCES["research_logs"] = research_log_side_effects
+
 async def get_lab_supervisor_id(user: User) -> str:
     """Get supervisor ID for a user (for lab-wide operations)"""
     if user.role == UserRole.STUDENT:
@@ -1001,6 +2889,15 @@ async def fetch_scopus_publications(scopus_id: str):
             }
         ]
 
+def scopus_publication_key(pub_data: dict) -> str:
+    """Stable identity for a Scopus record: its Scopus id, else its DOI, else a hash of the citation"""
+    if pub_data.get("scopus_id"):
+        return f"scopus:{pub_data['scopus_id']}"
+    if pub_data.get("doi"):
+        return f"doi:{pub_data['doi'].lower()}"
+    citation = "|".join(str(pub_data.get(field) or "") for field in ("title", "journal", "publication_year"))
+    return "sha1:" + hashlib.sha1(citation.encode("utf-8")).hexdigest()
+
 async def sync_lab_publications_from_scopus(lab_scopus_id: str, supervisor_id: str):
     """Sync publications from Scopus API for the entire lab using lab Scopus ID"""
     try:
@@ -1008,7 +2905,7 @@ async def sync_lab_publications_from_scopus(lab_scopus_id: str, supervisor_id: s
         publications_data = await fetch_scopus_publications(lab_scopus_id)
         
         # Clear existing lab publications to avoid duplicates
-        await db.publications.delete_many({"supervisor_id": supervisor_id})
+        deleted = await db.publications.delete_many({"supervisor_id": supervisor_id})
         
         # Process and store publications
         for pub_data in publications_data:
@@ -1027,6 +2924,7 @@ async def sync_lab_publications_from_scopus(lab_scopus_id: str, supervisor_id: s
             
             await db.publications.insert_one(publication.dict())
         
+        await track_publications(supervisor_id, len(publications_data) - deleted.deleted_count)
         print(f"Successfully synced {len(publications_data)} publications for lab Scopus ID: {lab_scopus_id}")
         
     except Exception as e:
@@ -1034,19 +2932,66 @@ async def sync_lab_publications_from_scopus(lab_scopus_id: str, supervisor_id: s
         raise e
 
 # WebSocket Endpoint for Real-time Updates
+# Frames are JSON text by default; ?encoding=msgpack switches events to binary
+# MessagePack frames. permessage-deflate is negotiated by uvicorn/websockets
+# whenever the client offers it. Control messages (ping) are always JSON text.
+#
+# The first frame is {"type": "session", "epoch", "seq"}. A reconnecting client
+# passes ?last_seq=&epoch= to have missed events replayed; when that gap is no
+# longer available it gets {"type": "resync_required"} instead and should refetch.
+#
+# Clients narrow what they receive with ?subscribe=<pattern>,<pattern> or by
+# sending {"type": "subscribe" | "unsubscribe", "topics": [...]}; the server
+# answers with {"type": "subscriptions", "topics": [...]}.
+def websocket_token_subject(token: Optional[str]) -> Optional[str]:
+    """User id of a valid, unrevoked token passed to the websocket, or None"""
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        return None
+    user_id, token_version = payload.get("sub"), payload.get("ver")
+    if token_version is not None and token_revocations.is_revoked(user_id, token_version):
+        return None
+    return user_id
+
 @app.websocket("/ws/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str):
-    await manager.connect(websocket, user_id)
+async def websocket_endpoint(websocket: WebSocket, user_id: str, encoding: str = "json",
+                             last_seq: Optional[int] = None, epoch: Optional[str] = None,
+                             subscribe: Optional[str] = None, token: Optional[str] = None):
+    if encoding not in WS_ENCODINGS:
+        encoding = "json"
+    if last_seq is not None and websocket_token_subject(token) != user_id:
+        # Past events are only replayed to their owner; anyone else is told to resync
+        epoch = None
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "supervisor_id": 1})
+    supervisor_id = user.get("supervisor_id") if user else None
+    subscriptions = [pattern.strip() for pattern in subscribe.split(",")] if subscribe else None
+    connection = await manager.connect(websocket, user_id, encoding=encoding, supervisor_id=supervisor_id,
+                                       last_seq=last_seq, epoch=epoch, subscriptions=subscriptions)
     try:
         while True:
             # Keep connection alive and handle incoming messages
             data = await websocket.receive_text()
             # You can add message handling here if needed
             message = json.loads(data)
-            if message.get("type") == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
+            message_type = message.get("type")
+            if message_type == "ping":
+                # Replies go through the send queue so only the writer task touches the socket
+                manager.send_to_connection(connection, {"type": "pong"})
+            elif message_type in ("subscribe", "unsubscribe"):
+                topics = message.get("topics")
+                if isinstance(topics, list):
+                    if message_type == "subscribe":
+                        connection.subscribe(topics)
+                    else:
+                        connection.unsubscribe(topics)
+                manager.send_to_connection(connection, {"type": "subscriptions", "topics": connection.subscribed_topics()})
     except WebSocketDisconnect:
-        manager.disconnect(websocket, user_id)
+        pass
+    finally:
+        manager.disconnect(connection)
 
 # Auth Routes
 @api_router.post("/auth/register", response_model=Token)
@@ -1055,7 +3000,7 @@ async def register(user_data: UserCreate):
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     
     # Convert date strings to datetime objects
     enrollment_date = None
@@ -1105,8 +3050,9 @@ async def register(user_data: UserCreate):
             user.approved_at = datetime.utcnow()
     
     await db.users.insert_one(user.dict())
+    lab_rosters.invalidate(user.supervisor_id)
     
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data=build_token_claims(user.dict()))
     
     return Token(
         access_token=access_token,
@@ -1129,10 +3075,10 @@ async def register(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=Token)
 async def login(login_data: UserLogin):
     user = await db.users.find_one({"email": login_data.email})
-    if not user or not verify_password(login_data.password, user["password_hash"]):
+    if not user or not await verify_password(login_data.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Incorrect email or password")
     
-    access_token = create_access_token(data={"sub": user["id"]})
+    access_token = create_access_token(data=build_token_claims(user))
     
     return Token(
         access_token=access_token,
@@ -1183,6 +3129,7 @@ async def update_profile(user_update: UserUpdate, current_user: User = Depends(g
     if update_data:
         update_data['updated_at'] = datetime.utcnow()
         await db.users.update_one({"id": current_user.id}, {"$set": update_data})
+        principal_cache.invalidate(current_user.id)
     return {"message": "Profile updated successfully"}
 
 @api_router.get("/users/profile")
@@ -1220,25 +3167,32 @@ async def upload_profile_picture(file: UploadFile = File(...), current_user: Use
         {"id": current_user.id}, 
         {"$set": {"profile_picture": file_path, "updated_at": datetime.utcnow()}}
     )
+    principal_cache.invalidate(current_user.id)
     
     return {"message": "Profile picture updated", "file_path": file_path}
 
 @api_router.post("/users/change-password")
-async def change_password(password_data: PasswordChange, current_user: User = Depends(get_current_user)):
+async def change_password(password_data: PasswordChange, current_user: User = Depends(get_current_user_record)):
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await verify_password(password_data.current_password, current_user.password_hash):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Hash new password
-    new_password_hash = hash_password(password_data.new_password)
+    new_password_hash = await hash_password(password_data.new_password)
     
     # Update password
     await db.users.update_one(
         {"id": current_user.id},
         {"$set": {"password_hash": new_password_hash, "updated_at": datetime.utcnow()}}
     )
+    await bump_token_version(current_user.id)
     
-    return {"message": "Password updated successfully"}
+    response = {"message": "Password updated successfully"}
+    if JWT_EMBED_CLAIMS:
+        # Older tokens are now revoked; hand this session a fresh one
+        updated_user = await db.users.find_one({"id": current_user.id})
+        response["access_token"] = create_access_token(data=build_token_claims(updated_user))
+    return response
 
 @api_router.put("/users/{student_id}/promote")
 async def promote_user(student_id: str, promotion_data: dict, current_user: User = Depends(get_current_user)):
@@ -1271,6 +3225,8 @@ async def promote_user(student_id: str, promotion_data: dict, current_user: User
         {"id": student_id}, 
         {"$set": {"role": new_role, "updated_at": datetime.utcnow()}}
     )
+    lab_rosters.invalidate(user_to_promote.get("supervisor_id"))
+    await bump_token_version(student_id)
     
     return {"message": f"User promoted to {new_role.replace('_', ' ')} successfully"}
 
@@ -1279,14 +3235,15 @@ async def promote_to_lab_manager(student_id: str, current_user: User = Depends(g
     if current_user.role != UserRole.SUPERVISOR:
         raise HTTPException(status_code=403, detail="Only supervisors can promote students")
     
-    student = await db.users.find_one({"id": student_id, "supervisor_id": current_user.id})
-    if not student:
+    if not await lab_rosters.is_member(current_user.id, student_id):
         raise HTTPException(status_code=404, detail="Student not found or not supervised by you")
     
     await db.users.update_one(
         {"id": student_id}, 
         {"$set": {"role": UserRole.LAB_MANAGER, "updated_at": datetime.utcnow()}}
     )
+    lab_rosters.invalidate(current_user.id)
+    await bump_token_version(student_id)
     return {"message": "Student promoted to lab manager"}
 
 @api_router.post("/users/{student_id}/revoke-lab-manager")
@@ -1294,48 +3251,120 @@ async def revoke_lab_manager(student_id: str, current_user: User = Depends(get_c
     if current_user.role != UserRole.SUPERVISOR:
         raise HTTPException(status_code=403, detail="Only supervisors can revoke lab manager status")
     
-    student = await db.users.find_one({"id": student_id, "supervisor_id": current_user.id})
-    if not student:
+    if not await lab_rosters.is_member(current_user.id, student_id):
         raise HTTPException(status_code=404, detail="Student not found or not supervised by you")
     
     await db.users.update_one(
         {"id": student_id}, 
         {"$set": {"role": UserRole.STUDENT, "updated_at": datetime.utcnow()}}
     )
+    lab_rosters.invalidate(current_user.id)
+    await bump_token_version(student_id)
     return {"message": "Lab manager status revoked"}
 
+# Lab Settings Cache
+# Every lab member loads the settings on each page load and they change rarely,
+# so the serialized document is kept per supervisor_id, tagged with its version.
+LAB_SETTINGS_TTL_SECONDS = int(os.environ.get('LAB_SETTINGS_TTL_SECONDS', '600'))
+
+def lab_settings_on_insert(fields: dict, **defaults) -> dict:
+    """$setOnInsert for a lab settings upsert: identity and defaults not being $set.
+
+    supervisor_id comes from the upsert filter.
+    """
+    on_insert = {"id": str(uuid.uuid4()), "created_at": datetime.utcnow(), **defaults}
+    return {key: value for key, value in on_insert.items() if key not in fields and key != "supervisor_id"}
+
+class LabSettingsCache:
+    """supervisor_id -> (expires_at, version, etag, JSON body) of the stored lab settings.
+
+    Handlers that write the settings pass the fresh document to refresh(),
+    which never replaces a newer version and tells the other workers to drop
+    theirs; the TTL only bounds staleness from writes made elsewhere.
+    """
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.entries: Dict[str, tuple] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+    
+    async def get(self, supervisor_id: str) -> tuple:
+        """(etag, body) for a lab; a lab without settings is cached as `{}` at version 0.
+
+        Reads never create the document, so the defaults applied by the first
+        POST/PUT or logo upload don't depend on who loaded the page first.
+        """
+        entry = self.entries.get(supervisor_id)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[2], entry[3]
+        
+        self.misses += 1
+        generation = self.generation
+        settings = await db.lab_settings.find_one({"supervisor_id": supervisor_id}, {"_id": 0}) or {}
+        # Don't cache settings that were invalidated while they were being read
+        if generation != self.generation:
+            return self.encode(supervisor_id, settings)[1:]
+        return self.store(supervisor_id, settings)
+    
+    def encode(self, supervisor_id: str, settings: dict) -> tuple:
+        version = settings.get("version", 0)
+        body = orjson.dumps(settings, default=_encode_fallback, option=orjson.OPT_NON_STR_KEYS)
+        return version, f'"lab-{supervisor_id}.{version}"', body
+    
+    def store(self, supervisor_id: str, settings: dict) -> tuple:
+        version, etag, body = self.encode(supervisor_id, settings)
+        current = self.entries.get(supervisor_id)
+        if current is None or current[1] <= version:
+            self.entries[supervisor_id] = (time.monotonic() + self.ttl_seconds, version, etag, body)
+        return etag, body
+    
+    def refresh(self, settings: dict):
+        """Cache settings a handler just wrote, and drop every other worker's copy"""
+        self.store(settings["supervisor_id"], settings)
+        notify_peers("lab_settings", supervisor_ids=[settings["supervisor_id"]])
+    
+    def discard(self, *supervisor_ids: str):
+        """Drop this worker's entries only"""
+        self.generation += 1
+        for supervisor_id in supervisor_ids:
+            self.entries.pop(supervisor_id, None)
+    
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "labs": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+lab_settings_cache = LabSettingsCache(LAB_SETTINGS_TTL_SECONDS)
+
 # Lab Settings Routes
 @api_router.post("/lab/settings")
-async def create_lab_settings(lab_data: LabSettingsUpdate, current_user: User = Depends(get_current_user)):
+async def create_lab_settings(lab_data: LabSettingsUpdate, current_user: User = Depends(get_current_user_record)):
     if current_user.role not in [UserRole.SUPERVISOR, UserRole.LAB_MANAGER]:
         raise HTTPException(status_code=403, detail="Not authorized to manage lab settings")
     
-    # Check if lab settings already exist
-    existing_settings = await db.lab_settings.find_one({"supervisor_id": current_user.id})
-    
-    if existing_settings:
-        # Update existing settings
-        update_data = {k: v for k, v in lab_data.dict().items() if v is not None}
-        update_data['updated_at'] = datetime.utcnow()
-        await db.lab_settings.update_one(
-            {"supervisor_id": current_user.id},
-            {"$set": update_data}
-        )
-        updated_settings = await db.lab_settings.find_one({"supervisor_id": current_user.id})
-        return LabSettings(**updated_settings)
-    else:
-        # Create new settings
-        lab_settings = LabSettings(
-            lab_name=lab_data.lab_name or current_user.lab_name or "Research Lab",
-            description=lab_data.description,
-            address=lab_data.address,
-            website=lab_data.website,
-            contact_email=lab_data.contact_email,
-            supervisor_id=current_user.id
-        )
-        
-        await db.lab_settings.insert_one(lab_settings.dict())
-        return lab_settings
+    # Update existing settings, or create them with defaults for the fields not given
+    update_data = {k: v for k, v in lab_data.dict().items() if v is not None}
+    update_data['updated_at'] = datetime.utcnow()
+    defaults = LabSettings(lab_name=current_user.lab_name or "Research Lab", supervisor_id=current_user.id).dict()
+    defaults.pop("version")
+    updated_settings = await update_and_fetch(
+        db.lab_settings,
+        {"supervisor_id": current_user.id},
+        {
+            "$set": update_data,
+            "$setOnInsert": lab_settings_on_insert(update_data, **defaults),
+            "$inc": VERSION_INC
+        },
+        upsert=True
+    )
+    lab_settings_cache.refresh(updated_settings)
+    return LabSettings(**updated_settings)
 
 @api_router.put("/lab/settings")
 async def update_lab_settings(lab_data: LabSettingsUpdate, current_user: User = Depends(get_current_user)):
@@ -1361,11 +3390,13 @@ async def update_lab_settings(lab_data: LabSettingsUpdate, current_user: User =
         new_scopus_id = update_data["lab_scopus_id"]
     
     # Update lab settings
-    await db.lab_settings.update_one(
+    updated_settings = await update_and_fetch(
+        db.lab_settings,
         {"supervisor_id": supervisor_id},
-        {"$set": update_data},
+        {"$set": update_data, "$setOnInsert": lab_settings_on_insert(update_data), "$inc": VERSION_INC},
         upsert=True
     )
+    lab_settings_cache.refresh(updated_settings)
     
     # Sync publications if Scopus ID was updated
     if sync_publications:
@@ -1388,21 +3419,27 @@ async def upload_lab_logo(file: UploadFile = File(...), current_user: User = Dep
     file_path = await save_uploaded_file(file, "lab_logos")
     
     # Update lab settings
-    await db.lab_settings.update_one(
-        {"supervisor_id": current_user.supervisor_id or current_user.id},
-        {"$set": {"lab_logo": file_path, "updated_at": datetime.utcnow()}},
+    supervisor_id = current_user.supervisor_id or current_user.id
+    logo_update = {"lab_logo": file_path, "updated_at": datetime.utcnow()}
+    updated_settings = await update_and_fetch(
+        db.lab_settings,
+        {"supervisor_id": supervisor_id},
+        {"$set": logo_update, "$setOnInsert": lab_settings_on_insert(logo_update), "$inc": VERSION_INC},
         upsert=True
     )
+    lab_settings_cache.refresh(updated_settings)
     
     return {"message": "Lab logo uploaded", "file_path": file_path}
 
 @api_router.get("/lab/settings")
-async def get_lab_settings(current_user: User = Depends(get_current_user)):
+async def get_lab_settings(if_none_match: Optional[str] = Header(None), current_user: User = Depends(get_current_user)):
+    """Lab settings for the current user's lab, served from the settings cache"""
     supervisor_id = current_user.supervisor_id or current_user.id
-    lab_settings = await db.lab_settings.find_one({"supervisor_id": supervisor_id})
-    if lab_settings:
-        lab_settings.pop("_id", None)
-    return lab_settings or {}
+    etag, body = await lab_settings_cache.get(supervisor_id)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL_REVALIDATE}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 # Supervisor Meeting Routes
 @api_router.post("/meetings", response_model=SupervisorMeeting)
@@ -1427,24 +3464,21 @@ async def create_meeting(meeting_data: MeetingCreate, current_user: User = Depen
     return meeting
 
 @api_router.get("/meetings")
-async def get_meetings(student_id: Optional[str] = None, current_user: User = Depends(get_current_user)):
+async def get_meetings(student_id: Optional[str] = None, page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     query = {}
     
     if current_user.role == UserRole.STUDENT:
         query["student_id"] = current_user.id
     elif student_id:
         # Verify supervisor has access to this student
-        student = await db.users.find_one({"id": student_id, "supervisor_id": current_user.id})
-        if not student:
+        if not await lab_rosters.is_member(current_user.id, student_id):
             raise HTTPException(status_code=403, detail="Not authorized to view these meetings")
         query["student_id"] = student_id
     else:
         # Get all meetings for students supervised by this user
-        students = await db.users.find({"supervisor_id": current_user.id}).to_list(1000)
-        student_ids = [student["id"] for student in students]
-        query["student_id"] = {"$in": student_ids}
+        query["student_id"] = {"$in": await lab_rosters.member_ids(current_user.id)}
     
-    meetings = await db.meetings.find(query).sort("meeting_date", -1).to_list(1000)
+    meetings = await page.fetch(db.meetings, query, [("meeting_date", DESCENDING)])
     return [SupervisorMeeting(**meeting) for meeting in meetings]
 
 @api_router.put("/meetings/{meeting_id}")
@@ -1489,7 +3523,7 @@ async def create_reminder(reminder_data: ReminderCreate, current_user: User = De
     return reminder
 
 @api_router.get("/reminders")
-async def get_reminders(user_id: Optional[str] = None, current_user: User = Depends(get_current_user)):
+async def get_reminders(user_id: Optional[str] = None, page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     target_user_id = user_id if user_id else current_user.id
     
     # Check permissions
@@ -1501,7 +3535,7 @@ async def get_reminders(user_id: Optional[str] = None, current_user: User = Depe
         if not target_user or target_user.get("supervisor_id") != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized")
     
-    reminders = await db.reminders.find({"user_id": target_user_id}).sort("reminder_date", 1).to_list(1000)
+    reminders = await page.fetch(db.reminders, {"user_id": target_user_id}, [("reminder_date", ASCENDING)])
     return [Reminder(**reminder) for reminder in reminders]
 
 @api_router.put("/reminders/{reminder_id}/complete")
@@ -1568,8 +3602,7 @@ async def create_note(note_data: NoteCreate, current_user: User = Depends(get_cu
         raise HTTPException(status_code=403, detail="Only supervisors can create notes")
     
     # Verify student belongs to supervisor
-    student = await db.users.find_one({"id": note_data.student_id, "supervisor_id": current_user.id})
-    if not student:
+    if not await lab_rosters.is_member(current_user.id, note_data.student_id):
         raise HTTPException(status_code=404, detail="Student not found or not supervised by you")
     
     note = SupervisorNote(
@@ -1585,29 +3618,26 @@ async def create_note(note_data: NoteCreate, current_user: User = Depends(get_cu
     return note
 
 @api_router.get("/notes")
-async def get_notes(student_id: Optional[str] = None, current_user: User = Depends(get_current_user)):
+async def get_notes(student_id: Optional[str] = None, page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     if current_user.role == UserRole.STUDENT:
         # Students can only see non-private notes about themselves
-        notes = await db.notes.find({
+        notes = await page.fetch(db.notes, {
             "student_id": current_user.id,
             "is_private": False
-        }).sort("created_at", -1).to_list(1000)
+        }, [("created_at", DESCENDING)])
     else:
         # Supervisors can see all notes for their students
         query = {}
         if student_id:
             # Verify supervisor has access to this student
-            student = await db.users.find_one({"id": student_id, "supervisor_id": current_user.id})
-            if not student:
+            if not await lab_rosters.is_member(current_user.id, student_id):
                 raise HTTPException(status_code=403, detail="Not authorized")
             query["student_id"] = student_id
         else:
             # Get all notes for students supervised by this user
-            students = await db.users.find({"supervisor_id": current_user.id}).to_list(1000)
-            student_ids = [student["id"] for student in students]
-            query["student_id"] = {"$in": student_ids}
+            query["student_id"] = {"$in": await lab_rosters.member_ids(current_user.id)}
         
-        notes = await db.notes.find(query).sort("created_at", -1).to_list(1000)
+        notes = await page.fetch(db.notes, query, [("created_at", DESCENDING)])
     
     return [SupervisorNote(**note) for note in notes]
 
@@ -1628,6 +3658,7 @@ async def create_task(task_data: TaskCreate, current_user: User = Depends(get_cu
     )
     
     await db.tasks.insert_one(task.dict())
+    await track_task(task.dict(), created=True)
     return task
 
 @api_router.post("/tasks/{task_id}/endorse")
@@ -1650,24 +3681,22 @@ async def endorse_task(task_id: str, endorsement: TaskEndorsement, current_user:
     return {"message": "Task endorsed successfully"}
 
 @api_router.get("/tasks", response_model=List[Task])
-async def get_tasks(current_user: User = Depends(get_current_user)):
+async def get_tasks(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
+    projection = page.select(Task.model_fields)
     if current_user.role == UserRole.STUDENT:
-        tasks = await db.tasks.find({"assigned_to": current_user.id}).to_list(1000)
+        tasks = await page.fetch(db.tasks, {"assigned_to": current_user.id}, [("created_at", ASCENDING)], projection)
     else:
-        tasks = await db.tasks.find({"assigned_by": current_user.id}).to_list(1000)
+        tasks = await page.fetch(db.tasks, {"assigned_by": current_user.id}, [("created_at", ASCENDING)], projection)
     
-    return [Task(**task) for task in tasks]
+    return page.respond(Task, tasks)
 
 @api_router.put("/tasks/{task_id}")
 async def update_task(task_id: str, update_data: TaskUpdate, current_user: User = Depends(get_current_user)):
-    task = await db.tasks.find_one({"id": task_id})
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    if current_user.role == UserRole.STUDENT and task["assigned_to"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    elif current_user.role in [UserRole.SUPERVISOR, UserRole.LAB_MANAGER] and task["assigned_by"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
+    task_filter = {"id": task_id}
+    if current_user.role == UserRole.STUDENT:
+        task_filter["assigned_to"] = current_user.id
+    elif current_user.role in [UserRole.SUPERVISOR, UserRole.LAB_MANAGER]:
+        task_filter["assigned_by"] = current_user.id
     
     update_dict = {}
     if update_data.status is not None:
@@ -1679,16 +3708,26 @@ async def update_task(task_id: str, update_data: TaskUpdate, current_user: User
     if update_data.progress_percentage is not None:
         update_dict["progress_percentage"] = update_data.progress_percentage
     
+    update = {}
+    if update_dict:
+        update["$set"] = update_dict
     if update_data.comment:
-        await db.tasks.update_one(
-            {"id": task_id},
-            {"$push": {"comments": f"{current_user.full_name}: {update_data.comment}"}}
-        )
+        update["$push"] = {"comments": f"{current_user.full_name}: {update_data.comment}"}
     
-    if update_dict:
-        await db.tasks.update_one({"id": task_id}, {"$set": update_dict})
+    if update:
+        result = await update_with_previous(db.tasks, task_filter, update)
+    else:
+        task = await db.tasks.find_one(task_filter, {"_id": 0})
+        result = (task, task) if task else None
     
-    updated_task = await db.tasks.find_one({"id": task_id})
+    if result is None:
+        # Tell a missing task apart from one this user may not change
+        if await db.tasks.find_one({"id": task_id}, {"_id": 1}):
+            raise HTTPException(status_code=403, detail="Not authorized")
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    task, updated_task = result
+    await track_task(updated_task, previous_status=task.get("status"))
     return Task(**updated_task)
 
 # Enhanced Research Log Routes with File Upload and Endorsement
@@ -1733,49 +3772,16 @@ async def create_research_log(log_data: ResearchLogCreate, current_user: User =
     log_dict.pop("log_time", None)
     log_dict.pop("submit", None)
     
-    result = await db.research_logs.insert_one(log_dict)
+    # The log is stored with the marker of the events and notification it owes
+    batch = outbox_batch("created", current_user.full_name)
+    result = await db.research_logs.insert_one({**log_dict, "pending_events": [batch]})
+    await track_research_log(log_dict, created=True)
     if result:
-        created_log = await db.research_logs.find_one({"_id": result.inserted_id})
-        research_log = ResearchLog(**created_log)
-        
-        # CRITICAL FIX: Emit to specific channels for both student and supervisor
-        student_id = log_dict["student_id"]
-        supervisor_id = log_dict["supervisor_id"]
+        # The inserted dict is the stored document; no need to read it back
+        research_log = ResearchLog(**log_dict)
         
-        # Emit to both individual channels and pair channel
-        await emit_event(
-            EventType.RESEARCH_LOG_UPDATED,
-            {
-                "action": "created",
-                "research_log": research_log.dict(),
-                "user_name": current_user.full_name,
-                "student_id": student_id,
-                "supervisor_id": supervisor_id
-            },
-            user_id=student_id
-        )
-        
-        await emit_event(
-            EventType.RESEARCH_LOG_UPDATED,
-            {
-                "action": "created", 
-                "research_log": research_log.dict(),
-                "user_name": current_user.full_name,
-                "student_id": student_id,
-                "supervisor_id": supervisor_id
-            },
-            user_id=supervisor_id
-        )
-        
-        # Create notification if submitted
-        if log_dict["status"] == ResearchLogStatus.SUBMITTED.value and supervisor_id != student_id:
-            await create_notification(
-                user_id=supervisor_id,
-                notification_type="research_log_submitted",
-                title="New Research Log Submitted",
-                message=f"{current_user.full_name} submitted a new research log: {log_data.title}",
-                payload={"research_log_id": research_log.id, "student_id": student_id}
-            )
+        # The outbox dispatcher delivers them after we respond
+        await outbox.enqueue(*research_log_side_effects(batch, log_dict), batch=batch, source="research_logs")
         
         return research_log
     else:
@@ -1795,7 +3801,7 @@ async def upload_research_log_files(log_id: str, files: List[UploadFile] = File(
     
     await db.research_logs.update_one(
         {"id": log_id},
-        {"$push": {"files": {"$each": file_paths}}}
+        {"$push": {"files": {"$each": file_paths}}, "$inc": VERSION_INC}
     )
     
     return {"message": "Files uploaded successfully", "file_paths": file_paths}
@@ -1834,7 +3840,7 @@ async def upload_research_log_attachment(
             "content_type": file.content_type,
             "size": len(content),
             "uploaded_at": datetime.utcnow()
-        }}}
+        }}, "$inc": VERSION_INC}
     )
     
     return {"message": "Attachment uploaded successfully", "file_path": file_path}
@@ -1850,7 +3856,7 @@ async def endorse_research_log(log_id: str, endorsement: ResearchLogEndorsement,
             "supervisor_endorsement": endorsement.endorsed,
             "supervisor_comments": endorsement.comments,
             "supervisor_rating": endorsement.rating
-        }}
+        }, "$inc": VERSION_INC}
     )
     
     return {"message": "Research log endorsed successfully"}
@@ -1862,31 +3868,13 @@ async def update_research_log(
     current_user: User = Depends(get_current_user)
 ):
     """Update research log (only if owner and status ∈ {DRAFT, RETURNED})"""
-    log = await db.research_logs.find_one({"id": log_id})
-    if not log:
-        raise HTTPException(status_code=404, detail="Research log not found")
-    
-    # Check if user owns the log
-    if log["user_id"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to update this research log")
-    
-    current_status = ResearchLogStatus(log.get("status", ResearchLogStatus.DRAFT))
-    
-    # Validate that log can be edited (only DRAFT or RETURNED status)
-    if current_status not in [ResearchLogStatus.DRAFT, ResearchLogStatus.RETURNED]:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Cannot edit research log with status {current_status}. Only DRAFT or RETURNED logs can be edited."
-        )
-    
     # Prepare update data
     update_data = log_update.dict()
     update_data["updated_at"] = datetime.utcnow()
     
-    # If updating a RETURNED log, reset back to DRAFT for editing
-    if current_status == ResearchLogStatus.RETURNED:
-        update_data["status"] = ResearchLogStatus.DRAFT.value
-        update_data["submitted_at"] = None  # Clear submission timestamp
+    # An edited log is a draft: a RETURNED log goes back to DRAFT for editing
+    update_data["status"] = ResearchLogStatus.DRAFT.value
+    update_data["submitted_at"] = None  # Clear submission timestamp
     
     # Handle log_date and log_time from frontend
     if "log_date" in update_data and update_data["log_date"]:
@@ -1904,108 +3892,66 @@ async def update_research_log(
     update_data.pop("log_time", None)
     update_data.pop("submit", None)
     
-    # Update the research log
-    await db.research_logs.update_one({"id": log_id}, {"$set": update_data})
-    
-    # Get updated log
-    updated_log = await db.research_logs.find_one({"id": log_id})
+    # Update the research log; ownership and an editable status are preconditions of the write
+    editable = [ResearchLogStatus.DRAFT.value, ResearchLogStatus.RETURNED.value, None]
+    batch = outbox_batch("updated", current_user.full_name)
+    result = await update_with_previous(
+        db.research_logs,
+        {"id": log_id, "user_id": current_user.id, "status": {"$in": editable}},
+        {"$set": update_data, "$inc": VERSION_INC, "$push": {"pending_events": batch}}
+    )
+    if result is None:
+        log = await db.research_logs.find_one({"id": log_id}, {"_id": 0, "user_id": 1, "status": 1})
+        if not log:
+            raise HTTPException(status_code=404, detail="Research log not found")
+        if log["user_id"] != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to update this research log")
+        current_status = ResearchLogStatus(log.get("status") or ResearchLogStatus.DRAFT)
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Cannot edit research log with status {current_status}. Only DRAFT or RETURNED logs can be edited."
+        )
+    log, updated_log = result
     research_log = ResearchLog(**updated_log)
+    await track_research_log(updated_log, previous_review_status=log.get("review_status"))
     
-    # Emit real-time event for research log update
-    student_id = updated_log.get("student_id", current_user.id)
-    supervisor_id = updated_log.get("supervisor_id")
-    
-    event_data = {
-        "action": "updated",
-        "research_log": research_log.dict(),
-        "user_name": current_user.full_name,
-        "student_id": student_id,
-        "supervisor_id": supervisor_id
-    }
-    
-    # Emit to both student and supervisor
-    if student_id:
-        await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=student_id)
-    if supervisor_id and supervisor_id != student_id:
-        await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=supervisor_id)
+    # The outbox dispatcher delivers the update events after we respond
+    await outbox.enqueue(*research_log_side_effects(batch, updated_log, log), batch=batch, source="research_logs")
     
     return research_log
 
 @api_router.post("/research-logs/{log_id}/submit")
 async def submit_research_log(log_id: str, current_user: User = Depends(get_current_user)):
     """Submit research log (DRAFT → SUBMITTED) with idempotency and proper relational keys"""
-    log = await db.research_logs.find_one({"id": log_id})
-    if not log:
-        raise HTTPException(status_code=404, detail="Research log not found")
-    
-    # Check if user owns the log
-    if log["user_id"] != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to submit this research log")
-    
-    current_status = ResearchLogStatus(log.get("status", ResearchLogStatus.DRAFT))
+    # CRITICAL FIX: Guarantee foreign keys are set on submit
+    if current_user.role == UserRole.STUDENT:
+        default_supervisor_id = current_user.supervisor_id
+    else:
+        default_supervisor_id = current_user.id
+    
+    batch = outbox_batch("submitted", current_user.full_name)
+    transition = await transition_research_log(
+        log_id,
+        ResearchLogStatus.SUBMITTED,
+        "submit",
+        authority={"user_id": current_user.id},
+        fields={"status": ResearchLogStatus.SUBMITTED.value, "submitted_at": datetime.utcnow()},
+        fill_missing={"student_id": current_user.id, "supervisor_id": default_supervisor_id},
+        # Without a supervisor to fall back on, the log must already name one
+        preconditions=None if default_supervisor_id else {"supervisor_id": {"$ne": None}},
+        precondition_error="Student must be assigned to a supervisor before submitting",
+        idempotent=True,
+        pending=batch
+    )
     
     # IDEMPOTENCY: If already submitted, return success without error
-    if current_status == ResearchLogStatus.SUBMITTED:
+    if transition is None:
         return {"message": "Research log already submitted", "status": ResearchLogStatus.SUBMITTED.value}
+    log, updated_log = transition
+    await track_research_log(updated_log, previous_review_status=log.get("review_status"))
     
-    # Validate transition
-    if not validate_status_transition(current_status, ResearchLogStatus.SUBMITTED):
-        raise HTTPException(status_code=400, detail=f"Cannot submit research log with status {current_status}")
-    
-    # CRITICAL FIX: Guarantee foreign keys are set on submit
-    update_data = {
-        "status": ResearchLogStatus.SUBMITTED.value,
-        "submitted_at": datetime.utcnow()
-    }
-    
-    # Ensure studentId is set (should be current user for students)
-    if not log.get("student_id"):
-        update_data["student_id"] = current_user.id
-    
-    # Ensure supervisorId is set from student assignment
-    if not log.get("supervisor_id"):
-        if current_user.role == UserRole.STUDENT:
-            if not current_user.supervisor_id:
-                raise HTTPException(status_code=400, detail="Student must be assigned to a supervisor before submitting")
-            update_data["supervisor_id"] = current_user.supervisor_id
-        else:
-            update_data["supervisor_id"] = current_user.id
-    
-    await db.research_logs.update_one({"id": log_id}, {"$set": update_data})
-    
-    # Get updated log
-    updated_log = await db.research_logs.find_one({"id": log_id})
-    research_log = ResearchLog(**updated_log)
-    
-    # CRITICAL FIX: Emit to specific channels for real-time sync
-    student_id = updated_log.get("student_id", current_user.id)
-    supervisor_id = updated_log.get("supervisor_id")
-    
-    # Emit researchLog.updated to both user channels and pair channel
-    event_data = {
-        "action": "submitted",
-        "research_log": research_log.dict(),
-        "user_name": current_user.full_name,
-        "student_id": student_id,
-        "supervisor_id": supervisor_id
-    }
-    
-    # Emit to student channel
-    await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=student_id)
-    
-    # Emit to supervisor channel (if different from student)
-    if supervisor_id and supervisor_id != student_id:
-        await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=supervisor_id)
-    
-    # Notify supervisor
-    if supervisor_id and supervisor_id != student_id:
-        await create_notification(
-            user_id=supervisor_id,
-            notification_type="research_log_submitted",
-            title="Research Log Submitted",
-            message=f"{current_user.full_name} submitted research log: {updated_log['title']}",
-            payload={"research_log_id": log_id, "student_id": student_id}
-        )
+    # Events to both channels and the supervisor's notification, delivered after we respond
+    await outbox.enqueue(*research_log_side_effects(batch, updated_log, log), batch=batch, source="research_logs")
     
     return {"message": "Research log submitted successfully", "status": ResearchLogStatus.SUBMITTED.value}
 
@@ -2016,21 +3962,6 @@ async def return_research_log(
     current_user: User = Depends(get_current_user)
 ):
     """Return research log with comments (SUBMITTED → RETURNED) - bounces to student immediately"""
-    log = await db.research_logs.find_one({"id": log_id})
-    if not log:
-        raise HTTPException(status_code=404, detail="Research log not found")
-    
-    # Check if user is supervisor of the log (use supervisor_id field for authority)
-    if log.get("supervisor_id") != current_user.id:
-        if current_user.role not in [UserRole.ADMIN, UserRole.LAB_MANAGER]:
-            raise HTTPException(status_code=403, detail="Not authorized to return this research log")
-    
-    current_status = ResearchLogStatus(log.get("status", ResearchLogStatus.DRAFT))
-    
-    # Validate transition
-    if not validate_status_transition(current_status, ResearchLogStatus.RETURNED):
-        raise HTTPException(status_code=400, detail=f"Cannot return research log with status {current_status}")
-    
     # Update status
     update_data = {
         "status": ResearchLogStatus.RETURNED.value,
@@ -2043,42 +3974,19 @@ async def return_research_log(
         "review_feedback": comment_data.get("comment", "")
     }
     
-    await db.research_logs.update_one({"id": log_id}, {"$set": update_data})
-    
-    # Get updated log
-    updated_log = await db.research_logs.find_one({"id": log_id})
-    research_log = ResearchLog(**updated_log)
-    
-    # CRITICAL FIX: Emit to both student and supervisor channels for immediate update
-    student_id = updated_log.get("student_id")
-    supervisor_id = updated_log.get("supervisor_id")
-    
-    event_data = {
-        "action": "returned",
-        "research_log": research_log.dict(),
-        "supervisor_name": current_user.full_name,
-        "comment": comment_data.get("comment", ""),
-        "student_id": student_id,
-        "supervisor_id": supervisor_id
-    }
+    batch = outbox_batch("returned", current_user.full_name, comment=comment_data.get("comment", ""))
+    log, updated_log = await transition_research_log(
+        log_id,
+        ResearchLogStatus.RETURNED,
+        "return",
+        authority=research_log_reviewer_filter(current_user),
+        fields=update_data,
+        pending=batch
+    )
+    await track_research_log(updated_log, previous_review_status=log.get("review_status"))
     
-    # Emit to student (bounces back immediately)
-    if student_id:
-        await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=student_id)
-    
-    # Emit to supervisor
-    if supervisor_id:
-        await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=supervisor_id)
-    
-    # Notify student
-    if student_id:
-        await create_notification(
-            user_id=student_id,
-            notification_type="research_log_returned",
-            title="Research Log Returned",
-            message=f"Your research log '{updated_log['title']}' was returned by {current_user.full_name}",
-            payload={"research_log_id": log_id, "comment": comment_data.get("comment", "")}
-        )
+    # Events to both channels and the student's notification, delivered after we respond
+    await outbox.enqueue(*research_log_side_effects(batch, updated_log, log), batch=batch, source="research_logs")
     
     return {"message": "Research log returned successfully", "status": ResearchLogStatus.RETURNED.value}
 
@@ -2089,21 +3997,6 @@ async def accept_research_log(
     current_user: User = Depends(get_current_user)
 ):
     """Accept research log (SUBMITTED → ACCEPTED) - bounces to student immediately"""
-    log = await db.research_logs.find_one({"id": log_id})
-    if not log:
-        raise HTTPException(status_code=404, detail="Research log not found")
-    
-    # Check if user is supervisor of the log (use supervisor_id field for authority)
-    if log.get("supervisor_id") != current_user.id:
-        if current_user.role not in [UserRole.ADMIN, UserRole.LAB_MANAGER]:
-            raise HTTPException(status_code=403, detail="Not authorized to accept this research log")
-    
-    current_status = ResearchLogStatus(log.get("status", ResearchLogStatus.DRAFT))
-    
-    # Validate transition
-    if not validate_status_transition(current_status, ResearchLogStatus.ACCEPTED):
-        raise HTTPException(status_code=400, detail=f"Cannot accept research log with status {current_status}")
-    
     # Update status
     update_data = {
         "status": ResearchLogStatus.ACCEPTED.value,
@@ -2117,42 +4010,19 @@ async def accept_research_log(
         "supervisor_endorsement": True
     }
     
-    await db.research_logs.update_one({"id": log_id}, {"$set": update_data})
-    
-    # Get updated log
-    updated_log = await db.research_logs.find_one({"id": log_id})
-    research_log = ResearchLog(**updated_log)
-    
-    # CRITICAL FIX: Emit to both student and supervisor channels for immediate update
-    student_id = updated_log.get("student_id")
-    supervisor_id = updated_log.get("supervisor_id")
-    
-    event_data = {
-        "action": "accepted",
-        "research_log": research_log.dict(),
-        "supervisor_name": current_user.full_name,
-        "comment": comment_data.get("comment", "Approved"),
-        "student_id": student_id,
-        "supervisor_id": supervisor_id
-    }
-    
-    # Emit to student (bounces back immediately)
-    if student_id:
-        await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=student_id)
+    batch = outbox_batch("accepted", current_user.full_name, comment=comment_data.get("comment", "Approved"))
+    log, updated_log = await transition_research_log(
+        log_id,
+        ResearchLogStatus.ACCEPTED,
+        "accept",
+        authority=research_log_reviewer_filter(current_user),
+        fields=update_data,
+        pending=batch
+    )
+    await track_research_log(updated_log, previous_review_status=log.get("review_status"))
     
-    # Emit to supervisor
-    if supervisor_id:
-        await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=supervisor_id)
-    
-    # Notify student
-    if student_id:
-        await create_notification(
-            user_id=student_id,
-            notification_type="research_log_accepted",
-            title="Research Log Accepted",
-            message=f"Your research log '{updated_log['title']}' was accepted by {current_user.full_name}",
-            payload={"research_log_id": log_id, "comment": comment_data.get("comment", "Approved")}
-        )
+    # Events to both channels and the student's notification, delivered after we respond
+    await outbox.enqueue(*research_log_side_effects(batch, updated_log, log), batch=batch, source="research_logs")
     
     return {"message": "Research log accepted successfully", "status": ResearchLogStatus.ACCEPTED.value}
 
@@ -2163,21 +4033,6 @@ async def decline_research_log(
     current_user: User = Depends(get_current_user)
 ):
     """Decline research log (SUBMITTED → DECLINED) - bounces to student immediately"""
-    log = await db.research_logs.find_one({"id": log_id})
-    if not log:
-        raise HTTPException(status_code=404, detail="Research log not found")
-    
-    # Check if user is supervisor of the log (use supervisor_id field for authority)
-    if log.get("supervisor_id") != current_user.id:
-        if current_user.role not in [UserRole.ADMIN, UserRole.LAB_MANAGER]:
-            raise HTTPException(status_code=403, detail="Not authorized to decline this research log")
-    
-    current_status = ResearchLogStatus(log.get("status", ResearchLogStatus.DRAFT))
-    
-    # Validate transition
-    if not validate_status_transition(current_status, ResearchLogStatus.DECLINED):
-        raise HTTPException(status_code=400, detail=f"Cannot decline research log with status {current_status}")
-    
     # Update status
     update_data = {
         "status": ResearchLogStatus.DECLINED.value,
@@ -2191,42 +4046,19 @@ async def decline_research_log(
         "supervisor_endorsement": False
     }
     
-    await db.research_logs.update_one({"id": log_id}, {"$set": update_data})
-    
-    # Get updated log
-    updated_log = await db.research_logs.find_one({"id": log_id})
-    research_log = ResearchLog(**updated_log)
-    
-    # CRITICAL FIX: Emit to both student and supervisor channels for immediate update
-    student_id = updated_log.get("student_id")
-    supervisor_id = updated_log.get("supervisor_id")
-    
-    event_data = {
-        "action": "declined",
-        "research_log": research_log.dict(),
-        "supervisor_name": current_user.full_name,
-        "comment": comment_data.get("comment", "Declined"),
-        "student_id": student_id,
-        "supervisor_id": supervisor_id
-    }
-    
-    # Emit to student (bounces back immediately)
-    if student_id:
-        await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=student_id)
+    batch = outbox_batch("declined", current_user.full_name, comment=comment_data.get("comment", "Declined"))
+    log, updated_log = await transition_research_log(
+        log_id,
+        ResearchLogStatus.DECLINED,
+        "decline",
+        authority=research_log_reviewer_filter(current_user),
+        fields=update_data,
+        pending=batch
+    )
+    await track_research_log(updated_log, previous_review_status=log.get("review_status"))
     
-    # Emit to supervisor  
-    if supervisor_id:
-        await emit_event(EventType.RESEARCH_LOG_UPDATED, event_data, user_id=supervisor_id)
-    
-    # Notify student
-    if student_id:
-        await create_notification(
-            user_id=student_id,
-            notification_type="research_log_declined",
-            title="Research Log Declined",
-            message=f"Your research log '{updated_log['title']}' was declined by {current_user.full_name}",
-            payload={"research_log_id": log_id, "comment": comment_data.get("comment", "Declined")}
-        )
+    # Events to both channels and the student's notification, delivered after we respond
+    await outbox.enqueue(*research_log_side_effects(batch, updated_log, log), batch=batch, source="research_logs")
     
     return {"message": "Research log declined successfully", "status": ResearchLogStatus.DECLINED.value}
 
@@ -2260,8 +4092,9 @@ async def review_research_log(
             "reviewed_by": current_user.id,
             "reviewed_at": datetime.utcnow().isoformat(),
             "reviewer_name": current_user.full_name
-        }}
+        }, "$inc": VERSION_INC}
     )
+    await track_research_log({**log, "review_status": action}, previous_review_status=log.get("review_status"))
     
     return {"message": f"Research log {action} successfully"}
 
@@ -2282,34 +4115,51 @@ async def download_research_log_pdf(log_id: str, current_user: User = Depends(ge
     # In a full implementation, you would generate an actual PDF using libraries like reportlab or weasyprint
     return {"message": "PDF generation feature - Coming Soon!", "log_title": log["title"]}
 
-@api_router.get("/research-logs", response_model=List[ResearchLog])
-async def get_research_logs(current_user: User = Depends(get_current_user)):
+@api_router.get(
+    "/research-logs",
+    response_model=Union[List[ResearchLog], List[ResearchLogSummary]],
+    dependencies=[Depends(TrackedRead("research_logs", "users"))]
+)
+async def get_research_logs(
+    page: PageParams = Depends(),
+    view: str = Query("full", pattern="^(full|summary)$"),
+    current_user: User = Depends(get_current_user)
+):
     """UNIFIED READ MODEL: Get research logs with unified queries (no role-split datasets)"""
+    # Submitted logs newest first, then drafts (null submitted_at sorts last) by date
+    sort = [("submitted_at", DESCENDING), ("date", DESCENDING)]
+    model = ResearchLogSummary if view == "summary" else ResearchLog
+    # Table views get no long text fields unless they ask for them
+    projection = page.select(
+        model.model_fields,
+        exclude=LIST_VIEW_EXCLUDED_FIELDS["research_logs"],
+        requires=("student_id", "supervisor_id")
+    )
+    if "attachment_count" in projection:
+        # Counted by the server so the arrays themselves are never sent
+        projection["attachment_count"] = {"$add": [
+            {"$size": {"$ifNull": ["$files", []]}},
+            {"$size": {"$ifNull": ["$attachments", []]}}
+        ]}
     
     if current_user.role == UserRole.STUDENT:
         # STUDENT LIST: Only use studentId filter (source of truth)
-        logs = await db.research_logs.find(
-            {"student_id": current_user.id}
-        ).sort("submitted_at", -1).to_list(1000)
-        
-        # Apply secondary sort for null submitted_at
-        logs_with_submitted = [log for log in logs if log.get("submitted_at")]
-        logs_without_submitted = [log for log in logs if not log.get("submitted_at")]
-        logs_without_submitted.sort(key=lambda x: x.get("date", datetime.min), reverse=True)
-        
-        logs = logs_with_submitted + logs_without_submitted
-        
+        logs = await page.fetch(db.research_logs, {"student_id": current_user.id}, sort, projection)
     else:
         # SUPERVISOR LIST: Only use supervisorId filter (source of truth)
-        logs = await db.research_logs.find(
-            {"supervisor_id": current_user.id}
-        ).sort([("submitted_at", -1), ("date", -1)]).to_list(1000)
+        logs = await page.fetch(db.research_logs, {"supervisor_id": current_user.id}, sort, projection)
+    
+    # Resolve every student and supervisor on the page in one query
+    users = UserBatchLoader()
+    for log in logs:
+        users.prime(log.get("student_id"), log.get("supervisor_id"))
+    await users.load()
     
     # Enhance logs with student information for display
     for log in logs:
         # Get student info for display
         if log.get("student_id"):
-            student = await db.users.find_one({"id": log["student_id"]})
+            student = users.get(log["student_id"])
             if student:
                 log["student_name"] = student.get("full_name", "Unknown Student")
                 log["student_email"] = student.get("email", "")
@@ -2319,7 +4169,7 @@ async def get_research_logs(current_user: User = Depends(get_current_user)):
         
         # Get supervisor info for display
         if log.get("supervisor_id"):
-            supervisor = await db.users.find_one({"id": log["supervisor_id"]})
+            supervisor = users.get(log["supervisor_id"])
             if supervisor:
                 log["supervisor_name"] = supervisor.get("full_name", "Unknown Supervisor")
         
@@ -2335,7 +4185,7 @@ async def get_research_logs(current_user: User = Depends(get_current_user)):
         if "supervisor_comment" not in log:
             log["supervisor_comment"] = None
     
-    return [ResearchLog(**log) for log in logs]
+    return page.respond(model, logs)
 
 @api_router.get("/research-logs/student/status")
 async def get_student_research_log_status(current_user: User = Depends(get_current_user)):
@@ -2373,6 +4223,41 @@ async def get_student_research_log_status(current_user: User = Depends(get_curre
     
     return {"logs": status_logs, "total_count": len(status_logs)}
 
+# Registered after the fixed /research-logs/... paths so it never shadows them
+@api_router.get("/research-logs/{log_id}", response_model=ResearchLog)
+async def get_research_log(
+    log_id: str,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user)
+):
+    """Full research log, with a version ETag for conditional requests"""
+    if current_user.role == UserRole.STUDENT:
+        access = {"student_id": current_user.id}
+    else:
+        access = research_log_reviewer_filter(current_user)
+    
+    log = await db.research_logs.find_one({"id": log_id, **access}, {"_id": 0})
+    if not log:
+        raise HTTPException(status_code=404, detail="Research log not found")
+    
+    # The names joined below come from users, so renames change the tag too
+    headers = {"ETag": document_etag(log, "users"), "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    users = UserBatchLoader()
+    users.prime(log.get("student_id"), log.get("supervisor_id"))
+    await users.load()
+    student = users.get(log.get("student_id"))
+    supervisor = users.get(log.get("supervisor_id"))
+    if student:
+        log["student_name"] = student.get("full_name", "Unknown Student")
+        log["student_email"] = student.get("email", "")
+    if supervisor:
+        log["supervisor_name"] = supervisor.get("full_name", "Unknown Supervisor")
+    
+    return TrustedJSONResponse(trusted_dump(ResearchLog, log), headers=headers)
+
 @api_router.get("/grants/active")
 async def get_active_grants(current_user: User = Depends(get_current_user)):
     """Get only active grants with balance information for dashboard display"""
@@ -2462,6 +4347,7 @@ async def update_user_avatar(user_id: str, avatar_data: dict, current_user: User
         {"id": user_id},
         {"$set": {"avatar_emoji": avatar_emoji}}
     )
+    principal_cache.invalidate(user_id)
     
     # Get updated user
     user = await db.users.find_one({"id": user_id})
@@ -2483,23 +4369,24 @@ async def update_user_avatar(user_id: str, avatar_data: dict, current_user: User
     
     return {"message": "Avatar updated successfully", "avatar_emoji": avatar_emoji}
 
-@api_router.get("/bulletins", response_model=List[Bulletin])
-async def get_bulletins(current_user: User = Depends(get_current_user)):
+@api_router.get("/bulletins", response_model=List[Bulletin], dependencies=[Depends(TrackedRead("bulletins"))])
+async def get_bulletins(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     """Get bulletins - ensure approved bulletins are visible to all users"""
     # Get supervisor ID for lab-wide bulletins
     supervisor_id = await get_lab_supervisor_id(current_user)
     
+    projection = page.select(Bulletin.model_fields)
     if current_user.role in [UserRole.SUPERVISOR, UserRole.LAB_MANAGER, UserRole.ADMIN]:
         # Supervisors can see all bulletins in their lab
-        bulletins = await db.bulletins.find({"supervisor_id": supervisor_id}).sort("created_at", -1).to_list(1000)
+        bulletins = await page.fetch(db.bulletins, {"supervisor_id": supervisor_id}, [("created_at", DESCENDING)], projection)
     else:
         # Students can see all approved bulletins in their lab
-        bulletins = await db.bulletins.find({
+        bulletins = await page.fetch(db.bulletins, {
             "supervisor_id": supervisor_id,
             "status": BulletinStatus.APPROVED.value
-        }).sort("created_at", -1).to_list(1000)
+        }, [("created_at", DESCENDING)], projection)
     
-    return [Bulletin(**bulletin) for bulletin in bulletins]
+    return page.respond(Bulletin, bulletins)
 
 @api_router.get("/bulletins/highlights")
 async def get_highlight_bulletins(current_user: User = Depends(get_current_user)):
@@ -2538,10 +4425,11 @@ async def create_grant(grant_data: GrantCreate, current_user: User = Depends(get
     )
     
     await db.grants.insert_one(grant.dict())
+    await track_grant(None, grant.dict())
     return grant
 
-@api_router.get("/grants", response_model=List[Grant])
-async def get_grants(current_user: User = Depends(get_current_user)):
+@api_router.get("/grants", response_model=List[Grant], dependencies=[Depends(TrackedRead("grants", "users"))])
+async def get_grants(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     """Get grants - ensure proper synchronization for all users under supervisor hierarchy"""
     # Determine supervisor ID for proper lab-wide synchronization
     if current_user.role == UserRole.STUDENT:
@@ -2555,12 +4443,13 @@ async def get_grants(current_user: User = Depends(get_current_user)):
     
     # Get all grants in the lab (created by supervisor or lab members)
     # Students automatically see grants from their supervisor's lab
-    grants = await db.grants.find({
-        "$or": [
-            {"principal_investigator": supervisor_id},
-            {"principal_investigator": {"$in": await get_lab_member_ids(supervisor_id)}}
-        ]
-    }).to_list(1000)
+    # (the member list already includes the supervisor)
+    grants = await page.fetch(
+        db.grants,
+        {"principal_investigator": {"$in": await get_lab_member_ids(supervisor_id)}},
+        [("created_at", ASCENDING)],
+        page.select(Grant.model_fields, requires=("total_amount", "spent_amount", "balance"))
+    )
     
     # Enhanced balance calculations for dashboard display
     for grant in grants:
@@ -2579,12 +4468,11 @@ async def get_grants(current_user: User = Depends(get_current_user)):
         grant.pop("_id", None)
     
     print(f"Found {len(grants)} grants for user {current_user.id} (supervisor: {supervisor_id})")
-    return [Grant(**grant) for grant in grants]
+    return page.respond(Grant, grants)
 
 async def get_lab_member_ids(supervisor_id: str) -> List[str]:
     """Helper function to get all lab member IDs under a supervisor"""
-    students = await db.users.find({"supervisor_id": supervisor_id}).to_list(1000)
-    lab_member_ids = [student["id"] for student in students]
+    lab_member_ids = await lab_rosters.member_ids(supervisor_id)
     lab_member_ids.append(supervisor_id)  # Include supervisor
     return lab_member_ids
 
@@ -2621,6 +4509,7 @@ async def update_grant(grant_id: str, grant_update: dict, current_user: User = D
     if update_data:
         update_data["updated_at"] = datetime.utcnow()
         await db.grants.update_one({"id": grant_id}, {"$set": update_data})
+        await track_grant(grant, {**grant, **update_data})
     
     return {"message": "Grant updated successfully"}
 
@@ -2638,6 +4527,7 @@ async def delete_grant(grant_id: str, current_user: User = Depends(get_current_u
     # No additional authorization checks needed for supervisors
     
     await db.grants.delete_one({"id": grant_id})
+    await track_grant(grant, None)
     return {"message": "Grant deleted successfully"}
 
 # Milestone endpoints
@@ -2659,24 +4549,27 @@ async def create_milestone(milestone: MilestoneCreate, current_user: User = Depe
     return Milestone(**milestone_data)
 
 @api_router.get("/milestones", response_model=List[Milestone])
-async def get_milestones(current_user: User = Depends(get_current_user)):
+async def get_milestones(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     """Get milestones - students see their own, supervisors see all"""
     
+    projection = page.select(Milestone.model_fields, requires=("student_id",))
     if current_user.role == UserRole.STUDENT:
-        milestones = await db.milestones.find({"student_id": current_user.id}).to_list(None)
+        milestones = await page.fetch(db.milestones, {"student_id": current_user.id}, [("created_at", ASCENDING)], projection)
     else:
-        milestones = await db.milestones.find().to_list(None)
+        milestones = await page.fetch(db.milestones, {}, [("created_at", ASCENDING)], projection)
     
     # Add student names for supervisors
     if current_user.role != UserRole.STUDENT:
-        student_ids = {milestone["student_id"] for milestone in milestones}
-        students = await db.users.find({"id": {"$in": list(student_ids)}}).to_list(None)
-        student_map = {student["id"]: student["full_name"] for student in students}
+        users = UserBatchLoader()
+        for milestone in milestones:
+            users.prime(milestone["student_id"])
+        await users.load()
         
         for milestone in milestones:
-            milestone["student_name"] = student_map.get(milestone["student_id"], "Unknown Student")
+            student = users.get(milestone["student_id"])
+            milestone["student_name"] = student["full_name"] if student else "Unknown Student"
     
-    return [Milestone(**milestone) for milestone in milestones]
+    return page.respond(Milestone, milestones)
 
 @api_router.put("/milestones/{milestone_id}")
 async def update_milestone(milestone_id: str, milestone_update: dict, current_user: User = Depends(get_current_user)):
@@ -2721,6 +4614,7 @@ async def record_grant_spending(grant_id: str, amount: float, current_user: User
         {"id": grant_id},
         {"$set": {"spent_amount": new_spent, "balance": new_balance}}
     )
+    await track_grant(grant, {**grant, "spent_amount": new_spent})
     
     return {"message": "Grant spending recorded", "new_balance": new_balance}
 
@@ -2756,15 +4650,15 @@ async def register_for_grant(grant_id: str, registration_data: GrantRegistration
     return registration
 
 @api_router.get("/grants/registrations")
-async def get_grant_registrations(current_user: User = Depends(get_current_user)):
+async def get_grant_registrations(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     """Get grant registrations - students see their own, supervisors see all"""
     if current_user.role == UserRole.STUDENT:
-        registrations = await db.grant_registrations.find({"applicant_id": current_user.id}).to_list(1000)
+        registrations = await page.fetch(db.grant_registrations, {"applicant_id": current_user.id}, [("created_at", ASCENDING)])
     else:
         # Supervisors see registrations for their grants
-        grants = await db.grants.find({"principal_investigator": current_user.id}).to_list(1000)
+        grants = await db.grants.find({"principal_investigator": current_user.id}, {"id": 1}).to_list(None)
         grant_ids = [grant["id"] for grant in grants]
-        registrations = await db.grant_registrations.find({"grant_id": {"$in": grant_ids}}).to_list(1000)
+        registrations = await page.fetch(db.grant_registrations, {"grant_id": {"$in": grant_ids}}, [("created_at", ASCENDING)])
     
     return [GrantRegistration(**reg) for reg in registrations]
 
@@ -2796,7 +4690,7 @@ async def approve_grant_registration(registration_id: str, approved: bool, comme
 
 # Publication Routes with Scopus Integration
 @api_router.post("/publications/sync-scopus")
-async def sync_scopus_publications(current_user: User = Depends(get_current_user)):
+async def sync_scopus_publications(current_user: User = Depends(get_current_user_record)):
     if current_user.role != UserRole.SUPERVISOR:
         raise HTTPException(status_code=403, detail="Only supervisors can sync publications")
     
@@ -2827,10 +4721,15 @@ async def sync_scopus_publications(current_user: User = Depends(get_current_user
             await db.publications.insert_one(publication.dict())
             synced_count += 1
     
+    await track_publications(current_user.id, synced_count)
     return {"message": f"Synced {synced_count} publications from Scopus"}
 
 @api_router.get("/publications", response_model=List[Publication])
-async def get_publications(current_user: User = Depends(get_current_user)):
+async def get_publications(
+    page: PageParams = Depends(),
+    conditional: ConditionalRequest = Depends(TrackedRead("publications", "users", check=False)),
+    current_user: User = Depends(get_current_user)
+):
     """Get publications - ensure lab-wide visibility for all users"""
     # Get supervisor ID for lab-wide data access
     supervisor_id = await get_lab_supervisor_id(current_user)
@@ -2846,9 +4745,9 @@ async def get_publications(current_user: User = Depends(get_current_user)):
             scopus_publications = await fetch_scopus_publications(supervisor_user["scopus_id"])
             
             # Update publications in database for lab-wide access
+            inserted = modified = 0
             for pub_data in scopus_publications:
                 pub_dict = {
-                    "id": str(uuid.uuid4()),
                     "supervisor_id": supervisor_id,
                     "scopus_id": supervisor_user["scopus_id"],
                     "title": pub_data.get("title", ""),
@@ -2861,27 +4760,64 @@ async def get_publications(current_user: User = Depends(get_current_user)):
                     "keywords": pub_data.get("keywords", []),
                     "publication_date": pub_data.get("publication_date", ""),
                     "source": "scopus",
-                    "created_at": datetime.utcnow()
+                    "source_key": scopus_publication_key(pub_data)
                 }
                 
-                # Upsert publication (update if exists, insert if new)
-                await db.publications.update_one(
-                    {"doi": pub_dict["doi"], "supervisor_id": supervisor_id},
-                    {"$set": pub_dict},
+                # Upsert publication (update if exists, insert if new), keyed on the
+                # Scopus record so publications without a DOI don't share a document.
+                # Identity and creation time are only written on insert, so an
+                # unchanged publication is a no-op that MongoDB reports as not modified.
+                record = {"source_key": pub_dict["source_key"]}
+                if pub_dict["doi"]:
+                    # Adopt publications stored before they carried a source key
+                    record = {"$or": [record, {"source_key": {"$exists": False}, "doi": pub_dict["doi"]}]}
+                result = await db.publications.update_one(
+                    {"supervisor_id": supervisor_id, **record},
+                    {"$set": pub_dict, "$setOnInsert": {"id": str(uuid.uuid4()), "created_at": datetime.utcnow()}},
                     upsert=True
                 )
+                if result.upserted_id is not None:
+                    inserted += 1
+                modified += result.modified_count
+            
+            # Publications without a DOI used to be merged into one document
+            merged = await db.publications.delete_many({
+                "supervisor_id": supervisor_id,
+                "source": "scopus",
+                "source_key": {"$exists": False},
+                "doi": {"$in": ["", None]}
+            })
+            if inserted or merged.deleted_count:
+                await track_publications(supervisor_id, inserted - merged.deleted_count)
+            # Only a sync that changed the stored set is news to the rest of the lab
+            if inserted or modified or merged.deleted_count:
+                await emit_event(
+                    EventType.PUBLICATION_UPDATED,
+                    {
+                        "action": "synchronized",
+                        "publications_count": await db.publications.count_documents({"supervisor_id": supervisor_id}),
+                        "supervisor_scopus_id": supervisor_user.get("scopus_id")
+                    },
+                    supervisor_id=supervisor_id
+                )
         except Exception as e:
             print(f"Error fetching SCOPUS publications: {e}")
     
+    # The Scopus sync runs on every read; only the stored list can be unchanged
+    conditional.check()
+    
     # Fetch all publications for the lab (both SCOPUS and manual entries)
-    lab_publications = await db.publications.find({
+    lab_publications = await page.fetch(db.publications, {
         "$or": [
             {"supervisor_id": supervisor_id},
             {"author_ids": {"$in": [current_user.id]}}  # Include publications where user is an author
         ]
-    }).sort("publication_year", -1).to_list(1000)
+    }, [("publication_year", DESCENDING)], page.select(
+        Publication.model_fields,
+        exclude=LIST_VIEW_EXCLUDED_FIELDS["publications"],
+        requires=("authors", "publication_year", "year")
+    ))
     
-    publications = []
     for pub in lab_publications:
         # Ensure proper author handling (string or array)
         if isinstance(pub.get("authors"), str):
@@ -2901,21 +4837,8 @@ async def get_publications(current_user: User = Depends(get_current_user)):
                 pub["publication_year"] = int(pub["publication_year"]) if pub["publication_year"] else 2024
             except ValueError:
                 pub["publication_year"] = 2024
-        
-        publications.append(Publication(**pub))
-    
-    # Emit real-time event to synchronize with all lab members
-    await emit_event(
-        EventType.PUBLICATION_UPDATED,
-        {
-            "action": "synchronized",
-            "publications_count": len(publications),
-            "supervisor_scopus_id": supervisor_user.get("scopus_id")
-        },
-        supervisor_id=supervisor_id
-    )
     
-    return publications
+    return page.respond(Publication, lab_publications)
 
 @api_router.post("/publications/{pub_id}/tag-student")
 async def tag_student_in_publication(pub_id: str, student_id: str, current_user: User = Depends(get_current_user)):
@@ -2966,6 +4889,7 @@ async def add_publication_from_scopus(scopus_data: dict, current_user: User = De
         }
         
         await db.publications.insert_one(publication_data)
+        await track_publications(current_user.id, 1)
         
         # Return the publication using the Publication model
         publication = Publication(**publication_data)
@@ -2976,20 +4900,26 @@ async def add_publication_from_scopus(scopus_data: dict, current_user: User = De
 
 # Publications Page Route
 @api_router.get("/publications/all")
-async def get_all_publications(current_user: User = Depends(get_current_user)):
+async def get_all_publications(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     """Get all publications for the lab/supervisor with comprehensive details"""
     if current_user.role == UserRole.STUDENT:
         # Students see publications they're tagged in plus their supervisor's publications
         supervisor_id = current_user.supervisor_id
-        publications = await db.publications.find({
+        publications = await page.fetch(db.publications, {
             "$or": [
                 {"student_contributors": current_user.id},
                 {"supervisor_id": supervisor_id}
             ]
-        }).sort("publication_year", -1).to_list(1000)
+        }, [("publication_year", DESCENDING)])
     else:
         # Supervisors see all their publications
-        publications = await db.publications.find({"supervisor_id": current_user.id}).sort("publication_year", -1).to_list(1000)
+        publications = await page.fetch(db.publications, {"supervisor_id": current_user.id}, [("publication_year", DESCENDING)])
+    
+    # Resolve every tagged student contributor in one query
+    users = UserBatchLoader()
+    for pub in publications:
+        users.prime(*(pub.get("student_contributors") or []))
+    await users.load()
     
     # Enhance publications with student contributor names
     enhanced_publications = []
@@ -3010,7 +4940,7 @@ async def get_all_publications(current_user: User = Depends(get_current_user)):
         if pub.get("student_contributors"):
             student_names = []
             for student_id in pub["student_contributors"]:
-                student = await db.users.find_one({"id": student_id})
+                student = users.get(student_id)
                 if student:
                     student_names.append(student["full_name"])
             pub["student_contributor_names"] = student_names
@@ -3020,7 +4950,7 @@ async def get_all_publications(current_user: User = Depends(get_current_user)):
 
 # PDF Report Generation Route
 @api_router.get("/reports/generate/{report_type}")
-async def generate_pdf_report(report_type: str, current_user: User = Depends(get_current_user)):
+async def generate_pdf_report(report_type: str, current_user: User = Depends(get_current_user_record)):
     # Mock PDF generation - would use libraries like ReportLab or WeasyPrint
     report_data = {
         "user": current_user.dict(),
@@ -3043,7 +4973,249 @@ async def generate_pdf_report(report_type: str, current_user: User = Depends(get
     return {"message": "PDF report generated", "report_data": report_data}
 
 # Dashboard Stats
-@api_router.get("/dashboard/stats")
+async def count_by_field(collection, match: dict, field: str) -> Dict[Any, int]:
+    """Count matching documents per distinct value of a field in one aggregation"""
+    groups = await collection.aggregate([
+        {"$match": match},
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}}
+    ]).to_list(None)
+    return {group["_id"]: group["count"] for group in groups}
+
+async def active_grants_summary(lab_member_ids: List[str], include_grants: bool) -> dict:
+    """Count and total the remaining balance of a lab's active grants server-side"""
+    facets = {
+        "summary": [{"$group": {
+            "_id": None,
+            "count": {"$sum": 1},
+            "balance": {"$sum": {"$subtract": [
+                {"$ifNull": ["$total_amount", 0]},
+                {"$ifNull": ["$spent_amount", 0]}
+            ]}}
+        }}]
+    }
+    if include_grants:
+        facets["grants"] = [{"$project": {"_id": 0}}]
+    
+    result = await db.grants.aggregate([
+        {"$match": {"principal_investigator": {"$in": lab_member_ids}, "status": "active"}},
+        {"$facet": facets}
+    ]).to_list(1)
+    result = result[0] if result else {}
+    summary = result.get("summary") or [{"count": 0, "balance": 0}]
+    return {
+        "count": summary[0]["count"],
+        "balance": summary[0]["balance"],
+        "grants": result.get("grants", [])
+    }
+
+# Dashboard Counters
+DASHBOARD_RECONCILE_SECONDS = int(os.environ.get('DASHBOARD_RECONCILE_SECONDS', '600'))
+# How long a measured drift must persist before it is corrected; longer than any write-to-bump gap
+DASHBOARD_RECONCILE_SETTLE_SECONDS = float(os.environ.get('DASHBOARD_RECONCILE_SETTLE_SECONDS', '5'))
+
+def counter_field(value) -> str:
+    """Counter bucket for a status value (enums by value, missing as 'none')"""
+    value = getattr(value, "value", value)
+    return str(value) if value else "none"
+
+def counter_buckets(counts: Dict[Any, int]) -> Dict[str, int]:
+    buckets = {}
+    for value, count in counts.items():
+        field = counter_field(value)
+        buckets[field] = buckets.get(field, 0) + count
+    return buckets
+
+async def compute_user_counters(user_id: str) -> dict:
+    """Task and research-log counters for a single user, computed from source"""
+    tasks_assigned, tasks_created, research_logs = await asyncio.gather(
+        count_by_field(db.tasks, {"assigned_to": user_id}, "status"),
+        count_by_field(db.tasks, {"assigned_by": user_id}, "status"),
+        count_by_field(db.research_logs, {"user_id": user_id}, "review_status")
+    )
+    return {
+        "key": f"user:{user_id}",
+        "tasks_assigned": counter_buckets(tasks_assigned),
+        "tasks_created": counter_buckets(tasks_created),
+        "research_logs": counter_buckets(research_logs)
+    }
+
+async def compute_lab_counters(supervisor_id: str) -> dict:
+    """Active grant and publication counters for a lab, computed from source"""
+    lab_member_ids = await get_lab_member_ids(supervisor_id)
+    grants, publications = await asyncio.gather(
+        active_grants_summary(lab_member_ids, include_grants=False),
+        db.publications.count_documents({"supervisor_id": supervisor_id})
+    )
+    return {
+        "key": f"lab:{supervisor_id}",
+        "active_grants_count": grants["count"],
+        "active_grants_balance": grants["balance"],
+        "publications": publications
+    }
+
+async def compute_counters(key: str) -> dict:
+    kind, owner_id = key.split(":", 1)
+    if kind == "user":
+        return await compute_user_counters(owner_id)
+    return await compute_lab_counters(owner_id)
+
+async def materialize_counters(key: str) -> dict:
+    """Build a counter document that does not exist yet; an existing one is left to the reconciler"""
+    counters = await compute_counters(key)
+    try:
+        await db.dashboard_counters.insert_one({**counters, "reconciled_at": datetime.utcnow()})
+    except DuplicateKeyError:
+        pass  # Materialized concurrently by another request
+    return counters
+
+async def load_dashboard_counters(*keys: str) -> Dict[str, dict]:
+    """Point-read counter documents, materializing any that do not exist yet"""
+    documents = await db.dashboard_counters.find({"key": {"$in": list(keys)}}, {"_id": 0}).to_list(len(keys))
+    counters = {document["key"]: document for document in documents}
+    for key in keys:
+        if key not in counters:
+            counters[key] = await materialize_counters(key)
+    return counters
+
+async def bump_counters(key: str, changes: Dict[str, float]):
+    """Atomically apply counter deltas; keys not materialized yet are built lazily on read"""
+    changes = {field: delta for field, delta in changes.items() if delta}
+    if changes:
+        await db.dashboard_counters.update_one({"key": key}, {"$inc": changes})
+
+def status_changes(prefix: str, previous, current, created: bool = False) -> Dict[str, int]:
+    changes = {f"{prefix}.{counter_field(current)}": 1}
+    if not created:
+        previous_field = f"{prefix}.{counter_field(previous)}"
+        changes[previous_field] = changes.get(previous_field, 0) - 1
+    return changes
+
+async def track_task(task: dict, previous_status=None, created: bool = False):
+    await asyncio.gather(
+        bump_counters(f"user:{task['assigned_to']}", status_changes("tasks_assigned", previous_status, task["status"], created)),
+        bump_counters(f"user:{task['assigned_by']}", status_changes("tasks_created", previous_status, task["status"], created))
+    )
+
+async def track_research_log(log: dict, previous_review_status=None, created: bool = False):
+    await bump_counters(
+        f"user:{log['user_id']}",
+        status_changes("research_logs", previous_review_status, log.get("review_status"), created)
+    )
+
+def grant_contribution(grant: Optional[dict]) -> Dict[str, float]:
+    if not grant or counter_field(grant.get("status")) != "active":
+        return {"active_grants_count": 0, "active_grants_balance": 0}
+    return {
+        "active_grants_count": 1,
+        "active_grants_balance": (grant.get("total_amount") or 0) - (grant.get("spent_amount") or 0)
+    }
+
+async def track_grant(before: Optional[dict], after: Optional[dict]):
+    """Apply a grant create/update/delete to the labs that can see it"""
+    previous, current = grant_contribution(before), grant_contribution(after)
+    changes = {field: current[field] - previous[field] for field in current}
+    if not any(changes.values()):
+        return
+    
+    # A grant is visible to its PI's own lab and to the lab the PI belongs to
+    principal_investigator = (after or before)["principal_investigator"]
+    lab_ids = {principal_investigator}
+    pi_user = await db.users.find_one({"id": principal_investigator}, {"_id": 0, "supervisor_id": 1})
+    if pi_user and pi_user.get("supervisor_id"):
+        lab_ids.add(pi_user["supervisor_id"])
+    
+    await asyncio.gather(*[bump_counters(f"lab:{lab_id}", changes) for lab_id in lab_ids])
+
+async def track_lab_move(user_id: str, previous_supervisor_id: Optional[str], supervisor_id: Optional[str]):
+    """Move a member's active grants between lab counters when they join or leave a lab"""
+    if previous_supervisor_id == supervisor_id:
+        return
+    grants = await db.grants.find(
+        {"principal_investigator": user_id, "status": "active"},
+        {"_id": 0, "status": 1, "total_amount": 1, "spent_amount": 1}
+    ).to_list(None)
+    changes = {"active_grants_count": 0, "active_grants_balance": 0}
+    for grant in grants:
+        for field, value in grant_contribution(grant).items():
+            changes[field] += value
+    if not changes["active_grants_count"]:
+        return
+    
+    bumps = []
+    if previous_supervisor_id:
+        bumps.append(bump_counters(f"lab:{previous_supervisor_id}", {field: -value for field, value in changes.items()}))
+    if supervisor_id:
+        bumps.append(bump_counters(f"lab:{supervisor_id}", changes))
+    await asyncio.gather(*bumps)
+
+async def track_publications(supervisor_id: str, delta: int):
+    await bump_counters(f"lab:{supervisor_id}", {"publications": delta})
+
+def counter_values(counters: dict) -> Dict[str, float]:
+    """Counter document flattened to dotted field -> value"""
+    values = {}
+    for field, value in counters.items():
+        if field in ("key", "reconciled_at"):
+            continue
+        if isinstance(value, dict):
+            values.update((f"{field}.{bucket}", count) for bucket, count in value.items())
+        else:
+            values[field] = value
+    return values
+
+def counter_drift(stored: dict, counters: dict) -> Dict[str, float]:
+    """The $inc that brings stored counters to the computed ones"""
+    stored_values, values = counter_values(stored), counter_values(counters)
+    drift = {}
+    for field in stored_values.keys() | values.keys():
+        delta = round((values.get(field) or 0) - (stored_values.get(field) or 0), 6)
+        if delta:
+            drift[field] = delta
+    return drift
+
+async def measure_counter_drift(key: str) -> Dict[str, float]:
+    stored = await db.dashboard_counters.find_one({"key": key}, {"_id": 0})
+    return counter_drift(stored, await compute_counters(key)) if stored else {}
+
+async def reconcile_dashboard_counters() -> int:
+    """Recompute every materialized counter document and return how many had drifted.
+
+    Corrections are applied as $inc, so bumps landing during the pass are kept.
+    A write the recompute already sees but whose bump is still in flight looks
+    like drift too, so a document is only corrected when the same drift is
+    measured again after DASHBOARD_RECONCILE_SETTLE_SECONDS. Only a bump that
+    is still in flight after the settle can be counted twice, until the next pass.
+    """
+    suspects = {}
+    async for stored in db.dashboard_counters.find({}, {"_id": 0}):
+        drift = counter_drift(stored, await compute_counters(stored["key"]))
+        if drift:
+            suspects[stored["key"]] = drift
+    if not suspects:
+        return 0
+    
+    await asyncio.sleep(DASHBOARD_RECONCILE_SETTLE_SECONDS)
+    drifted = 0
+    for key, drift in suspects.items():
+        if await measure_counter_drift(key) != drift:
+            continue  # Still settling; rechecked on the next pass
+        await db.dashboard_counters.update_one(
+            {"key": key}, {"$inc": drift, "$set": {"reconciled_at": datetime.utcnow()}}
+        )
+        drifted += 1
+    return drifted
+
+async def dashboard_counter_reconciler():
+    while True:
+        await asyncio.sleep(DASHBOARD_RECONCILE_SECONDS)
+        try:
+            drifted = await reconcile_dashboard_counters()
+            if drifted:
+                print(f"Dashboard counters: corrected drift in {drifted} documents")
+        except Exception as e:
+            print(f"Dashboard counter reconcile failed: {str(e)}")
+
+@api_router.get("/dashboard/stats", dependencies=[Depends(TrackedRead("dashboard_counters", "grants", "users"))])
 async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
     # Get supervisor ID for lab-wide stats synchronization
     if current_user.role == UserRole.STUDENT:
@@ -3054,64 +5226,50 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
     else:
         supervisor_id = current_user.id
     
-    # Get active grants for the lab (same visibility as grants endpoint)
-    lab_member_ids = await get_lab_member_ids(supervisor_id)
-    active_grants = await db.grants.find({
-        "principal_investigator": {"$in": lab_member_ids},
-        "status": "active"
-    }).to_list(1000)
-    
-    # Calculate cumulative active grants balance and clean grants data
-    total_active_grants_balance = 0
-    for grant in active_grants:
-        total_active_grants_balance += grant.get("total_amount", 0) - grant.get("spent_amount", 0)
-        # Remove MongoDB ObjectId to prevent serialization issues
-        grant.pop("_id", None)
+    user_key, lab_key = f"user:{current_user.id}", f"lab:{supervisor_id}"
     
     if current_user.role == UserRole.STUDENT:
-        total_tasks = await db.tasks.count_documents({"assigned_to": current_user.id})
-        completed_tasks = await db.tasks.count_documents({"assigned_to": current_user.id, "status": "completed"})
-        pending_tasks = await db.tasks.count_documents({"assigned_to": current_user.id, "status": "pending"})
-        in_progress_tasks = await db.tasks.count_documents({"assigned_to": current_user.id, "status": "in_progress"})
-        total_logs = await db.research_logs.count_documents({"user_id": current_user.id})
+        counters = await load_dashboard_counters(user_key, lab_key)
+        task_counts = counters[user_key]["tasks_assigned"]
+        review_counts = counters[user_key]["research_logs"]
         
-        # Get student's research log status summary
-        student_logs = await db.research_logs.find({"user_id": current_user.id}).to_list(1000)
-        approved_logs = sum(1 for log in student_logs if log.get("review_status") == "accepted")
-        pending_logs = sum(1 for log in student_logs if log.get("review_status") in [None, "pending"])
-        revision_logs = sum(1 for log in student_logs if log.get("review_status") == "revision")
+        total_tasks = sum(task_counts.values())
+        completed_tasks = task_counts.get("completed", 0)
         
         return {
             "total_tasks": total_tasks,
             "completed_tasks": completed_tasks,
-            "pending_tasks": pending_tasks,
-            "in_progress_tasks": in_progress_tasks,
+            "pending_tasks": task_counts.get("pending", 0),
+            "in_progress_tasks": task_counts.get("in_progress", 0),
             "completion_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0,
-            "total_research_logs": total_logs,
-            "approved_research_logs": approved_logs,
-            "pending_research_logs": pending_logs,
-            "revision_research_logs": revision_logs,
-            "active_grants_count": len(active_grants),
-            "active_grants_balance": total_active_grants_balance
+            "total_research_logs": sum(review_counts.values()),
+            "approved_research_logs": review_counts.get("accepted", 0),
+            "pending_research_logs": review_counts.get("none", 0) + review_counts.get("pending", 0),
+            "revision_research_logs": review_counts.get("revision", 0),
+            "active_grants_count": counters[lab_key]["active_grants_count"],
+            "active_grants_balance": counters[lab_key]["active_grants_balance"]
         }
     else:
-        students = await db.users.find({"supervisor_id": current_user.id}).to_list(1000)
-        student_ids = [student["id"] for student in students]
+        # Supervisors also get the active grants list, so its summary comes with it
+        lab_member_ids = await get_lab_member_ids(supervisor_id)
+        counters, grants = await asyncio.gather(
+            load_dashboard_counters(user_key, lab_key),
+            active_grants_summary(lab_member_ids, include_grants=True)
+        )
+        task_counts = counters[user_key]["tasks_created"]
         
-        total_students = len(students)
-        total_assigned_tasks = await db.tasks.count_documents({"assigned_by": current_user.id})
-        completed_tasks = await db.tasks.count_documents({"assigned_by": current_user.id, "status": "completed"})
-        total_publications = await db.publications.count_documents({"supervisor_id": current_user.id})
+        total_assigned_tasks = sum(task_counts.values())
+        completed_tasks = task_counts.get("completed", 0)
         
         return {
-            "total_students": total_students,
+            "total_students": len(lab_member_ids) - 1,
             "total_assigned_tasks": total_assigned_tasks,
             "completed_tasks": completed_tasks,
             "completion_rate": (completed_tasks / total_assigned_tasks * 100) if total_assigned_tasks > 0 else 0,
-            "total_publications": total_publications,
-            "active_grants_count": len(active_grants),
-            "active_grants_balance": total_active_grants_balance,
-            "active_grants": active_grants
+            "total_publications": counters[lab_key]["publications"],
+            "active_grants_count": grants["count"],
+            "active_grants_balance": grants["balance"],
+            "active_grants": grants["grants"]
         }
 
 # Message Routes
@@ -3127,75 +5285,22 @@ async def send_message(message_data: MessageCreate, current_user: User = Depends
     return message
 
 @api_router.get("/messages")
-async def get_messages(with_user: str, current_user: User = Depends(get_current_user)):
-    messages = await db.messages.find({
+async def get_messages(with_user: str, page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
+    messages = await page.fetch(db.messages, {
         "$or": [
             {"sender_id": current_user.id, "receiver_id": with_user},
             {"sender_id": with_user, "receiver_id": current_user.id}
         ]
-    }).sort("timestamp", 1).to_list(1000)
+    }, [("timestamp", ASCENDING)])
     
     return [Message(**msg) for msg in messages]
 
-# Lab Settings Routes
-@api_router.get("/lab/settings")
-async def get_lab_settings(current_user: User = Depends(get_current_user)):
-    """Get lab settings for current user's lab"""
-    supervisor_id = await get_lab_supervisor_id(current_user)
-    
-    # Get or create lab settings
-    settings = await db.lab_settings.find_one({"supervisor_id": supervisor_id})
-    
-    if not settings:
-        # Create default lab settings
-        default_settings = LabSettings(supervisor_id=supervisor_id)
-        await db.lab_settings.insert_one(default_settings.dict())
-        return default_settings
-    
-    return LabSettings(**settings)
+# Citation Routes with Google Scholar Integration
+CITATION_METRICS = ("total_citations", "h_index", "i10_index")
 
-@api_router.put("/lab/settings")
-async def update_lab_settings(
-    settings_update: LabSettingsUpdate, 
-    current_user: User = Depends(get_current_user)
-):
-    """Update lab settings (Supervisor/Admin only)"""
-    # Only supervisors can update lab settings
-    if current_user.role not in [UserRole.SUPERVISOR, UserRole.LAB_MANAGER, UserRole.ADMIN]:
-        raise HTTPException(status_code=403, detail="Only supervisors can update lab settings")
-    
-    supervisor_id = await get_lab_supervisor_id(current_user)
-    
-    # Prepare update data
-    update_data = {k: v for k, v in settings_update.dict().items() if v is not None}
-    update_data["updated_at"] = datetime.utcnow()
-    
-    # Update lab settings
-    result = await db.lab_settings.update_one(
-        {"supervisor_id": supervisor_id},
-        {"$set": update_data},
-        upsert=True
-    )
-    
-    # Get updated settings
-    updated_settings = await db.lab_settings.find_one({"supervisor_id": supervisor_id})
-    lab_settings = LabSettings(**updated_settings)
-    
-    # Broadcast lab.updated event for real-time updates
-    await emit_event(
-        EventType.USER_UPDATED,  # We'll use USER_UPDATED for lab settings
-        {
-            "action": "lab_settings_updated",
-            "lab_settings": lab_settings.dict(),
-            "lab_name": lab_settings.lab_name,
-            "footer_attribution": lab_settings.footer_attribution
-        },
-        supervisor_id=supervisor_id
-    )
-    
-    return {"message": "Lab settings updated successfully", "settings": lab_settings}
+def citation_metrics_changed(cached: Optional[dict], citation_data: dict) -> bool:
+    return not cached or any(cached.get(metric) != citation_data[metric] for metric in CITATION_METRICS)
 
-# Citation Routes with Google Scholar Integration
 @api_router.get("/citations")
 async def get_citations(current_user: User = Depends(get_current_user)):
     """Get citation metrics data with automatic updates (metrics only)"""
@@ -3220,7 +5325,6 @@ async def get_citations(current_user: User = Depends(get_current_user)):
             scholar_data = await fetch_google_scholar_citations(default_scholar_id)
             
             citation_data = {
-                "id": str(uuid.uuid4()),
                 "scholar_id": default_scholar_id,
                 "total_citations": scholar_data.get("total_citations", 0),
                 "h_index": scholar_data.get("h_index", 0),
@@ -3232,21 +5336,22 @@ async def get_citations(current_user: User = Depends(get_current_user)):
             # Upsert citation data
             await db.citations.update_one(
                 {"supervisor_id": supervisor_id},
-                {"$set": citation_data},
+                {"$set": citation_data, "$setOnInsert": {"id": str(uuid.uuid4())}},
                 upsert=True
             )
             
-            # Emit real-time event for citation updates
-            await emit_event(
-                EventType.PUBLICATION_UPDATED,
-                {
-                    "action": "citations_updated",
-                    "total_citations": citation_data["total_citations"],
-                    "h_index": citation_data["h_index"],
-                    "i10_index": citation_data["i10_index"]
-                },
-                supervisor_id=supervisor_id
-            )
+            # Emit real-time event for citation updates, only when the metrics moved
+            if citation_metrics_changed(cached_citations, citation_data):
+                await emit_event(
+                    EventType.PUBLICATION_UPDATED,
+                    {
+                        "action": "citations_updated",
+                        "total_citations": citation_data["total_citations"],
+                        "h_index": citation_data["h_index"],
+                        "i10_index": citation_data["i10_index"]
+                    },
+                    supervisor_id=supervisor_id
+                )
             
             print(f"Updated citations: {citation_data['total_citations']} total, h-index: {citation_data['h_index']}")
             
@@ -3295,10 +5400,10 @@ async def refresh_citations(current_user: User = Depends(get_current_user)):
     supervisor_id = await get_lab_supervisor_id(current_user)
     
     try:
+        cached_citations = await db.citations.find_one({"supervisor_id": supervisor_id})
         scholar_data = await fetch_google_scholar_citations(default_scholar_id)
         
         citation_data = {
-            "id": str(uuid.uuid4()),
             "scholar_id": default_scholar_id,
             "total_citations": scholar_data.get("total_citations", 0),
             "h_index": scholar_data.get("h_index", 0),
@@ -3309,21 +5414,22 @@ async def refresh_citations(current_user: User = Depends(get_current_user)):
         
         await db.citations.update_one(
             {"supervisor_id": supervisor_id},
-            {"$set": citation_data},
+            {"$set": citation_data, "$setOnInsert": {"id": str(uuid.uuid4())}},
             upsert=True
         )
         
         # Emit real-time event
-        await emit_event(
-            EventType.PUBLICATION_UPDATED,
-            {
-                "action": "citations_refreshed",
-                "total_citations": citation_data["total_citations"],
-                "h_index": citation_data["h_index"],
-                "i10_index": citation_data["i10_index"]
-            },
-            supervisor_id=supervisor_id
-        )
+        if citation_metrics_changed(cached_citations, citation_data):
+            await emit_event(
+                EventType.PUBLICATION_UPDATED,
+                {
+                    "action": "citations_refreshed",
+                    "total_citations": citation_data["total_citations"],
+                    "h_index": citation_data["h_index"],
+                    "i10_index": citation_data["i10_index"]
+                },
+                supervisor_id=supervisor_id
+            )
         
         # Return simplified metrics-only response
         return {
@@ -3340,32 +5446,52 @@ async def refresh_citations(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=f"Failed to refresh citations: {str(e)}")
 
 # Students Routes
+# Fields returned by the user management lists, with their defaults
+STUDENT_LIST_FIELDS = {
+    "id": None,
+    "full_name": None,
+    "email": None,
+    "department": None,
+    "research_area": None,
+    "profile_picture": None,
+    "student_id": None,
+    "program_type": None,
+    "study_status": "active",
+    "role": "student",
+    "created_at": None,
+    "last_login": None,
+    "is_active": True
+}
+
+PENDING_REGISTRATION_FIELDS = {
+    "id": None,
+    "full_name": None,
+    "email": None,
+    "role": None,
+    "student_id": None,
+    "department": None,
+    "program_type": None,
+    "research_area": None,
+    "created_at": None
+}
+
 @api_router.get("/students")
-async def get_students(current_user: User = Depends(get_current_user)):
+async def get_students(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     """Get all students for user management - enhanced with comprehensive data"""
     if current_user.role not in [UserRole.SUPERVISOR, UserRole.LAB_MANAGER, UserRole.ADMIN]:
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    # Only the listed fields are read, so password hashes never leave the database
+    projection = page.select(STUDENT_LIST_FIELDS)
+    
     # Get all users regardless of supervisor for admin/lab manager, or just assigned students for supervisors
     if current_user.role in [UserRole.LAB_MANAGER, UserRole.ADMIN]:
-        students = await db.users.find({"role": {"$in": ["student", "lab_manager"]}}).to_list(1000)
+        students = await page.fetch(db.users, {"role": {"$in": ["student", "lab_manager"]}}, [("created_at", ASCENDING)], projection)
     else:
-        students = await db.users.find({"supervisor_id": current_user.id}).to_list(1000)
+        students = await page.fetch(db.users, {"supervisor_id": current_user.id}, [("created_at", ASCENDING)], projection)
     
     return [{
-        "id": student["id"],
-        "full_name": student["full_name"],
-        "email": student["email"],
-        "department": student.get("department"),
-        "research_area": student.get("research_area"),
-        "profile_picture": student.get("profile_picture"),
-        "student_id": student.get("student_id"),
-        "program_type": student.get("program_type"),
-        "study_status": student.get("study_status", "active"),
-        "role": student.get("role", "student"),
-        "created_at": student.get("created_at"),
-        "last_login": student.get("last_login"),
-        "is_active": student.get("is_active", True)
+        name: student.get(name, default) for name, default in STUDENT_LIST_FIELDS.items() if name in page.selected
     } for student in students]
 
 @api_router.put("/users/{user_id}/edit")
@@ -3393,6 +5519,7 @@ async def edit_user_profile(user_id: str, user_data: dict, current_user: User =
     update_data["updated_at"] = datetime.utcnow()
     
     await db.users.update_one({"id": user_id}, {"$set": update_data})
+    principal_cache.invalidate(user_id)
     return {"message": "User profile updated successfully"}
 
 @api_router.post("/users/{user_id}/freeze")
@@ -3409,6 +5536,7 @@ async def freeze_user_access(user_id: str, current_user: User = Depends(get_curr
         {"id": user_id}, 
         {"$set": {"is_active": False, "study_status": "suspended", "updated_at": datetime.utcnow()}}
     )
+    await bump_token_version(user_id)
     return {"message": "User access frozen successfully"}
 
 @api_router.post("/users/{user_id}/unfreeze")
@@ -3421,6 +5549,7 @@ async def unfreeze_user_access(user_id: str, current_user: User = Depends(get_cu
         {"id": user_id}, 
         {"$set": {"is_active": True, "study_status": "active", "updated_at": datetime.utcnow()}}
     )
+    principal_cache.invalidate(user_id)
     return {"message": "User access restored successfully"}
 
 @api_router.delete("/users/{user_id}")
@@ -3439,31 +5568,30 @@ async def delete_user_profile(user_id: str, current_user: User = Depends(get_cur
     
     # Delete all user-related data
     await db.users.delete_one({"id": user_id})
+    await revoke_all_tokens(user_id)
+    lab_rosters.invalidate(user_to_delete.get("supervisor_id"), user_id)
+    await track_lab_move(user_id, user_to_delete.get("supervisor_id"), None)
     await db.research_logs.delete_many({"user_id": user_id})
     await db.reminders.delete_many({"user_id": user_id})
     await db.meetings.delete_many({"$or": [{"supervisor_id": user_id}, {"student_id": user_id}]})
+    # Drop the user's own counters; they are rebuilt on the next dashboard read
+    await db.dashboard_counters.delete_many({"key": {"$in": [f"user:{user_id}", f"lab:{user_id}"]}})
     
     return {"message": "User profile and all associated data deleted successfully"}
 
 @api_router.get("/pending-registrations")
-async def get_pending_registrations(current_user: User = Depends(get_current_user)):
+async def get_pending_registrations(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     """Get pending user registrations awaiting supervisor approval"""
     if current_user.role not in [UserRole.SUPERVISOR, UserRole.LAB_MANAGER, UserRole.ADMIN]:
         raise HTTPException(status_code=403, detail="Not authorized to view pending registrations")
     
     # Get users who are not approved yet
-    pending_users = await db.users.find({"is_approved": False}).to_list(1000)
+    pending_users = await page.fetch(
+        db.users, {"is_approved": False}, [("created_at", ASCENDING)], page.select(PENDING_REGISTRATION_FIELDS)
+    )
     
     return [{
-        "id": user["id"],
-        "full_name": user["full_name"],
-        "email": user["email"],
-        "role": user["role"],
-        "student_id": user.get("student_id"),
-        "department": user.get("department"),
-        "program_type": user.get("program_type"),
-        "research_area": user.get("research_area"),
-        "created_at": user.get("created_at")
+        name: user.get(name, default) for name, default in PENDING_REGISTRATION_FIELDS.items() if name in page.selected
     } for user in pending_users]
 
 @api_router.post("/users/{user_id}/approve")
@@ -3489,6 +5617,8 @@ async def approve_user_registration(user_id: str, current_user: User = Depends(g
             "updated_at": datetime.utcnow()
         }}
     )
+    lab_rosters.invalidate(user_to_approve.get("supervisor_id"))
+    principal_cache.invalidate(user_id)
     
     return {"message": "User registration approved successfully"}
 
@@ -3507,6 +5637,9 @@ async def reject_user_registration(user_id: str, rejection_reason: str = None, c
     
     # Delete the rejected user
     await db.users.delete_one({"id": user_id})
+    await revoke_all_tokens(user_id)
+    lab_rosters.invalidate(user_to_reject.get("supervisor_id"))
+    await track_lab_move(user_id, user_to_reject.get("supervisor_id"), None)
     
     return {"message": "User registration rejected and account deleted successfully"}
 
@@ -3534,34 +5667,30 @@ async def create_todo(todo_data: TodoCreate, current_user: User = Depends(get_cu
     
     return todo
 
-@api_router.get("/todos", response_model=List[Todo])
-async def get_todos(current_user: User = Depends(get_current_user)):
+@api_router.get("/todos", response_model=List[Todo], dependencies=[Depends(TrackedRead("todos"))])
+async def get_todos(page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
     """Get user's to-do items"""
-    todos = await db.todos.find({"user_id": current_user.id}).sort("order_index", 1).to_list(1000)
-    return [Todo(**todo) for todo in todos]
+    todos = await page.fetch(db.todos, {"user_id": current_user.id}, [("order_index", ASCENDING)], page.select(Todo.model_fields))
+    return page.respond(Todo, todos)
 
 @api_router.put("/todos/{todo_id}", response_model=Todo)
 async def update_todo(todo_id: str, todo_update: TodoUpdate, current_user: User = Depends(get_current_user)):
     """Update a to-do item"""
-    # Verify ownership
-    existing_todo = await db.todos.find_one({"id": todo_id, "user_id": current_user.id})
-    if not existing_todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
-    
     # Prepare update data
     update_data = {k: v for k, v in todo_update.dict().items() if v is not None}
     update_data["updated_at"] = datetime.utcnow()
+    stage = literal_fields(update_data)
     
-    # Handle completion
-    if "is_completed" in update_data and update_data["is_completed"] and not existing_todo.get("is_completed"):
-        update_data["completed_at"] = datetime.utcnow()
+    # Handle completion: keep the original completion time if it was already done
+    if "is_completed" in update_data and update_data["is_completed"]:
+        stage["completed_at"] = {"$cond": [{"$ifNull": ["$is_completed", False]}, "$completed_at", update_data["updated_at"]]}
     elif "is_completed" in update_data and not update_data["is_completed"]:
-        update_data["completed_at"] = None
+        stage["completed_at"] = None
     
-    await db.todos.update_one({"id": todo_id}, {"$set": update_data})
-    
-    # Get updated todo
-    updated_todo = await db.todos.find_one({"id": todo_id})
+    # Ownership is part of the filter
+    updated_todo = await update_and_fetch(db.todos, {"id": todo_id, "user_id": current_user.id}, [{"$set": stage}])
+    if not updated_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
     
     # Emit real-time event
     supervisor_id = await get_lab_supervisor_id(current_user)
@@ -3576,25 +5705,15 @@ async def update_todo(todo_id: str, todo_update: TodoUpdate, current_user: User
 @api_router.put("/todos/{todo_id}/complete")
 async def complete_todo(todo_id: str, current_user: User = Depends(get_current_user)):
     """Toggle completion status of a to-do item"""
-    existing_todo = await db.todos.find_one({"id": todo_id, "user_id": current_user.id})
-    if not existing_todo:
+    # Toggled server-side so two quick clicks cannot both read the old state
+    now = datetime.utcnow()
+    updated_todo = await update_and_fetch(db.todos, {"id": todo_id, "user_id": current_user.id}, [
+        {"$set": {"is_completed": {"$not": [{"$ifNull": ["$is_completed", False]}]}, "updated_at": now}},
+        {"$set": {"completed_at": {"$cond": ["$is_completed", now, None]}}}
+    ])
+    if not updated_todo:
         raise HTTPException(status_code=404, detail="Todo not found")
-    
-    is_completed = not existing_todo.get("is_completed", False)
-    update_data = {
-        "is_completed": is_completed,
-        "updated_at": datetime.utcnow()
-    }
-    
-    if is_completed:
-        update_data["completed_at"] = datetime.utcnow()
-    else:
-        update_data["completed_at"] = None
-    
-    await db.todos.update_one({"id": todo_id}, {"$set": update_data})
-    
-    # Get updated todo
-    updated_todo = await db.todos.find_one({"id": todo_id})
+    is_completed = updated_todo["is_completed"]
     
     # Emit real-time event
     supervisor_id = await get_lab_supervisor_id(current_user)
@@ -3627,19 +5746,14 @@ async def delete_todo(todo_id: str, current_user: User = Depends(get_current_use
 @api_router.put("/todos/{todo_id}/reorder")
 async def reorder_todo(todo_id: str, new_index: int, current_user: User = Depends(get_current_user)):
     """Reorder a to-do item"""
-    # Verify ownership
-    existing_todo = await db.todos.find_one({"id": todo_id, "user_id": current_user.id})
-    if not existing_todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
-    
-    # Update order index
-    await db.todos.update_one(
-        {"id": todo_id}, 
+    # Update order index; ownership is part of the filter
+    updated_todo = await update_and_fetch(
+        db.todos,
+        {"id": todo_id, "user_id": current_user.id},
         {"$set": {"order_index": new_index, "updated_at": datetime.utcnow()}}
     )
-    
-    # Get updated todo
-    updated_todo = await db.todos.find_one({"id": todo_id})
+    if not updated_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
     
     return Todo(**updated_todo)
 
@@ -3655,6 +5769,22 @@ async def health_check():
 async def api_health_check():
     return {"status": "healthy", "message": "API endpoints are accessible"}
 
+@app.get("/api/health/cache")
+async def cache_stats():
+    """Counters for the in-process caches and worker pools"""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "password_pool": password_pool.stats(),
+        "lab_rosters": lab_rosters.stats(),
+        "lab_settings": lab_settings_cache.stats(),
+        "websockets": manager.stats(),
+        "emitted_events": emitted_events,
+        "outbox": outbox.stats(),
+        "collection_versions": dict(collection_versions.versions),
+        "event_coalescing": event_coalescer.stats() if event_coalescer else None,
+        "user_loader": user_loader_stats
+    }
+
 # CORS middleware should be configured earlier, but since it's here, ensure it's properly configured
 app.add_middleware(
     CORSMiddleware,
@@ -3662,6 +5792,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"] + ([DB_QUERY_COUNT_HEADER] if DB_QUERY_COUNT_HEADER_ENABLED else []),
 )
 
 # Configure logging
@@ -3671,6 +5802,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_db_client():
+    # The capped event log must exist before ensure_indexes() touches it
+    await event_log.start()
+    await ensure_indexes()
+    await token_revocations.load()
+    await manager.start()
+    collection_versions.loop = asyncio.get_running_loop()
+    app.state.dashboard_reconciler = asyncio.create_task(dashboard_counter_reconciler())
+    app.state.token_revocation_refresher = asyncio.create_task(token_revocation_refresher())
+    app.state.outbox_dispatcher = asyncio.create_task(outbox.run())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    app.state.dashboard_reconciler.cancel()
+    app.state.token_revocation_refresher.cancel()
+    # Undelivered outbox entries stay pending for the next start
+    app.state.outbox_dispatcher.cancel()
+    if event_coalescer:
+        await event_coalescer.flush_all()
+    await manager.broker.close()
+    client.close()
+    password_pool.shutdown()
\ No newline at end of file
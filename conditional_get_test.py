@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+# Exercise collection versions and 304 handling in-process, without MongoDB
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import server
+from server import ConditionalRequest, TrackedRead, User, collection_versions, get_current_user
+
+# Keep the report to the checks, not one log line per request
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+def principal(user_id: str) -> User:
+    return User(id=user_id, email=f"{user_id}@test.com", full_name=user_id, role="student", password_hash="")
+
+def finish_write(command_name: str, collection: str, request_id: int, reply: dict = None):
+    """Replay the driver's started/succeeded events for one write command"""
+    event = SimpleNamespace(command_name=command_name, command={command_name: collection},
+                            connection_id=("localhost", 27017), request_id=request_id,
+                            reply=reply or {"n": 1, "nModified": 1, "ok": 1.0})
+    collection_versions.started(event)
+    collection_versions.succeeded(event)
+
+class ConditionalGetTester:
+    def __init__(self):
+        self.calls = 0
+        self.sync_reply = None
+        self.user = principal("student-1")
+        self.client = TestClient(self.build_app())
+        self.failures = 0
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI()
+        app.dependency_overrides[get_current_user] = lambda: self.user
+
+        @app.get("/todos", dependencies=[Depends(TrackedRead("todos"))])
+        async def todos():
+            self.calls += 1
+            return [{"id": "todo-1"}]
+
+        @app.get("/publications")
+        async def publications(conditional: ConditionalRequest = Depends(TrackedRead("publications", check=False))):
+            # Stands in for the Scopus sync that runs before the check
+            finish_write("update", "publications", 900, self.sync_reply)
+            conditional.check()
+            return []
+
+        return app
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    def peer_notifications(self, *collections: str) -> list:
+        """Collection names announced to other workers for writes finished in one loop tick"""
+        sent = []
+        loop = asyncio.new_event_loop()
+        notify_peers, broker = server.notify_peers, server.manager.broker
+        server.notify_peers = lambda kind, **fields: sent.append(fields["names"])
+        broker.cross_process = True
+        collection_versions.loop = loop
+        try:
+            for request_id, collection in enumerate(collections, start=100):
+                finish_write("insert", collection, request_id)
+            loop.run_until_complete(asyncio.sleep(0))
+        finally:
+            server.notify_peers = notify_peers
+            del broker.cross_process
+            collection_versions.loop = None
+            loop.close()
+        return sent
+
+    def get(self, path: str, etag: str = None):
+        return self.client.get(path, headers={"If-None-Match": etag} if etag else {})
+
+    def run(self):
+        print("🔍 Unchanged collection...")
+        response = self.get("/todos")
+        etag = response.headers.get("etag")
+        self.check("First read is tagged", response.status_code == 200 and etag)
+        response = self.get("/todos", etag)
+        self.check("Matching If-None-Match gets 304 without running the endpoint",
+                   response.status_code == 304 and self.calls == 1 and response.headers.get("etag") == etag)
+
+        print("🔍 Writes...")
+        finish_write("insert", "grants", 1)
+        self.check("Writes to other collections keep the tag", self.get("/todos", etag).status_code == 304)
+        finish_write("update", "todos", 3, reply={"n": 1, "nModified": 0, "ok": 1.0})
+        self.check("An update that matched but changed nothing keeps the tag", self.get("/todos", etag).status_code == 304)
+        finish_write("delete", "todos", 4, reply={"n": 0, "ok": 1.0})
+        self.check("A delete that removed nothing keeps the tag", self.get("/todos", etag).status_code == 304)
+        event = SimpleNamespace(command_name="update", command={"update": "todos"}, connection_id=("localhost", 27017),
+                                request_id=2, reply={"n": 1, "nModified": 1, "ok": 1.0})
+        collection_versions.started(event)
+        self.check("An unfinished write does not change the tag yet", self.get("/todos", etag).status_code == 304)
+        collection_versions.succeeded(event)
+        response = self.get("/todos", etag)
+        self.check("A finished write changes the tag", response.status_code == 200 and response.headers.get("etag") != etag)
+
+        print("🔍 Scope...")
+        etag = response.headers.get("etag")
+        self.user = principal("student-2")
+        self.check("Another user never matches", self.get("/todos", etag).status_code == 200)
+        self.check("Another query string never matches", self.get("/todos?limit=5", etag).status_code == 200)
+
+        print("🔍 Check after a sync...")
+        etag = self.get("/publications").headers.get("etag")
+        self.check("A sync that wrote is not answered with 304", self.get("/publications", etag).status_code == 200)
+        self.sync_reply = {"n": 1, "nModified": 0, "ok": 1.0}
+        etag = self.get("/publications").headers.get("etag")
+        self.check("A sync that changed nothing is answered with 304", self.get("/publications", etag).status_code == 304)
+
+        print("🔍 Other workers...")
+        sent = self.peer_notifications("outbox", "event_log", "todos", "grants", "todos")
+        self.check("Peers hear once per tick, and only about collections a read is tagged with", sent == [["grants", "todos"]])
+        self.check("Writes to untracked collections are not announced", self.peer_notifications("outbox", "event_sequences") == [])
+
+        if self.failures:
+            print(f"❌ {self.failures} conditional GET checks failed")
+            return 1
+        print("✅ Unchanged reads are answered with 304 before any query runs")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(ConditionalGetTester().run())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Check materialized dashboard counters in-process against in-memory collections
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import server
+from server import (compute_counters, load_dashboard_counters, reconcile_dashboard_counters, track_grant,
+                    track_publications, track_research_log, track_task)
+from fake_motor import FakeDatabase
+
+def grant(grant_id: str, status: str, total: float, spent: float) -> dict:
+    return {"id": grant_id, "principal_investigator": "student-1", "status": status,
+            "total_amount": total, "spent_amount": spent}
+
+class DashboardCountersTester:
+    def __init__(self):
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    def stored(self, key: str) -> dict:
+        return server.db.sync.dashboard_counters.find_one({"key": key}, {"_id": 0})
+
+    async def matches_source(self, key: str) -> bool:
+        return not server.counter_drift(self.stored(key), await compute_counters(key))
+
+    async def create_task(self, task_id: str, status: str = "pending") -> dict:
+        task = {"id": task_id, "assigned_to": "student-1", "assigned_by": "sup-1", "status": status}
+        server.db.sync.tasks.insert_one(dict(task))
+        await track_task(task, created=True)
+        return task
+
+    async def run(self):
+        server.db = FakeDatabase()
+        server.db.sync.dashboard_counters.create_index("key", unique=True)
+        server.db.sync.users.insert_many([
+            {"id": "sup-1", "role": "supervisor", "is_approved": True},
+            {"id": "student-1", "role": "student", "supervisor_id": "sup-1", "is_approved": True},
+        ])
+        server.db.sync.tasks.insert_one({"id": "task-0", "assigned_to": "student-1", "assigned_by": "sup-1", "status": "completed"})
+        await load_dashboard_counters("user:student-1", "user:sup-1", "lab:sup-1")
+        self.check("Counters are materialized from source on first read",
+                   self.stored("user:student-1")["tasks_assigned"] == {"completed": 1})
+
+        print("🔍 Deltas from writes...")
+        task = await self.create_task("task-1")
+        self.check("A created task lands in its status bucket on both sides",
+                   self.stored("user:student-1")["tasks_assigned"].get("pending") == 1
+                   and self.stored("user:sup-1")["tasks_created"].get("pending") == 1)
+        server.db.sync.tasks.update_one({"id": "task-1"}, {"$set": {"status": "completed"}})
+        await track_task({**task, "status": "completed"}, previous_status="pending")
+        self.check("A status update moves the task between buckets", await self.matches_source("user:student-1")
+                   and self.stored("user:student-1")["tasks_assigned"] == {"pending": 0, "completed": 2})
+
+        log = {"id": "log-1", "user_id": "student-1", "review_status": None}
+        server.db.sync.research_logs.insert_one(dict(log))
+        await track_research_log(log, created=True)
+        server.db.sync.research_logs.update_one({"id": "log-1"}, {"$set": {"review_status": "accepted"}})
+        await track_research_log({**log, "review_status": "accepted"}, previous_review_status=None)
+        self.check("A research log transition moves its review bucket", await self.matches_source("user:student-1"))
+
+        active = grant("grant-1", "active", 1000, 0)
+        server.db.sync.grants.insert_one(dict(active))
+        await track_grant(None, active)
+        spent = {**active, "spent_amount": 250}
+        server.db.sync.grants.update_one({"id": "grant-1"}, {"$set": {"spent_amount": 250}})
+        await track_grant(active, spent)
+        lab = self.stored("lab:sup-1")
+        self.check("Grant create and update adjust the lab balance",
+                   lab["active_grants_count"] == 1 and lab["active_grants_balance"] == 750)
+
+        print("🔍 Reconcile...")
+        server.DASHBOARD_RECONCILE_SETTLE_SECONDS = 0
+        self.check("A clean pass writes nothing", await reconcile_dashboard_counters() == 0)
+        server.db.sync.dashboard_counters.update_one({"key": "lab:sup-1"}, {"$set": {"publications": 7}})
+        self.check("Drift is corrected", await reconcile_dashboard_counters() == 1
+                   and self.stored("lab:sup-1")["publications"] == 0)
+
+        # A task already stored when the pass recomputes, whose bump lands during the settle
+        task = {"id": "task-2", "assigned_to": "student-1", "assigned_by": "sup-1", "status": "pending"}
+        server.db.sync.tasks.insert_one(dict(task))
+        measure, pending = server.measure_counter_drift, [task]
+        async def measure_after_bump(key: str) -> dict:
+            if pending:
+                await track_task(pending.pop(), created=True)
+            return await measure(key)
+        server.measure_counter_drift = measure_after_bump
+        try:
+            corrected = await reconcile_dashboard_counters()
+        finally:
+            server.measure_counter_drift = measure
+        self.check("An in-flight bump is not counted twice",
+                   corrected == 0 and await self.matches_source("user:student-1") and await self.matches_source("user:sup-1"))
+
+        await track_publications("sup-1", 2)
+        server.db.sync.publications.insert_many([{"id": "pub-1", "supervisor_id": "sup-1"},
+                                                 {"id": "pub-2", "supervisor_id": "sup-1"}])
+        self.check("A later pass agrees with the bumps", await reconcile_dashboard_counters() == 0)
+
+        if self.failures:
+            print(f"❌ {self.failures} dashboard counter checks failed")
+            return 1
+        print("✅ Dashboard counters follow writes and reconcile without double counting")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(DashboardCountersTester().run()))
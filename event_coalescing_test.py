@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Drive the coalescer through the backend's in-process connection manager
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from server import EncodedMessage, EventCoalescer, EventType, document_delta, lab_rosters, manager
+
+WINDOW_SECONDS = 0.05
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        message = EncodedMessage.from_text(text).message
+        if message["type"] != "session":
+            self.received.append(message)
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+class EventCoalescingTester:
+    def __init__(self):
+        self.coalescer = EventCoalescer(WINDOW_SECONDS)
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def emit_todo(self, action: str, todo_id: str, **fields):
+        await self.coalescer.emit(
+            EventType.USER_UPDATED,
+            {"action": action, "todo_id": todo_id, "user_id": "student-1", **fields},
+            supervisor_id="sup-1"
+        )
+
+    async def run(self):
+        await manager.start()
+        lab_rosters.entries["sup-1"] = (time.monotonic() + 60, {"student-1": "student"})
+        socket = FakeWebSocket()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await manager.connect(socket, "sup-1")
+
+        print("🔍 A burst of todo updates within one window...")
+        for position in range(10):
+            await self.emit_todo("todo_updated", f"todo-{position % 3}", position=position)
+        await asyncio.sleep(WINDOW_SECONDS * 3)
+
+        self.check("Ten events became two messages", len(socket.received) == 2)
+        first, batch = socket.received[0]["data"], socket.received[-1]["data"]
+        self.check("First event was sent without waiting", first["action"] == "todo_updated" and first["position"] == 0)
+        self.check("Burst was merged into one batch", batch["action"] == "batched" and batch["count"] == 3)
+        self.check("Latest update per todo wins",
+                   {event["todo_id"]: event["position"] for event in batch["events"]}
+                   == {"todo-0": 9, "todo-1": 7, "todo-2": 8})
+        self.check("Batch lists the changed ids", sorted(batch["ids"]) == ["todo-0", "todo-1", "todo-2"])
+
+        print("🔍 An isolated event after the window...")
+        socket.received.clear()
+        await self.emit_todo("todo_deleted", "todo-0")
+        await asyncio.sleep(WINDOW_SECONDS * 3)
+        self.check("Lone event is delivered as-is",
+                   len(socket.received) == 1 and socket.received[0]["data"]["action"] == "todo_deleted")
+
+        print("🔍 Consecutive document deltas in one burst...")
+        socket.received.clear()
+        versions = [{"id": "log-1", "version": version, "status": "draft", "title": "Sampling"} for version in range(4)]
+        versions[1]["status"] = "submitted"
+        versions[2].update(status="submitted", title="Sampling run")
+        versions[3].update(status="accepted", title="Sampling run")
+        for before, after in zip(versions, versions[1:]):
+            await self.coalescer.emit(
+                EventType.RESEARCH_LOG_UPDATED,
+                {"action": "updated", "research_log_delta": document_delta(before, after)},
+                user_id="sup-1"
+            )
+        await asyncio.sleep(WINDOW_SECONDS * 3)
+        delta = socket.received[-1]["data"]["research_log_delta"]
+        self.check("Deltas fold into one change set",
+                   (delta["base_version"], delta["version"]) == (1, 3)
+                   and delta["changes"] == {"status": "accepted", "title": "Sampling run"})
+
+        print("🔍 Flush on shutdown...")
+        socket.received.clear()
+        await self.emit_todo("todo_created", "todo-3")
+        await self.emit_todo("todo_created", "todo-4")
+        await self.coalescer.flush_all()
+        await asyncio.sleep(0.01)
+        self.check("Pending events are flushed", [message["data"]["action"] for message in socket.received] == ["todo_created", "todo_created"])
+
+        if self.failures:
+            print(f"❌ {self.failures} coalescing checks failed")
+            return 1
+        print("✅ Bursts of events reach clients as one batched message")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(EventCoalescingTester().run()))
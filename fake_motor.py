@@ -0,0 +1,53 @@
+"""Async stand-ins for the Motor database the backend uses, backed by mongomock.
+
+Lets the in-process tests swap ``server.db`` for throwaway in-memory collections.
+"""
+
+import mongomock
+
+class FakeCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, limit: int):
+        self.cursor = self.cursor.limit(limit)
+        return self
+
+    async def to_list(self, length):
+        documents = list(self.cursor)
+        return documents[:length] if length else documents
+
+    async def __aiter__(self):
+        for document in self.cursor:
+            yield document
+
+class FakeCollection:
+    def __init__(self, collection):
+        self.sync = collection
+
+    def find(self, *args, **kwargs):
+        return FakeCursor(self.sync.find(*args, **kwargs))
+
+    def aggregate(self, *args, **kwargs):
+        return FakeCursor(self.sync.aggregate(*args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self.sync, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+class FakeDatabase:
+    def __init__(self):
+        self.sync = mongomock.MongoClient().db
+
+    def __getattr__(self, name):
+        return FakeCollection(self.sync[name])
+
+    def __getitem__(self, name):
+        return FakeCollection(self.sync[name])
@@ -27,6 +27,35 @@ import {
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// List endpoints return one page at a time; the next page's cursor comes back in X-Next-Cursor
+const LIST_PAGE_SIZE = 500;
+
+const fetchAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await axios.get(url, {
+      params: { ...params, limit: LIST_PAGE_SIZE, ...(cursor ? { cursor } : {}) }
+    });
+    // Defensive schema handling - API returns array or object with items
+    items.push(...(Array.isArray(response.data) ? response.data : (response.data?.items ?? [])));
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return items;
+};
+
+// Realtime events the dashboard renders; others (e.g. lab members' todos) are not sent
+const WEBSOCKET_TOPICS = [
+  'research_log_updated',
+  'meeting_updated',
+  'milestone_updated',
+  'grant_updated',
+  'publication_updated',
+  'user_updated:avatar_updated',
+  'bulletin_updated',
+  'notification_created'
+];
+
 // Utility Functions
 const getStatusColor = (status) => {
   const colors = {
@@ -524,10 +553,20 @@ const Dashboard = ({ user, logout, setUser }) => {
   const handleWebSocketMessage = (data) => {
     console.log('Received real-time update:', data);
     
+    if (data.data && data.data.action === 'batched') {
+      // A coalesced burst: one refetch covers every change, but each notification is kept
+      const events = data.type === 'notification_created' ? data.data.events : data.data.events.slice(-1);
+      if (data.type === 'research_log_updated') {
+        // Log deltas are per log, so patch every log in the burst and announce only the last
+        data.data.events.slice(0, -1).forEach(syncResearchLog);
+      }
+      events.forEach(event => handleWebSocketMessage({ ...data, data: event }));
+      return;
+    }
+    
     switch (data.type) {
       case 'research_log_updated':
-        // CRITICAL: Immediately refresh research logs on any update
-        fetchResearchLogs();
+        syncResearchLog(data.data);
         if (user.role === 'student') {
           fetchStudentLogStatus();
         }
@@ -577,12 +616,35 @@ const Dashboard = ({ user, logout, setUser }) => {
         setNotifications(prev => [data.data, ...prev]);
         showNotification(data.data.title, data.data.message);
         break;
+      case 'resync_required':
+        // Missed events could not be replayed after a reconnect
+        fetchDashboardData();
+        break;
       default:
         console.log('Unknown event type:', data.type);
     }
   };
 
-  const { isConnected } = useWebSocket(user?.id, handleWebSocketMessage);
+  const applyResearchLogDelta = (delta) => {
+    const log = delta && researchLogs.find(item => item.id === delta.id);
+    if (!log || (log.version || 0) !== delta.base_version) return false;
+    setResearchLogs(prev => prev.map(item =>
+      item.id === delta.id ? { ...item, ...delta.changes, version: delta.version } : item
+    ));
+    return true;
+  };
+
+  // Patch the loaded log in place; refetch just that log when it is missing or we are behind
+  const syncResearchLog = (event) => {
+    if (applyResearchLogDelta(event.research_log_delta)) return;
+    if (event.research_log_delta) {
+      fetchResearchLog(event.research_log_delta.id);
+    } else {
+      fetchResearchLogs();
+    }
+  };
+
+  const { isConnected } = useWebSocket(user?.id, handleWebSocketMessage, WEBSOCKET_TOPICS);
 
   const showNotification = (title, message) => {
     // Simple notification system - you can enhance this with toast libraries
@@ -605,9 +667,8 @@ const Dashboard = ({ user, logout, setUser }) => {
   // CRITICAL FIX: Defensive fetch functions for unified data handling
   const fetchResearchLogs = async () => {
     try {
-      const response = await axios.get(`${API}/research-logs`);
-      // Defensive schema handling - API returns array or object with items
-      const logs = Array.isArray(response.data) ? response.data : (response.data?.items ?? []);
+      // The log cards show the full text, which the list view leaves out by default
+      const logs = await fetchAllPages(`${API}/research-logs`, { fields: '*' });
       setResearchLogs(logs);
     } catch (error) {
       console.error('Error fetching research logs:', error);
@@ -616,6 +677,18 @@ const Dashboard = ({ user, logout, setUser }) => {
     }
   };
 
+  const fetchResearchLog = async (logId) => {
+    try {
+      const response = await axios.get(`${API}/research-logs/${logId}`);
+      setResearchLogs(prev => prev.some(item => item.id === logId)
+        ? prev.map(item => (item.id === logId ? response.data : item))
+        : [response.data, ...prev]);
+    } catch (error) {
+      console.error('Error fetching research log:', error);
+      fetchResearchLogs();
+    }
+  };
+
   const fetchStudentLogStatus = async () => {
     if (user.role !== 'student') return;
     try {
@@ -631,8 +704,7 @@ const Dashboard = ({ user, logout, setUser }) => {
 
   const fetchGrants = async () => {
     try {
-      const response = await axios.get(`${API}/grants`);
-      setGrants(response.data || []);
+      setGrants(await fetchAllPages(`${API}/grants`));
     } catch (error) {
       console.error('Error fetching grants:', error);
     }
@@ -659,8 +731,7 @@ const Dashboard = ({ user, logout, setUser }) => {
 
   const fetchPublications = async () => {
     try {
-      const response = await axios.get(`${API}/publications`);
-      setPublications(response.data || []);
+      setPublications(await fetchAllPages(`${API}/publications`));
     } catch (error) {
       console.error('Error fetching publications:', error);
     }
@@ -668,8 +739,7 @@ const Dashboard = ({ user, logout, setUser }) => {
 
   const fetchBulletins = async () => {
     try {
-      const response = await axios.get(`${API}/bulletins`);
-      setBulletins(response.data || []);
+      setBulletins(await fetchAllPages(`${API}/bulletins`));
     } catch (error) {
       console.error('Error fetching bulletins:', error);
     }
@@ -677,8 +747,8 @@ const Dashboard = ({ user, logout, setUser }) => {
 
   const fetchMeetings = async () => {
     try {
-      const response = await axios.get(`${API}/meetings`);
-      const filteredMeetings = (response.data || []).filter(meeting => {
+      const meetings = await fetchAllPages(`${API}/meetings`);
+      const filteredMeetings = meetings.filter(meeting => {
         const meetingDate = new Date(meeting.meeting_date);
         const now = new Date();
         const diffDays = (now - meetingDate) / (1000 * 60 * 60 * 24);
@@ -706,8 +776,7 @@ const Dashboard = ({ user, logout, setUser }) => {
 
   const fetchMilestones = async () => {
     try {
-      const response = await axios.get(`${API}/milestones`);
-      setMilestones(response.data || []);
+      setMilestones(await fetchAllPages(`${API}/milestones`));
     } catch (error) {
       console.error('Error fetching milestones:', error);
     }
@@ -715,8 +784,7 @@ const Dashboard = ({ user, logout, setUser }) => {
 
   const fetchTodos = async () => {
     try {
-      const response = await axios.get(`${API}/todos`);
-      setTodos(response.data || []);
+      setTodos(await fetchAllPages(`${API}/todos`));
     } catch (error) {
       console.error('Error fetching todos:', error);
     }
@@ -728,11 +796,11 @@ const Dashboard = ({ user, logout, setUser }) => {
       
       // Fetch basic dashboard data
       const apiCalls = [
-        axios.get(`${API}/tasks`).catch(() => ({data: []})),
+        fetchAllPages(`${API}/tasks`).then(data => ({data})).catch(() => ({data: []})),
         axios.get(`${API}/dashboard/stats`).catch(() => ({data: {}})),
         axios.get(`${API}/lab/settings`).catch(() => ({data: {}})),
-        axios.get(`${API}/reminders`).catch(() => ({data: []})),
-        axios.get(`${API}/notes`).catch(() => ({data: []}))
+        fetchAllPages(`${API}/reminders`).then(data => ({data})).catch(() => ({data: []})),
+        fetchAllPages(`${API}/notes`).then(data => ({data})).catch(() => ({data: []}))
       ];
 
       const [tasksRes, statsRes, labRes, remindersRes, notesRes] = await Promise.all(apiCalls);
@@ -769,8 +837,7 @@ const Dashboard = ({ user, logout, setUser }) => {
       }
 
       if (user.role === 'supervisor' || user.role === 'lab_manager') {
-        const studentsRes = await axios.get(`${API}/students`);
-        setStudents(studentsRes.data || []);
+        setStudents(await fetchAllPages(`${API}/students`));
       }
     } catch (error) {
       console.error('Error fetching dashboard data:', error);
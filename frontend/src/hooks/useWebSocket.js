@@ -1,9 +1,20 @@
 import { useEffect, useRef, useState } from 'react';
 import io from 'socket.io-client';
 
-const useWebSocket = (userId, onMessage) => {
+const RECONNECT_BASE_DELAY = 1000;
+const RECONNECT_MAX_DELAY = 30000;
+
+// topics: subscription patterns such as 'user_updated:avatar_updated'; omit to receive every event
+const useWebSocket = (userId, onMessage, topics) => {
   const [isConnected, setIsConnected] = useState(false);
   const socketRef = useRef(null);
+  const onMessageRef = useRef(onMessage);
+  // Session position, so a reconnect only replays the events we missed
+  const sessionRef = useRef({ epoch: null, lastSeq: 0 });
+
+  useEffect(() => {
+    onMessageRef.current = onMessage;
+  }, [onMessage]);
 
   useEffect(() => {
     if (!userId) return;
@@ -11,30 +22,64 @@ const useWebSocket = (userId, onMessage) => {
     // Create WebSocket connection using native WebSocket for better compatibility
     const API_URL = process.env.REACT_APP_BACKEND_URL || window.location.origin;
     const wsUrl = API_URL.replace('http', 'ws').replace('https', 'wss');
-    
-    try {
-      socketRef.current = new WebSocket(`${wsUrl}/ws/${userId}`);
-      
+
+    let reconnectTimer = null;
+    let reconnectAttempts = 0;
+    let closedByHook = false;
+
+    const connect = () => {
+      const { epoch, lastSeq } = sessionRef.current;
+      const params = new URLSearchParams();
+      const token = localStorage.getItem('token');
+      if (epoch && token) {
+        // Missed events are only replayed to an authenticated owner
+        params.set('last_seq', lastSeq);
+        params.set('epoch', epoch);
+        params.set('token', token);
+      }
+      if (topics) {
+        params.set('subscribe', topics.join(','));
+      }
+      const query = params.toString() ? `?${params}` : '';
+
+      try {
+        socketRef.current = new WebSocket(`${wsUrl}/ws/${userId}${query}`);
+      } catch (error) {
+        console.error('Error creating WebSocket connection:', error);
+        scheduleReconnect();
+        return;
+      }
+
       socketRef.current.onopen = () => {
         console.log('WebSocket connected');
         setIsConnected(true);
-        
+        reconnectAttempts = 0;
+
         // Send ping to keep connection alive
         const pingInterval = setInterval(() => {
           if (socketRef.current?.readyState === WebSocket.OPEN) {
             socketRef.current.send(JSON.stringify({ type: 'ping' }));
           }
         }, 30000);
-        
+
         socketRef.current.pingInterval = pingInterval;
       };
 
       socketRef.current.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data);
-          if (data.type !== 'pong') {
-            onMessage(data);
+          if (data.type === 'pong' || data.type === 'subscriptions') return;
+
+          if (data.type === 'session' || data.type === 'resync_required') {
+            sessionRef.current = { epoch: data.epoch, lastSeq: data.seq };
+            if (data.type === 'session') return;
+          } else if (data.seq != null) {
+            // Replayed and live events can overlap right after a reconnect
+            if (data.seq <= sessionRef.current.lastSeq) return;
+            sessionRef.current.lastSeq = data.seq;
           }
+
+          onMessageRef.current(data);
         } catch (error) {
           console.error('Error parsing WebSocket message:', error);
         }
@@ -46,17 +91,29 @@ const useWebSocket = (userId, onMessage) => {
         if (socketRef.current?.pingInterval) {
           clearInterval(socketRef.current.pingInterval);
         }
+        if (!closedByHook) {
+          scheduleReconnect();
+        }
       };
 
       socketRef.current.onerror = (error) => {
         console.error('WebSocket error:', error);
         setIsConnected(false);
       };
-    } catch (error) {
-      console.error('Error creating WebSocket connection:', error);
-    }
+    };
+
+    const scheduleReconnect = () => {
+      const delay = Math.min(RECONNECT_BASE_DELAY * 2 ** reconnectAttempts, RECONNECT_MAX_DELAY);
+      reconnectAttempts += 1;
+      // Jitter spreads reconnects out after a server restart or network blip
+      reconnectTimer = setTimeout(connect, delay / 2 + Math.random() * delay / 2);
+    };
+
+    connect();
 
     return () => {
+      closedByHook = true;
+      clearTimeout(reconnectTimer);
       if (socketRef.current) {
         if (socketRef.current.pingInterval) {
           clearInterval(socketRef.current.pingInterval);
@@ -64,7 +121,8 @@ const useWebSocket = (userId, onMessage) => {
         socketRef.current.close();
       }
     };
-  }, [userId, onMessage]);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [userId, topics?.join(',')]);
 
   const sendMessage = (message) => {
     if (socketRef.current?.readyState === WebSocket.OPEN) {
@@ -75,4 +133,4 @@ const useWebSocket = (userId, onMessage) => {
   return { isConnected, sendMessage };
 };
 
-export default useWebSocket;
\ No newline at end of file
+export default useWebSocket;
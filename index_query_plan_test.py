@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Reuse the index registry and hot query list straight from the backend
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from server import INDEX_REGISTRY, HOT_QUERIES, ensure_indexes, verify_query_plans, client
+
+async def run_index_plan_check():
+    """Apply the index registry and fail if any hot query is not served by an IXSCAN"""
+    print(f"🔧 Applying indexes for {len(INDEX_REGISTRY)} collections...")
+    await ensure_indexes()
+    # Second pass must be a no-op
+    await ensure_indexes()
+    print("✅ Indexes applied (idempotent)")
+
+    print(f"🔍 Explaining {len(HOT_QUERIES)} hot queries...")
+    failures = await verify_query_plans()
+
+    for failure in failures:
+        print(f"❌ {failure['query']} on {failure['collection']}: {' -> '.join(failure['stages'])}")
+
+    client.close()
+
+    if failures:
+        print(f"❌ {len(failures)} hot queries are not index-backed")
+        return 1
+
+    print(f"✅ All {len(HOT_QUERIES)} hot queries use an IXSCAN")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run_index_plan_check()))
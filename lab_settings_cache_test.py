@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import asyncio
+import orjson
+import sys
+from pathlib import Path
+
+# Check version handling of the lab settings cache in-process
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from server import LabSettingsCache, apply_peer_notification, lab_settings_cache
+
+def settings(version: int, lab_name: str) -> dict:
+    return {"id": "settings-1", "supervisor_id": "sup-1", "lab_name": lab_name, "version": version}
+
+class LabSettingsCacheTester:
+    def __init__(self):
+        self.cache = LabSettingsCache(ttl_seconds=60)
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def cached(self) -> tuple:
+        etag, body = await self.cache.get("sup-1")
+        return etag, orjson.loads(body)
+
+    async def run(self):
+        print("🔍 Writes refresh the cache...")
+        self.cache.refresh(settings(3, "Hydrochemistry Lab"))
+        etag, body = await self.cached()
+        self.check("Refreshed settings are served without a read",
+                   body["lab_name"] == "Hydrochemistry Lab" and self.cache.stats()["misses"] == 0)
+        self.check("ETag follows the document version", etag == '"lab-sup-1.3"')
+
+        print("🔍 Out-of-order writers...")
+        self.cache.store("sup-1", settings(2, "Stale Lab"))
+        etag, body = await self.cached()
+        self.check("An older version never replaces a newer one", body["lab_name"] == "Hydrochemistry Lab" and etag == '"lab-sup-1.3"')
+        self.cache.refresh(settings(4, "Renamed Lab"))
+        etag, body = await self.cached()
+        self.check("A newer version replaces the entry", body["lab_name"] == "Renamed Lab" and etag == '"lab-sup-1.4"')
+
+        print("🔍 Labs without settings...")
+        etag, body = self.cache.store("sup-2", {})
+        self.check("A missing document is cached as an empty body at version 0", body == b"{}" and etag == '"lab-sup-2.0"')
+        self.cache.refresh({"id": "settings-2", "supervisor_id": "sup-2", "lab_name": "New Lab", "version": 1})
+        etag, body = await self.cache.get("sup-2")
+        self.check("The first write replaces the empty entry", orjson.loads(body)["lab_name"] == "New Lab" and etag == '"lab-sup-2.1"')
+
+        print("🔍 Writes on another worker...")
+        lab_settings_cache.store("sup-1", settings(4, "Renamed Lab"))
+        apply_peer_notification({"kind": "lab_settings", "origin": "other-worker", "supervisor_ids": ["sup-1"]}, "this-worker")
+        self.check("Peer notifications drop the shared cache entry", "sup-1" not in lab_settings_cache.entries)
+
+        if self.failures:
+            print(f"❌ {self.failures} lab settings cache checks failed")
+            return 1
+        print("✅ Lab settings are served from memory and invalidated by version")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(LabSettingsCacheTester().run()))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+# Compare list response paths in-process, on documents shaped like our collections
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from server import Publication, ResearchLog, trusted_list_response
+
+ITEM_COUNT = 1000
+RUNS = 5
+
+def stored_research_logs() -> List[dict]:
+    """Research logs as the list handler has them after adding display fields"""
+    started = datetime(2024, 1, 1, 9, 30)
+    logs = []
+    for index in range(ITEM_COUNT):
+        log = ResearchLog(
+            user_id="student-1",
+            student_id="student-1",
+            supervisor_id="supervisor-1",
+            activity_type="experiment",
+            title=f"Groundwater sampling run {index}",
+            description="Collected and filtered samples from all monitoring wells. " * 4,
+            findings="Nitrate levels elevated near the agricultural boundary. " * 3,
+            tags=["groundwater", "nitrate", "sampling"],
+            date=started + timedelta(days=index)
+        ).dict()
+        log.update(_id=uuid.uuid4().hex, student_name="Benchmark Student", student_email="student@test.com")
+        logs.append(log)
+    return logs
+
+def stored_publications() -> List[dict]:
+    """Publications as written by the Scopus sync"""
+    return [{
+        "_id": uuid.uuid4().hex,
+        "id": str(uuid.uuid4()),
+        "supervisor_id": "supervisor-1",
+        "scopus_id": "57190000000",
+        "title": f"Nitrate transport in a shallow alluvial aquifer, part {index}",
+        "authors": ["A. Researcher", "B. Student", "C. Supervisor"],
+        "journal": "Journal of Hydrology",
+        "publication_year": 2000 + index % 25,
+        "citations": index % 40,
+        "doi": f"10.1016/j.jhydrol.2024.{index:05d}",
+        "abstract": "We sampled monitoring wells across three seasons. " * 6,
+        "keywords": ["nitrate", "groundwater"],
+        "publication_date": "2024-01-01",
+        "source": "scopus",
+        "created_at": datetime(2024, 1, 1, 12, 0, 0, 123000)
+    } for index in range(ITEM_COUNT)]
+
+async def validated_body(model, documents: List[dict]) -> bytes:
+    """The previous path: build models, then let FastAPI validate and serialize them again"""
+    field = create_response_field(name="Response", type_=List[model])
+    content = await serialize_response(field=field, response_content=[model(**document) for document in documents])
+    return JSONResponse(content).body
+
+async def measure(label: str, model, documents: List[dict]) -> bool:
+    timings = {"validated": [], "trusted": []}
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        validated = await validated_body(model, documents)
+        timings["validated"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        trusted = trusted_list_response(model, documents).body
+        timings["trusted"].append(time.perf_counter() - started)
+
+    per_item = {path: min(runs) / len(documents) * 1e6 for path, runs in timings.items()}
+    print(f"   {label}: validated={per_item['validated']:.1f}µs trusted={per_item['trusted']:.1f}µs "
+          f"per item ({per_item['validated'] / per_item['trusted']:.1f}x)")
+
+    # Defaulted ids are freshly generated on each path, so compare every stored field
+    same = json.loads(validated) == json.loads(trusted)
+    print(f"{'✅' if same else '❌'} {label} bodies are identical")
+    return same
+
+async def run_benchmark():
+    print(f"📊 List serialization cost per item ({ITEM_COUNT} items, best of {RUNS})")
+    results = [
+        await measure("/research-logs", ResearchLog, stored_research_logs()),
+        await measure("/publications", Publication, stored_publications())
+    ]
+    return 0 if all(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run_benchmark()))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+import asyncio
+import httpx
+import os
+import sys
+
+# Test configuration
+BACKEND_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://researchpulse.preview.emergentagent.com')
+API_BASE = f"{BACKEND_URL}/api"
+# Only sent by a backend started with DB_QUERY_COUNT_HEADER_ENABLED=true
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+# Database commands each mutation may issue once auth and the lab roster are cached
+QUERY_BUDGETS = {
+    "update todo": 1,
+    "complete todo": 1,
+    "reorder todo": 1,
+    "update research log": 2,  # the write plus its outbox entry
+    "update lab settings": 1,
+}
+
+class MutationQueryCountTest:
+    """Write endpoints return the fresh resource without re-reading it"""
+    def __init__(self):
+        self.client = httpx.AsyncClient(timeout=60.0)
+        self.headers = None
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def login(self) -> bool:
+        supervisor_data = {
+            "email": "supervisor.querycount@test.com",
+            "password": "TestPass123!",
+            "full_name": "Dr. Query Count Supervisor",
+            "role": "supervisor",
+            "lab_name": "Query Count Lab"
+        }
+        response = await self.client.post(f"{API_BASE}/auth/register", json=supervisor_data)
+        if response.status_code != 200:
+            response = await self.client.post(f"{API_BASE}/auth/login", json={
+                "email": supervisor_data["email"],
+                "password": supervisor_data["password"]
+            })
+        if response.status_code != 200:
+            print(f"❌ Failed to create/login supervisor: {response.text}")
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def measure(self, label: str, method: str, path: str, **kwargs) -> dict:
+        """Send a mutation and check its query count against the budget"""
+        response = await self.client.request(method, f"{API_BASE}{path}", headers=self.headers, **kwargs)
+        if response.status_code != 200:
+            print(f"❌ {label} returned {response.status_code}: {response.text}")
+            self.failures += 1
+            return {}
+        if QUERY_COUNT_HEADER not in response.headers:
+            print(f"❌ {label} has no {QUERY_COUNT_HEADER} header - start the backend with DB_QUERY_COUNT_HEADER_ENABLED=true")
+            self.failures += 1
+            return response.json()
+        queries = int(response.headers[QUERY_COUNT_HEADER])
+        print(f"   {label}: {queries} queries")
+        self.check(f"{label} stays within {QUERY_BUDGETS[label]} queries", 0 <= queries <= QUERY_BUDGETS[label])
+        return response.json()
+
+    async def run(self):
+        print("🔢 Counting database queries per mutation")
+        print("=" * 60)
+        if not await self.login():
+            return 1
+
+        # Creating warms the principal and lab roster caches
+        response = await self.client.post(f"{API_BASE}/todos", json={"title": "Calibrate probe"}, headers=self.headers)
+        todo_id = response.json()["id"]
+
+        todo = await self.measure("update todo", "PUT", f"/todos/{todo_id}", json={"title": "Calibrate pH probe"})
+        self.check("Updated todo is returned", todo.get("title") == "Calibrate pH probe")
+        todo = await self.measure("complete todo", "PUT", f"/todos/{todo_id}/complete")
+        self.check("Completed todo is returned", todo.get("is_completed") is True and todo.get("completed_at"))
+        todo = await self.measure("reorder todo", "PUT", f"/todos/{todo_id}/reorder", params={"new_index": 3})
+        self.check("Reordered todo is returned", todo.get("order_index") == 3)
+
+        response = await self.client.post(f"{API_BASE}/research-logs", json={
+            "activity_type": "experiment",
+            "title": "Sampling run",
+            "description": "Groundwater sampling"
+        }, headers=self.headers)
+        log = response.json()
+        self.check("Created research log is returned", response.status_code == 200 and log.get("title") == "Sampling run")
+        log = await self.measure("update research log", "PATCH", f"/research-logs/{log['id']}", json={
+            "activity_type": "experiment",
+            "title": "Sampling run 2",
+            "description": "Groundwater sampling"
+        })
+        self.check("Updated research log is returned", log.get("title") == "Sampling run 2")
+
+        await self.measure("update lab settings", "PUT", "/lab/settings", json={"lab_name": "Query Count Lab"})
+
+        await self.client.delete(f"{API_BASE}/todos/{todo_id}", headers=self.headers)
+        await self.client.aclose()
+        if self.failures:
+            print(f"❌ {self.failures} query count checks failed")
+            return 1
+        print("✅ Mutations return the fresh resource in one round trip")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(MutationQueryCountTest().run()))
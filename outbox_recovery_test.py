@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Recover and deliver outbox batches in-process against in-memory collections
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import server
+from server import OutboxDispatcher, outbox_batch
+from fake_motor import FakeDatabase
+
+def research_log(log_id: str, batch: dict) -> dict:
+    return {"id": log_id, "student_id": "student-1", "supervisor_id": "sup-1", "title": "Column run",
+            "status": "submitted", "version": 2, "pending_events": [batch]}
+
+class OutboxRecoveryTester:
+    def __init__(self):
+        self.outbox = OutboxDispatcher()
+        self.delivered = []
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def record_event(self, event_type, data, user_id=None, supervisor_id=None):
+        self.delivered.append((event_type, user_id))
+
+    def marker(self, action: str, age_seconds: float) -> dict:
+        batch = outbox_batch(action, "Student One")
+        batch["created_at"] = datetime.utcnow() - timedelta(seconds=age_seconds)
+        return batch
+
+    async def run(self):
+        server.db = FakeDatabase()
+        server.db.sync.outbox.create_index("id", unique=True)
+        server.emit_event = self.record_event
+        stale = server.OUTBOX_LEASE_SECONDS + 1
+
+        print("🔍 A write whose outbox entries were never recorded...")
+        lost = self.marker("submitted", stale)
+        server.db.sync.research_logs.insert_one(research_log("log-1", lost))
+        self.check("The sweep rebuilds the lost batch", await self.outbox.recover() == 1)
+        self.check("A rebuilt batch is never rebuilt twice", await self.outbox.recover() == 0)
+        await self.outbox.dispatch_batch()
+        notification = server.db.sync.notifications.find_one({"user_id": "sup-1"})
+        self.check("The supervisor's notification is stored",
+                   notification is not None and notification["type"] == "research_log_submitted")
+        self.check("The log update and the notification are pushed",
+                   sorted(self.delivered) == sorted([(server.EventType.RESEARCH_LOG_UPDATED, "student-1"),
+                                                     (server.EventType.RESEARCH_LOG_UPDATED, "sup-1"),
+                                                     (server.EventType.NOTIFICATION_CREATED, "sup-1")]))
+        self.check("The marker is cleared and the outbox drained",
+                   not server.db.sync.research_logs.find_one({"id": "log-1"})["pending_events"]
+                   and server.db.sync.outbox.count_documents({}) == 0)
+
+        print("🔍 Markers the sweep must leave alone...")
+        fresh = self.marker("submitted", 0)
+        server.db.sync.research_logs.insert_one(research_log("log-2", fresh))
+        recorded = self.marker("accepted", stale)
+        server.db.sync.research_logs.insert_one(research_log("log-3", recorded))
+        await self.outbox.enqueue(*server.research_log_side_effects(recorded, research_log("log-3", recorded)),
+                                  batch=recorded, source="research_logs")
+        outbox_rows = server.db.sync.outbox.count_documents({})
+        self.check("Recent and already recorded batches are skipped",
+                   await self.outbox.recover() == 0 and server.db.sync.outbox.count_documents({}) == outbox_rows)
+
+        print("🔍 The dispatcher sweeps on its own...")
+        self.delivered.clear()
+        server.db.sync.research_logs.delete_many({})
+        server.db.sync.outbox.delete_many({})
+        server.db.sync.research_logs.insert_one(research_log("log-4", self.marker("submitted", stale)))
+        dispatcher = asyncio.create_task(self.outbox.run())
+        await asyncio.sleep(0.05)
+        dispatcher.cancel()
+        await asyncio.gather(dispatcher, return_exceptions=True)
+        self.check("A running dispatcher recovers and delivers at startup",
+                   (server.EventType.NOTIFICATION_CREATED, "sup-1") in self.delivered
+                   and not server.db.sync.research_logs.find_one({"id": "log-4"})["pending_events"])
+
+        if self.failures:
+            print(f"❌ {self.failures} outbox recovery checks failed")
+            return 1
+        print("✅ Side effects lost between a write and its outbox entries are delivered once")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(OutboxRecoveryTester().run()))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+# Sync fixed Scopus results in-process against the configured MongoDB
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import server
+from server import PageParams, User, db, get_publications
+from fastapi import Response
+
+REPEATED_READS = 3
+
+# Two Scopus records without a DOI, which used to collapse into one document
+SCOPUS_RESULTS = [
+    {"title": "Nitrate transport in a shallow aquifer", "authors": ["A. Researcher"], "journal": "Journal of Hydrology",
+     "publication_year": 2024, "doi": None, "scopus_id": "85100000001", "citation_count": 3},
+    {"title": "Seasonal recharge in karst catchments", "authors": ["B. Student"], "journal": "Water Research",
+     "publication_year": 2023, "doi": None, "scopus_id": "85100000002", "citation_count": 1},
+]
+
+class PublicationSyncEventsTester:
+    def __init__(self):
+        self.supervisor = User(id=f"sup-{uuid.uuid4()}", email="sync.supervisor@test.com", full_name="Dr. Sync",
+                               role="supervisor", password_hash="", scopus_id="57190000000")
+        self.events = []
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def record_event(self, event_type, data, user_id=None, supervisor_id=None):
+        self.events.append(event_type)
+
+    async def fetch_scopus(self, scopus_id: str):
+        return [dict(publication) for publication in SCOPUS_RESULTS]
+
+    async def read(self) -> int:
+        """Events emitted by one GET /publications"""
+        before = len(self.events)
+        response = Response()
+        conditional = server.ConditionalRequest(("publications", "users"), self.supervisor.id, None, response)
+        await get_publications(PageParams(response, cursor=None, limit=20, fields=None), conditional, self.supervisor)
+        return len(self.events) - before
+
+    async def run(self):
+        server.emit_event = self.record_event
+        server.fetch_scopus_publications = self.fetch_scopus
+        await db.users.insert_one(self.supervisor.dict())
+        try:
+            print("🔍 Repeated reads of DOI-less Scopus publications...")
+            counts = [await self.read() for _ in range(REPEATED_READS)]
+            print(f"   events per read: {counts}")
+            self.check("The first read announces the new publications", counts[0] == 1)
+            self.check("Repeated reads emit nothing", not any(counts[1:]))
+            stored = await db.publications.find({"supervisor_id": self.supervisor.id}, {"_id": 0, "title": 1}).to_list(None)
+            self.check("Each DOI-less publication keeps its own document",
+                       sorted(doc["title"] for doc in stored) == sorted(pub["title"] for pub in SCOPUS_RESULTS))
+        finally:
+            await db.users.delete_one({"id": self.supervisor.id})
+            await db.publications.delete_many({"supervisor_id": self.supervisor.id})
+            await db.dashboard_counters.delete_many({"key": f"lab:{self.supervisor.id}"})
+
+        if self.failures:
+            print(f"❌ {self.failures} publication sync checks failed")
+            return 1
+        print("✅ Scopus syncs only announce real changes")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(PublicationSyncEventsTester().run()))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import asyncio
+import httpx
+import os
+import sys
+
+# Test configuration
+BACKEND_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://researchpulse.preview.emergentagent.com')
+API_BASE = f"{BACKEND_URL}/api"
+REPEATED_READS = 3
+
+class ReadEndpointEventsTest:
+    """GET endpoints must not fan events out to the lab on every read"""
+    def __init__(self):
+        self.client = httpx.AsyncClient(timeout=60.0)
+        self.headers = None
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def login(self) -> bool:
+        supervisor_data = {
+            "email": "supervisor.readevents@test.com",
+            "password": "TestPass123!",
+            "full_name": "Dr. Read Events Supervisor",
+            "role": "supervisor",
+            "lab_name": "Read Events Lab"
+        }
+        response = await self.client.post(f"{API_BASE}/auth/register", json=supervisor_data)
+        if response.status_code != 200:
+            response = await self.client.post(f"{API_BASE}/auth/login", json={
+                "email": supervisor_data["email"],
+                "password": supervisor_data["password"]
+            })
+        if response.status_code != 200:
+            print(f"❌ Failed to create/login supervisor: {response.text}")
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def emitted_events(self) -> int:
+        response = await self.client.get(f"{BACKEND_URL}/api/health/cache")
+        return sum(response.json()["emitted_events"].values())
+
+    async def count_events_per_read(self, path: str) -> list:
+        """Events emitted by each of several identical GETs"""
+        counts = []
+        for _ in range(REPEATED_READS):
+            before = await self.emitted_events()
+            response = await self.client.get(f"{API_BASE}{path}", headers=self.headers)
+            if response.status_code != 200:
+                print(f"❌ GET {path} returned {response.status_code}")
+            counts.append(await self.emitted_events() - before)
+        return counts
+
+    async def run(self):
+        print("📡 Counting realtime events emitted per GET")
+        print("=" * 60)
+        if not await self.login():
+            return 1
+
+        counts = await self.count_events_per_read("/publications")
+        print(f"   /publications events per read: {counts}")
+        self.check("Repeated publication reads emit nothing once synced", not any(counts[1:]))
+
+        counts = await self.count_events_per_read("/citations")
+        print(f"   /citations events per read: {counts}")
+        # The first read may refresh stale metrics; later reads hit the cache
+        self.check("Citation reads emit at most one change event", sum(counts) <= 1 and not any(counts[1:]))
+
+        await self.client.aclose()
+        if self.failures:
+            print(f"❌ {self.failures} read endpoint checks failed")
+            return 1
+        print("✅ Read endpoints no longer broadcast to the lab")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(ReadEndpointEventsTest().run()))
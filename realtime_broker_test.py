@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import fakeredis
+
+# Run two ConnectionManagers ("workers") against one in-memory Redis stand-in
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from server import ConnectionManager, EncodedMessage, RedisBroker, SYSTEM_TOPIC, lab_rosters
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.received.append(EncodedMessage.from_text(text).message["type"])
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+class RealtimeBrokerTester:
+    def __init__(self):
+        server = fakeredis.FakeServer()
+        self.worker_a = ConnectionManager(RedisBroker(fakeredis.aioredis.FakeRedis(server=server)))
+        self.worker_b = ConnectionManager(RedisBroker(fakeredis.aioredis.FakeRedis(server=server)))
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def wait_for(self, predicate, timeout: float = 2.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            await asyncio.sleep(0.01)
+        return predicate()
+
+    async def run(self):
+        await self.worker_a.start()
+        await self.worker_b.start()
+
+        supervisor_socket, student_socket, other_socket = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await self.worker_a.connect(supervisor_socket, "sup-1")
+            await self.worker_b.connect(student_socket, "student-1", supervisor_id="sup-1")
+            await self.worker_b.connect(other_socket, "student-2", supervisor_id="sup-2")
+
+        print("🔍 Personal event published on worker A, recipient on worker B...")
+        await self.worker_a.send_personal_message({"type": "personal"}, "student-1")
+        self.check("Student on worker B received personal event",
+                   await self.wait_for(lambda: "personal" in student_socket.received))
+
+        print("🔍 Lab event published on worker B...")
+        lab_rosters.entries["sup-1"] = (time.monotonic() + 60, {"student-1": "student"})
+        await self.worker_b.send_to_lab({"type": "lab"}, "sup-1")
+        self.check("Supervisor on worker A received lab event",
+                   await self.wait_for(lambda: "lab" in supervisor_socket.received))
+        self.check("Student on worker B received lab event",
+                   await self.wait_for(lambda: "lab" in student_socket.received))
+
+        print("🔍 Global broadcast...")
+        await self.worker_a.broadcast_to_channel({"type": "global"})
+        self.check("All sockets received the broadcast", await self.wait_for(
+            lambda: all("global" in socket.received
+                        for socket in (supervisor_socket, student_socket, other_socket))))
+        self.check("Student in another lab did not receive the lab event", "lab" not in other_socket.received)
+        self.check("Each event was delivered once", student_socket.received.count("global") == 1)
+
+        print("🔍 Cache invalidation from a peer worker...")
+        lab_rosters.entries["sup-1"] = (time.monotonic() + 60, {"student-1": "student"})
+        await self.worker_a.broker.publish(SYSTEM_TOPIC, EncodedMessage({
+            "kind": "roster", "origin": self.worker_a.broker.origin, "supervisor_ids": ["sup-1"]
+        }))
+        self.check("Peer roster invalidation applied", await self.wait_for(lambda: "sup-1" not in lab_rosters.entries))
+
+        await self.worker_a.broker.close()
+        await self.worker_b.broker.close()
+
+        if self.failures:
+            print(f"❌ {self.failures} realtime broker checks failed")
+            return 1
+        print("✅ Events fan out across workers through the broker")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(RealtimeBrokerTester().run()))
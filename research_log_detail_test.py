@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+import asyncio
+import httpx
+import os
+import sys
+
+# Test configuration
+BACKEND_URL = os.environ.get('REACT_APP_BACKEND_URL', 'https://researchpulse.preview.emergentagent.com')
+API_BASE = f"{BACKEND_URL}/api"
+SUMMARY_FIELDS = {"id", "title", "status", "date", "submitted_at", "reviewed_at",
+                  "student_id", "student_name", "attachment_count", "version"}
+
+class ResearchLogDetailTest:
+    """Summary list plus a conditional detail endpoint for research logs"""
+    def __init__(self):
+        self.client = httpx.AsyncClient(timeout=60.0)
+        self.headers = None
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def login(self) -> bool:
+        supervisor_data = {
+            "email": "supervisor.logdetail@test.com",
+            "password": "TestPass123!",
+            "full_name": "Dr. Log Detail Supervisor",
+            "role": "supervisor",
+            "lab_name": "Log Detail Lab"
+        }
+        response = await self.client.post(f"{API_BASE}/auth/register", json=supervisor_data)
+        if response.status_code != 200:
+            response = await self.client.post(f"{API_BASE}/auth/login", json={
+                "email": supervisor_data["email"],
+                "password": supervisor_data["password"]
+            })
+        if response.status_code != 200:
+            print(f"❌ Failed to create/login supervisor: {response.text}")
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def get_log(self, log_id: str, etag: str = None) -> httpx.Response:
+        headers = dict(self.headers, **({"If-None-Match": etag} if etag else {}))
+        return await self.client.get(f"{API_BASE}/research-logs/{log_id}", headers=headers)
+
+    async def run(self):
+        print("📄 Research log summary and detail")
+        print("=" * 60)
+        if not await self.login():
+            return 1
+
+        log_body = {
+            "activity_type": "experiment",
+            "title": "Detail sampling run",
+            "description": "Collected samples from every monitoring well. " * 20,
+            "findings": "Nitrate levels elevated near the boundary."
+        }
+        response = await self.client.post(f"{API_BASE}/research-logs", json=log_body, headers=self.headers)
+        if response.status_code != 200:
+            print(f"❌ Failed to create research log: {response.text}")
+            return 1
+        log_id = response.json()["id"]
+
+        response = await self.client.get(f"{API_BASE}/research-logs", params={"view": "summary"}, headers=self.headers)
+        summary = next((log for log in response.json() if log["id"] == log_id), {})
+        self.check("Summary view carries only the slim fields", set(summary) == SUMMARY_FIELDS)
+        self.check("Summary view counts attachments", summary.get("attachment_count") == 0)
+
+        response = await self.get_log(log_id)
+        etag = response.headers.get("etag")
+        self.check("Detail returns the full log with an ETag",
+                   response.status_code == 200 and etag and response.json()["findings"] == log_body["findings"])
+
+        response = await self.get_log(log_id, etag)
+        self.check("Matching If-None-Match gets 304", response.status_code == 304 and not response.content)
+
+        await self.client.patch(f"{API_BASE}/research-logs/{log_id}", json=dict(log_body, title="Detail sampling run 2"), headers=self.headers)
+        response = await self.get_log(log_id, etag)
+        self.check("An update changes the ETag",
+                   response.status_code == 200 and response.headers.get("etag") != etag
+                   and response.json()["title"] == "Detail sampling run 2")
+
+        etag = response.headers.get("etag")
+        await self.client.put(f"{API_BASE}/users/profile", json={"full_name": "Dr. Renamed Detail Supervisor"}, headers=self.headers)
+        response = await self.get_log(log_id, etag)
+        names = {response.json().get("student_name"), response.json().get("supervisor_name")} if response.status_code == 200 else set()
+        self.check("Renaming a joined user changes the ETag",
+                   response.headers.get("etag") != etag and "Dr. Renamed Detail Supervisor" in names)
+        await self.client.put(f"{API_BASE}/users/profile", json={"full_name": "Dr. Log Detail Supervisor"}, headers=self.headers)
+
+        response = await self.get_log("no-such-log")
+        self.check("Unknown log is 404", response.status_code == 404)
+
+        await self.client.aclose()
+        if self.failures:
+            print(f"❌ {self.failures} research log detail checks failed")
+            return 1
+        print("✅ A single research log costs one small indexed read")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(ResearchLogDetailTest().run()))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import json
+import sys
+from pathlib import Path
+
+from fastapi import HTTPException, Response
+
+# Check ?fields= handling on the shared list parameters in-process
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from server import LIST_VIEW_EXCLUDED_FIELDS, STUDENT_LIST_FIELDS, PageParams, ResearchLog
+
+STORED_LOG = ResearchLog(
+    user_id="student-1",
+    student_id="student-1",
+    supervisor_id="sup-1",
+    activity_type="experiment",
+    title="Sampling run",
+    description="Collected samples from every monitoring well. " * 50,
+    findings="Nitrate levels elevated near the boundary. " * 30
+).dict()
+
+def page_for(fields=None) -> PageParams:
+    return PageParams(Response(), cursor=None, limit=20, fields=fields)
+
+class SparseFieldsetTester:
+    def __init__(self):
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    def research_log_page(self, fields=None) -> tuple:
+        page = page_for(fields)
+        projection = page.select(
+            ResearchLog.model_fields,
+            exclude=LIST_VIEW_EXCLUDED_FIELDS["research_logs"],
+            requires=("student_id", "supervisor_id")
+        )
+        body = json.loads(page.respond(ResearchLog, [STORED_LOG]).body)
+        return projection, body[0]
+
+    def run(self):
+        print("🔍 Default list view...")
+        projection, log = self.research_log_page()
+        self.check("Long text fields are not projected",
+                   not set(LIST_VIEW_EXCLUDED_FIELDS["research_logs"]) & set(projection) and projection["title"] == 1)
+        self.check("Long text fields are left out of the body",
+                   not set(LIST_VIEW_EXCLUDED_FIELDS["research_logs"]) & set(log) and log["title"] == "Sampling run")
+
+        print("🔍 Explicit fieldset...")
+        projection, log = self.research_log_page("title,status")
+        self.check("Fieldset becomes an inclusion projection with handler inputs",
+                   projection == {"_id": 0, "id": 1, "title": 1, "status": 1, "student_id": 1, "supervisor_id": 1})
+        self.check("Body only carries the requested fields", set(log) == {"id", "title", "status"})
+
+        print("🔍 Every field...")
+        projection, log = self.research_log_page("*")
+        self.check("Wildcard projects every model field", set(projection) == set(ResearchLog.model_fields) | {"_id"})
+        self.check("Wildcard returns the long text", log["findings"] == STORED_LOG["findings"])
+
+        print("🔍 Unknown fields...")
+        try:
+            page_for("title,password_hash").select(ResearchLog.model_fields)
+            self.check("Unknown fields are rejected", False)
+        except HTTPException as error:
+            self.check("Unknown fields are rejected", error.status_code == 400 and "password_hash" in error.detail)
+
+        print("🔍 Student list...")
+        projection = page_for().select(STUDENT_LIST_FIELDS)
+        self.check("Student projection never reads password hashes",
+                   set(projection) == set(STUDENT_LIST_FIELDS) | {"_id"})
+        projection = page_for("*").select(STUDENT_LIST_FIELDS)
+        self.check("Wildcard student projection is still limited to the listed fields", "password_hash" not in projection)
+
+        if self.failures:
+            print(f"❌ {self.failures} sparse fieldset checks failed")
+            return 1
+        print("✅ List endpoints fetch and return only the requested fields")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(SparseFieldsetTester().run())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Check that revocations survive a restart, in-process against in-memory collections
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import server
+from server import TokenRevocationList, revoke_all_tokens, token_revocations
+from fake_motor import FakeDatabase
+
+class TokenRevocationTester:
+    def __init__(self):
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def run(self):
+        server.db = FakeDatabase()
+        server.db.sync.users.insert_one({"id": "student-1", "token_version": 2})
+
+        print("🔍 Removing an account...")
+        await revoke_all_tokens("removed-1")
+        self.check("Its tokens are rejected right away", token_revocations.is_revoked("removed-1", 0))
+
+        print("🔍 A restarted or separate worker...")
+        restarted = TokenRevocationList()
+        await restarted.load()
+        self.check("The removed account stays revoked without a user document", restarted.is_revoked("removed-1", 5))
+        self.check("Bumped token versions are still enforced",
+                   restarted.is_revoked("student-1", 1) and not restarted.is_revoked("student-1", 2))
+
+        print("🔍 Revocations past the token lifetime...")
+        server.db.sync.token_revocations.update_one(
+            {"user_id": "removed-1"}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        expired = TokenRevocationList()
+        await expired.load()
+        self.check("Expired entries are not loaded", not expired.is_revoked("removed-1", 0))
+
+        if self.failures:
+            print(f"❌ {self.failures} token revocation checks failed")
+            return 1
+        print("✅ Revoked tokens stay revoked across restarts and workers")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(TokenRevocationTester().run()))
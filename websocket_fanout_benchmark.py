@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import time
+import zlib
+from pathlib import Path
+
+# Drive the backend's ConnectionManager in-process against fake sockets
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from server import ConnectionManager, EncodedMessage, InProcessBroker, ResearchLog, EventType
+
+RECIPIENT_COUNTS = [10, 100, 1000]
+EVENTS_PER_RUN = 50
+
+class FakeWebSocket:
+    """Accepts frames instantly so only server-side fan-out cost is measured"""
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.frames += 1
+        self.bytes += len(text)
+
+    async def send_bytes(self, data: bytes):
+        self.frames += 1
+        self.bytes += len(data)
+
+    async def close(self, code: int = 1000):
+        pass
+
+def sample_event() -> dict:
+    """A RESEARCH_LOG_UPDATED event with a realistically sized research log"""
+    research_log = ResearchLog(
+        user_id="student-1",
+        student_id="student-1",
+        supervisor_id="supervisor-1",
+        activity_type="experiment",
+        title="Groundwater sampling run",
+        description="Collected and filtered samples from all monitoring wells. " * 20,
+        findings="Nitrate levels elevated near the agricultural boundary. " * 15,
+        challenges="Pump failure at well 3 delayed sampling by two hours. " * 5,
+        next_steps="Repeat sampling after the next rainfall event. " * 5,
+        tags=["groundwater", "nitrate", "sampling"]
+    )
+    return {
+        "type": EventType.RESEARCH_LOG_UPDATED.value,
+        "data": {"action": "updated", "research_log": research_log.dict(), "user_name": "Benchmark Student"},
+        "timestamp": "2024-01-01T00:00:00"
+    }
+
+async def legacy_fanout(sockets: list, message: dict):
+    """The previous behaviour: serialize and await each send in turn"""
+    for socket in sockets:
+        await socket.send_text(json.dumps(message, default=str))
+
+async def run_case(recipients: int, encoding: str, message: dict) -> float:
+    manager = ConnectionManager(InProcessBroker())
+    await manager.start()
+    sockets = [FakeWebSocket() for _ in range(recipients)]
+    # The manager logs every connect/disconnect; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index, socket in enumerate(sockets):
+            await manager.connect(socket, f"user-{index}", encoding=encoding)
+
+    # One session frame per socket, then the events
+    expected = recipients * (EVENTS_PER_RUN + 1)
+    started = time.perf_counter()
+    for _ in range(EVENTS_PER_RUN):
+        await manager.broadcast_to_channel(message)
+        await asyncio.sleep(0)
+    # Wait for the writer tasks to drain every queue
+    while sum(socket.frames for socket in sockets) < expected and manager.evicted == 0:
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+
+    connections = {connection for connections in manager.topic_connections.values() for connection in connections}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for connection in connections:
+            manager.disconnect(connection)
+    # Let the cancelled writer tasks finish
+    await asyncio.gather(*[connection.writer for connection in connections], return_exceptions=True)
+
+    if manager.evicted:
+        print(f"❌ {encoding}: {manager.evicted} clients evicted during the run")
+    return elapsed / (EVENTS_PER_RUN * recipients) * 1e6
+
+async def run_legacy(recipients: int, message: dict) -> float:
+    sockets = [FakeWebSocket() for _ in range(recipients)]
+    started = time.perf_counter()
+    for _ in range(EVENTS_PER_RUN):
+        await legacy_fanout(sockets, message)
+    return (time.perf_counter() - started) / (EVENTS_PER_RUN * recipients) * 1e6
+
+async def run_benchmark():
+    message = sample_event()
+
+    json_size = len(json.dumps(message, default=str))
+    deflated_size = len(zlib.compress(json.dumps(message, default=str).encode()))
+    packed_size = len(EncodedMessage(message).packed)
+    print(f"📦 Payload: json={json_size}B msgpack={packed_size}B json+deflate≈{deflated_size}B")
+
+    print(f"📊 Fan-out cost per recipient ({EVENTS_PER_RUN} events per run)")
+    for recipients in RECIPIENT_COUNTS:
+        legacy = await run_legacy(recipients, message)
+        encoded_json = await run_case(recipients, "json", message)
+        encoded_msgpack = await run_case(recipients, "msgpack", message)
+        print(f"   {recipients:>5} recipients: legacy={legacy:.1f}µs json={encoded_json:.1f}µs msgpack={encoded_msgpack:.1f}µs")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run_benchmark()))
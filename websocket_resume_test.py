@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Exercise session resume against the in-process broker and memory event log
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import server
+from server import ConnectionManager, EncodedMessage, InProcessBroker, create_access_token, lab_rosters, websocket_token_subject
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.received.append(EncodedMessage.from_text(text).message)
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+class WebSocketResumeTester:
+    def __init__(self):
+        self.manager = ConnectionManager(InProcessBroker())
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def connect(self, user_id: str, **resume) -> tuple:
+        socket = FakeWebSocket()
+        with contextlib.redirect_stdout(io.StringIO()):
+            connection = await self.manager.connect(socket, user_id, supervisor_id="sup-1", **resume)
+        await asyncio.sleep(0.01)
+        return socket, connection
+
+    def disconnect(self, connection):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.manager.disconnect(connection)
+
+    async def run(self):
+        await self.manager.start()
+        lab_rosters.entries["sup-1"] = (time.monotonic() + 60, {"student-1": "student"})
+
+        print("🔍 Fresh session...")
+        socket, connection = await self.connect("student-1")
+        session = socket.received[0]
+        self.check("First frame opens a session", session["type"] == "session" and session["seq"] == 0)
+
+        await self.manager.send_personal_message({"type": "personal", "n": 1}, "student-1")
+        await self.manager.send_to_lab({"type": "lab", "n": 2}, "sup-1")
+        await asyncio.sleep(0.01)
+        seqs = [message["seq"] for message in socket.received[1:]]
+        self.check("Personal and lab events share one per-user sequence", seqs == [1, 2])
+        epoch, last_seq = session["epoch"], seqs[-1]
+        self.disconnect(connection)
+
+        print("🔍 Events while offline, then resume...")
+        for n in range(3, 6):
+            await self.manager.send_to_lab({"type": "lab", "n": n}, "sup-1")
+        socket, connection = await self.connect("student-1", last_seq=last_seq, epoch=epoch)
+        replayed = [message["n"] for message in socket.received[1:]]
+        self.check("Resume replays only the missed events", socket.received[0]["type"] == "session" and replayed == [3, 4, 5])
+
+        await self.manager.send_personal_message({"type": "personal", "n": 6}, "student-1")
+        await asyncio.sleep(0.01)
+        self.check("Live events continue the sequence after replay", socket.received[-1]["seq"] == 6)
+        self.disconnect(connection)
+
+        print("🔍 Resume across a gap that has been evicted...")
+        for n in range(server.REPLAY_BUFFER_SIZE + 1):
+            await self.manager.send_personal_message({"type": "personal", "n": n}, "student-1")
+        socket, connection = await self.connect("student-1", last_seq=6, epoch=epoch)
+        self.check("Evicted gap asks for a resync", socket.received[0]["type"] == "resync_required" and len(socket.received) == 1)
+        self.disconnect(connection)
+
+        print("🔍 Resume with an epoch from another server process...")
+        socket, connection = await self.connect("student-1", last_seq=6, epoch="previous-process")
+        self.check("Unknown epoch asks for a resync", socket.received[0]["type"] == "resync_required")
+        self.disconnect(connection)
+
+        print("🔍 A replay that fails...")
+        current = server.event_log.current
+        async def unavailable(user_id: str):
+            raise RuntimeError("event log unavailable")
+        server.event_log.current = unavailable
+        try:
+            await self.connect("student-1", last_seq=6, epoch=epoch)
+            failed = False
+        except RuntimeError:
+            failed = True
+        finally:
+            server.event_log.current = current
+        self.check("The connection is unregistered when resume raises",
+                   failed and not any(self.manager.topic_connections.values()))
+
+        print("🔍 Who may resume...")
+        token = create_access_token({"sub": "student-1"})
+        self.check("The owner's token authorizes a replay", websocket_token_subject(token) == "student-1")
+        self.check("Another user's token does not", websocket_token_subject(create_access_token({"sub": "student-2"})) != "student-1")
+        self.check("A missing or forged token does not",
+                   websocket_token_subject(None) is None and websocket_token_subject(token[:-2] + "xx") is None)
+
+        if self.failures:
+            print(f"❌ {self.failures} resume checks failed")
+            return 1
+        print("✅ Reconnecting clients get a replay instead of a full reload")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(WebSocketResumeTester().run()))
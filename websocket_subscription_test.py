@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Check server-side subscription filtering against the in-process broker
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from server import ConnectionManager, EncodedMessage, InProcessBroker, lab_rosters
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        message = EncodedMessage.from_text(text).message
+        if message["type"] not in ("session", "subscriptions"):
+            self.received.append(message)
+
+    async def send_bytes(self, data: bytes):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+def todo_event(user_id: str) -> dict:
+    return {"type": "user_updated", "data": {"action": "todo_created", "user_id": user_id}}
+
+class WebSocketSubscriptionTester:
+    def __init__(self):
+        self.manager = ConnectionManager(InProcessBroker())
+        self.failures = 0
+
+    def check(self, label: str, condition: bool):
+        if condition:
+            print(f"✅ {label}")
+        else:
+            print(f"❌ {label}")
+            self.failures += 1
+
+    async def connect(self, user_id: str, subscriptions=None) -> tuple:
+        socket = FakeWebSocket()
+        with contextlib.redirect_stdout(io.StringIO()):
+            connection = await self.manager.connect(socket, user_id, supervisor_id="sup-1", subscriptions=subscriptions)
+        return socket, connection
+
+    async def send_lab_events(self):
+        await self.manager.send_to_lab(todo_event("student-1"), "sup-1")
+        await self.manager.send_to_lab(todo_event("student-2"), "sup-1")
+        await self.manager.send_to_lab({"type": "user_updated", "data": {"action": "avatar_updated", "user_id": "student-2"}}, "sup-1")
+        await self.manager.send_to_lab({"type": "publication_updated", "data": {"action": "citations_refreshed"}}, "sup-1")
+        await self.manager.send_to_lab({"type": "publication_updated", "data": {"action": "synchronized"}}, "sup-1")
+        await asyncio.sleep(0.01)
+
+    async def run(self):
+        await self.manager.start()
+        lab_rosters.entries["sup-1"] = (time.monotonic() + 60, {"student-1": "student", "student-2": "student"})
+
+        everything, _ = await self.connect("student-1")
+        narrowed, _ = await self.connect("student-1", ["user_updated:avatar_updated", "publication_updated:sync*"])
+        own_todos, own_connection = await self.connect("student-1", ["user_updated:todo_*@self"])
+
+        print("🔍 Lab events against different subscriptions...")
+        await self.send_lab_events()
+        self.check("Unsubscribed socket still receives every event", len(everything.received) == 5)
+        self.check("Action patterns keep only matching events",
+                   [message["data"]["action"] for message in narrowed.received] == ["avatar_updated", "synchronized"])
+        self.check("Scope drops other users' todos",
+                   [message["data"]["user_id"] for message in own_todos.received] == ["student-1"])
+        self.check("Filtered events are counted", self.manager.filtered == 7)
+
+        print("🔍 Changing subscriptions on a live socket...")
+        own_connection.unsubscribe(["user_updated:todo_*@self"])
+        own_connection.subscribe(["publication_updated"])
+        own_todos.received.clear()
+        await self.send_lab_events()
+        self.check("Updated subscriptions apply to later events",
+                   [message["type"] for message in own_todos.received] == ["publication_updated", "publication_updated"])
+        self.check("Subscriptions are reported back", own_connection.subscribed_topics() == ["publication_updated"])
+
+        if self.failures:
+            print(f"❌ {self.failures} subscription checks failed")
+            return 1
+        print("✅ Sockets only receive the events they subscribed to")
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(WebSocketSubscriptionTester().run()))